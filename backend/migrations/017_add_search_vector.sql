@@ -0,0 +1,33 @@
+-- Migration: Stored tsvector column for legacy Postgres full-text search
+-- Date: 2026-10-16
+
+-- Persisted search vector so queries no longer recompute to_tsvector per row
+ALTER TABLE transcript_segments
+  ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+-- Keep search_vector current on insert and whenever the text changes
+CREATE OR REPLACE FUNCTION transcript_segments_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('english', coalesce(NEW.transcript_text, ''));
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS transcript_segments_search_vector_trigger ON transcript_segments;
+CREATE TRIGGER transcript_segments_search_vector_trigger
+  BEFORE INSERT OR UPDATE OF transcript_text ON transcript_segments
+  FOR EACH ROW EXECUTE FUNCTION transcript_segments_search_vector_update();
+
+-- Backfill existing rows
+UPDATE transcript_segments
+SET search_vector = to_tsvector('english', coalesce(transcript_text, ''))
+WHERE search_vector IS NULL;
+
+-- GIN index used by both the @@ match and ts_rank_cd ordering
+CREATE INDEX IF NOT EXISTS idx_segment_search_vector ON transcript_segments USING gin(search_vector);
+
+-- The expression index is superseded by idx_segment_search_vector
+DROP INDEX IF EXISTS transcript_text_fts_idx;
+
+COMMENT ON COLUMN transcript_segments.search_vector IS 'Full-text search vector of transcript_text, maintained by trigger';
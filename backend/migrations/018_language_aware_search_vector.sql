@@ -0,0 +1,36 @@
+-- Migration: Language-aware text search configuration per dataset
+-- Date: 2026-10-16
+-- Tweede Kamer (VLOS) segments are Dutch; everything else (HTML, YouTube) is English.
+
+-- Text search configuration the row's search_vector was built with
+ALTER TABLE transcript_segments
+  ADD COLUMN IF NOT EXISTS search_config VARCHAR(20);
+
+-- Pick the configuration from the owning video's dataset
+CREATE OR REPLACE FUNCTION transcript_segments_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    SELECT CASE v.dataset WHEN 'tweede_kamer' THEN 'dutch' ELSE 'english' END INTO NEW.search_config
+    FROM videos v WHERE v.id = NEW.video_id;
+    NEW.search_config := coalesce(NEW.search_config, 'english');
+    NEW.search_vector := to_tsvector(NEW.search_config::regconfig, coalesce(NEW.transcript_text, ''));
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS transcript_segments_search_vector_trigger ON transcript_segments;
+CREATE TRIGGER transcript_segments_search_vector_trigger
+  BEFORE INSERT OR UPDATE OF transcript_text, video_id ON transcript_segments
+  FOR EACH ROW EXECUTE FUNCTION transcript_segments_search_vector_update();
+
+-- Backfill: assign configurations, then rebuild vectors with them
+UPDATE transcript_segments s
+SET search_config = CASE v.dataset WHEN 'tweede_kamer' THEN 'dutch' ELSE 'english' END
+FROM videos v
+WHERE v.id = s.video_id;
+
+UPDATE transcript_segments
+SET search_config = coalesce(search_config, 'english'),
+    search_vector = to_tsvector(coalesce(search_config, 'english')::regconfig, coalesce(transcript_text, ''));
+
+COMMENT ON COLUMN transcript_segments.search_config IS 'Text search configuration used for search_vector (english, dutch)';
@@ -0,0 +1,25 @@
+-- Migration: Native pgvector embeddings with an HNSW index
+-- Date: 2026-10-16
+-- transcript_segments.embedding held the 384-float vector as JSON text, so semantic
+-- search parsed and scored rows in Python. Convert it to vector(384) in place
+-- (JSON arrays are valid vector literals) and index it for cosine ANN queries.
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+ALTER TABLE transcript_segments
+  ALTER COLUMN embedding TYPE vector(384)
+  USING nullif(embedding::text, '')::vector(384);
+
+-- HNSW: no training step, good recall at low latency. On very large tables an
+-- IVFFlat index builds faster and smaller, at some recall cost:
+--   CREATE INDEX idx_segment_embedding_ivfflat ON transcript_segments
+--   USING ivfflat (embedding vector_cosine_ops) WITH (lists = 1000);
+CREATE INDEX IF NOT EXISTS idx_segment_embedding_hnsw
+  ON transcript_segments
+  USING hnsw (embedding vector_cosine_ops)
+  WITH (m = 16, ef_construction = 64);
+
+-- Superseded by idx_segment_embedding_hnsw (created by 006 on installs where it ran)
+DROP INDEX IF EXISTS idx_transcript_segments_embedding;
+
+COMMENT ON COLUMN transcript_segments.embedding IS 'all-MiniLM-L6-v2 sentence embedding, vector(384), HNSW cosine index';
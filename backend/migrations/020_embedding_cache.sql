@@ -0,0 +1,14 @@
+-- Migration: Content-hash embedding cache
+-- Date: 2026-10-16
+-- Identical segment texts ("Dank u wel.", "Thank you.", applause markers) are
+-- encoded once per model and the stored embedding is reused for every copy.
+
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model_name VARCHAR(100) NOT NULL,
+    text_hash VARCHAR(64) NOT NULL,          -- sha256 of the whitespace-normalized text
+    embedding vector(384) NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (model_name, text_hash)
+);
+
+COMMENT ON TABLE embedding_cache IS 'Sentence embeddings keyed by model and normalized text hash';
@@ -0,0 +1,19 @@
+-- Migration: Incremental import manifest
+-- Date: 2026-10-16
+-- Directory imports record each imported file with its size, mtime, content hash
+-- and parser version; later runs only reparse files that are new or changed.
+
+CREATE TABLE IF NOT EXISTS import_manifest (
+    path VARCHAR(1024) PRIMARY KEY,          -- absolute path of the imported file
+    parser VARCHAR(20) NOT NULL,             -- html, vlos
+    parser_version VARCHAR(20) NOT NULL,
+    size BIGINT NOT NULL,
+    mtime_ns BIGINT NOT NULL,
+    content_hash VARCHAR(64) NOT NULL,       -- sha256 of the file
+    video_id INTEGER NOT NULL REFERENCES videos(id) ON DELETE CASCADE,
+    imported_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_import_manifest_parser ON import_manifest(parser);
+
+COMMENT ON TABLE import_manifest IS 'Files read by directory imports, used to skip unchanged files';
@@ -0,0 +1,32 @@
+-- Migration: Shared embedding job state
+-- Date: 2026-10-16
+-- The background embedding job's status, progress and pause/cancel requests live
+-- in this table so every API worker reports and controls the same job. The worker
+-- running a job holds a session advisory lock, so only one job runs at a time.
+
+CREATE TABLE IF NOT EXISTS embedding_jobs (
+    id SERIAL PRIMARY KEY,
+    status VARCHAR(20) NOT NULL,             -- running, paused, cancelling, completed, failed, cancelled
+    force_regenerate BOOLEAN NOT NULL DEFAULT FALSE,
+    batch_size INTEGER NOT NULL,
+    worker_processes INTEGER NOT NULL,
+    owner VARCHAR(255) NOT NULL,             -- host:pid of the worker running the job
+    total INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    batches INTEGER NOT NULL DEFAULT 0,
+    cache_hits INTEGER NOT NULL DEFAULT 0,
+    last_segment_id INTEGER NOT NULL DEFAULT 0,
+    encode_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    write_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    error_messages JSON NOT NULL DEFAULT '[]',
+    active_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    resumed_at TIMESTAMP NULL,               -- start of the current active period
+    started_at TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP NULL,
+    updated_at TIMESTAMP NOT NULL            -- owner heartbeat
+);
+
+CREATE INDEX IF NOT EXISTS ix_embedding_jobs_status ON embedding_jobs(status);
+
+COMMENT ON TABLE embedding_jobs IS 'Background embedding jobs, shared by all API workers';
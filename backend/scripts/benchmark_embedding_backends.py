@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Embedding Backend Benchmark
+
+Compares the embedding inference backends (torch, torch-int8, onnx) on the same
+texts: throughput, and cosine agreement with the full-precision torch model.
+Also exports the ONNX encoder used by EMBEDDING_BACKEND=onnx.
+
+Usage:
+    python scripts/benchmark_embedding_backends.py --export-onnx data/models/all-MiniLM-L6-v2.onnx
+    python scripts/benchmark_embedding_backends.py --from-db 2000
+    python scripts/benchmark_embedding_backends.py --texts-file sample.txt --backends torch,onnx
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+# Add the parent directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.embedding_backends import BACKENDS, backend_available, load_backend
+from src.services.embedding_service import EmbeddingService
+from src.config import settings
+
+
+def export_onnx(model_name: str, path: str):
+    """Export the transformer encoder of a SentenceTransformer model to ONNX"""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device="cpu")
+    encoder = model[0].auto_model.eval()
+    sample = model.tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    torch.onnx.export(
+        encoder,
+        tuple(sample[name] for name in input_names),
+        path,
+        input_names=input_names,
+        output_names=["last_hidden_state"],
+        dynamic_axes=dynamic_axes,
+        opset_version=14,
+    )
+    print(f"✅ Exported {model_name} encoder to {path}")
+
+
+async def load_texts_from_db(limit: int) -> List[str]:
+    """Sample segment texts (mixed lengths, as in production)"""
+    from sqlalchemy import select, func
+    from src.database import AsyncSessionLocal
+    from src.models import TranscriptSegment
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(TranscriptSegment.transcript_text).order_by(func.random()).limit(limit)
+        )
+        return [text for text in result.scalars().all() if text]
+
+
+def benchmark(backend: str, texts: List[str], repeat: int) -> np.ndarray:
+    """Embed texts with one backend; prints load time and throughput"""
+    service = EmbeddingService()
+    service.backend = backend
+
+    started = time.perf_counter()
+    service._model = load_backend(backend, service.model_name, settings.EMBEDDING_ONNX_PATH or None)
+    load_seconds = time.perf_counter() - started
+
+    # Warm-up outside the measurement
+    service.generate_embeddings_batch(texts[:16])
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        embeddings = service.generate_embeddings_batch(texts)
+        timings.append(time.perf_counter() - started)
+
+    best = min(timings)
+    print(f"  {backend:<11} load {load_seconds:6.2f}s   best {best:7.2f}s   {len(texts) / best:8.1f} texts/s")
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding inference backends")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="Comma-separated backends to compare")
+    parser.add_argument("--texts-file", help="File with one text per line")
+    parser.add_argument("--from-db", type=int, metavar="N", help="Sample N segment texts from the database")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per backend (best is reported)")
+    parser.add_argument("--export-onnx", metavar="PATH", help="Export the ONNX encoder to PATH and exit")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    args = parser.parse_args()
+
+    if args.export_onnx:
+        export_onnx(args.model, args.export_onnx)
+        return
+
+    if args.texts_file:
+        with open(args.texts_file, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    elif args.from_db:
+        texts = asyncio.run(load_texts_from_db(args.from_db))
+    else:
+        parser.error("provide --texts-file or --from-db")
+
+    backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+    print(f"Embedding {len(texts)} texts ({sum(len(t.split()) for t in texts)} words)\n")
+
+    results = {}
+    for backend in backends:
+        if not backend_available(backend):
+            print(f"  {backend:<11} skipped (packages not installed)")
+            continue
+        try:
+            results[backend] = benchmark(backend, texts, args.repeat)
+        except RuntimeError as e:
+            print(f"  {backend:<11} skipped ({e})")
+
+    reference = results.get("torch")
+    if reference is None:
+        print("\nNo torch reference run; cosine agreement not computed")
+        return
+
+    print("\nCosine agreement with torch (fp32):")
+    for backend, embeddings in results.items():
+        if backend == "torch":
+            continue
+        # Both sides are L2-normalized, so the row-wise dot product is the cosine
+        cosine = np.sum(reference * embeddings, axis=1)
+        print(
+            f"  {backend:<11} mean {cosine.mean():.5f}   p1 {np.percentile(cosine, 1):.5f}   min {cosine.min():.5f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
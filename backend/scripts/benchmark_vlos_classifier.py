@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+VLOS Fragment Classifier Benchmark
+
+Times the per-fragment classification done while parsing VLOS XML (announcement
+check and speaker-line detection) for every document, comparing the pattern
+lists tried one by one without memoization against the combined patterns with
+memoized speaker lines. Both must agree on every fragment.
+
+Usage:
+    python scripts/benchmark_vlos_classifier.py
+    python scripts/benchmark_vlos_classifier.py path/to/xml/dir --limit 200 --repeat 5
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+import xml.etree.ElementTree as ET
+from typing import List, Optional, Tuple
+
+# Add the parent directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config import settings
+from src.parsers import vlos_parser
+from src.parsers.vlos_parser import ANNOUNCEMENT_PATTERNS, FALSE_SPEAKER_PATTERNS
+
+
+def load_fragments(path: str) -> List[str]:
+    """The alineaitem texts of one document, as _tekst_parts sees them"""
+    root = ET.parse(path).getroot()
+    return [
+        vlos_parser._alineaitem_text(element)
+        for element in root.iter()
+        if vlos_parser._local_name(element.tag) == "alineaitem"
+    ]
+
+
+def speaker_candidate(text: str) -> Optional[str]:
+    if ":" in text and len(text) <= 120:
+        return text.split(":", 1)[0].strip()
+    return None
+
+
+def classify_before(fragments: List[str]) -> List[Tuple[bool, Optional[str]]]:
+    """Pattern lists tried in turn, speaker lines re-analyzed every time"""
+    extract_speaker_name = vlos_parser._extract_speaker_name.__wrapped__
+    results = []
+    for text in fragments:
+        stripped = text.strip()
+        announcement = any(pattern.match(stripped) for pattern in ANNOUNCEMENT_PATTERNS)
+        party = None
+        candidate = speaker_candidate(text)
+        if candidate is not None:
+            false_speaker = (
+                not candidate
+                or any(pattern.match(candidate) for pattern in FALSE_SPEAKER_PATTERNS)
+                or len(candidate.strip()) < 4
+            )
+            if not false_speaker and extract_speaker_name(candidate + ":") != "Onbekend":
+                party = vlos_parser._extract_party(candidate)
+        results.append((announcement, party))
+    return results
+
+
+def classify_after(fragments: List[str]) -> List[Tuple[bool, Optional[str]]]:
+    """Combined alternations, speaker lines memoized"""
+    results = []
+    for text in fragments:
+        announcement = vlos_parser._ANNOUNCEMENT_RE.match(text.strip()) is not None
+        candidate = speaker_candidate(text)
+        party = vlos_parser._classify_speaker_line(candidate) if candidate is not None else None
+        results.append((announcement, party))
+    return results
+
+
+def time_documents(classify, documents: List[List[str]], repeat: int) -> List[float]:
+    """Best per-document time in microseconds, over repeated passes of the whole corpus"""
+    best = [float("inf")] * len(documents)
+    for _ in range(repeat):
+        # Every pass starts cold, as a fresh import worker would
+        vlos_parser._classify_speaker_line.cache_clear()
+        vlos_parser._extract_speaker_name.cache_clear()
+        for i, fragments in enumerate(documents):
+            started = time.perf_counter()
+            classify(fragments)
+            best[i] = min(best[i], (time.perf_counter() - started) * 1e6)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark VLOS fragment classification")
+    parser.add_argument("path", nargs="?", default=settings.XML_DATA_DIR, help="XML file or directory")
+    parser.add_argument("--limit", type=int, default=100, help="Maximum number of documents")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes (best per document is reported)")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.path):
+        paths = sorted(glob.glob(os.path.join(args.path, "**", "*.xml"), recursive=True))[: args.limit]
+    else:
+        paths = [args.path]
+    if not paths:
+        parser.error(f"no XML files found at {args.path}")
+
+    documents = [load_fragments(path) for path in paths]
+    fragment_count = sum(len(fragments) for fragments in documents)
+    print(f"Classifying {fragment_count} fragments from {len(documents)} documents\n")
+
+    mismatches = sum(classify_before(fragments) != classify_after(fragments) for fragments in documents)
+    if mismatches:
+        print(f"⚠️  {mismatches} documents classified differently")
+
+    before = time_documents(classify_before, documents, args.repeat)
+    after = time_documents(classify_after, documents, args.repeat)
+    for label, timings in (("before", before), ("after", after)):
+        print(
+            f"  {label:<7} median {statistics.median(timings):10.1f} µs/doc   "
+            f"total {sum(timings) / 1000:9.1f} ms   {fragment_count / sum(timings) * 1e6:10.0f} fragments/s"
+        )
+    print(f"\nSpeedup: {sum(before) / sum(after):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -95,6 +95,8 @@ async def main():
             result = await import_service.import_html_directory(
                 args.source_dir,
                 force_reimport=args.force,
+                # The event loop ends with this script: embed before exiting
+                await_embeddings=True,
                 progress_callback=progress_callback if args.verbose else None
             )
             
@@ -102,6 +104,14 @@ async def main():
             print(f"Total files: {result['total_files']}")
             print(f"Successfully imported: {result['total_processed']}")
             print(f"Failed: {result['total_failed']}")
+            print(f"Unchanged (skipped): {result['total_skipped']}")
+            print(f"Throughput: {result['files_per_second']} files/sec ({result['elapsed_seconds']}s)")
+            if result['embedding_stats']:
+                embedding_stats = result['embedding_stats']
+                print(
+                    f"Embeddings: {embedding_stats['status']}, {embedding_stats['processed']} generated, "
+                    f"{embedding_stats['errors']} failed"
+                )
             
             if result['errors']:
                 print(f"\nErrors ({len(result['errors'])}):")
@@ -22,11 +22,16 @@ class Settings(BaseSettings):
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000", "*"]
+    # Heavy optional dependencies are imported on first use; list the ones to load
+    # at startup instead: embedding, openai, youtube, elasticsearch, langdetect, arrow
+    PREWARM: List[str] = []
     
     # Data settings
     HTML_DATA_DIR: str = "/root/polibase/out/html"
     XML_DATA_DIR: str = "/root/tweedekamer_scrape/tweede-kamer-scraper/output/xml/"
+    VLOS_STREAMING_PARSE: bool = True  # parse VLOS XML incrementally instead of loading the whole tree
     PROCESSED_DATA_DIR: str = "./data/processed"
+    HTML_PARSER_BACKEND: str = "html.parser"  # html.parser (reference) or lxml (single pass, C parser)
     UPLOAD_DIR: str = "./data/uploads"
     
     # Security
@@ -41,6 +46,31 @@ class Settings(BaseSettings):
     MAX_SEARCH_RESULTS: int = 1000000
     DEFAULT_PAGE_SIZE: int = 25
     
+    # Result counting (count_mode=estimate|exact)
+    COUNT_ESTIMATE_CAP: int = 1000  # counts up to this many rows exactly before estimating
+    COUNT_CACHE_TTL_SECONDS: int = 300
+    COUNT_CACHE_MAX_ENTRIES: int = 1024
+    
+    # Streaming exports: rows fetched per server-side cursor round trip
+    EXPORT_CHUNK_SIZE: int = 2000
+    
+    # Semantic search
+    SEMANTIC_SEARCH_ENGINE: str = "pgvector"  # pgvector (HNSW index) or matrix (memory-mapped .npy)
+    VECTOR_EF_SEARCH: int = 100  # HNSW candidate list size; higher = better recall for filtered queries
+    SEMANTIC_SCAN_CHUNK_SIZE: int = 5000  # embeddings scored per query round trip without pgvector
+    EMBEDDING_INDEX_DIR: str = "./data/embedding_index"
+    EMBEDDING_INDEX_DTYPE: str = "float16"  # float16 or float32
+    EMBEDDING_WORKER_PROCESSES: int = 0  # encode processes for the background job (0 = half the CPUs)
+    EMBEDDING_WORKER_BATCH_SIZE: int = 64
+    EMBEDDING_JOB_POLL_SECONDS: float = 1.0  # how often the job stores its progress and picks up pause/cancel requests
+    EMBEDDING_MAX_BATCH_TOKENS: int = 8192  # padded tokens per model forward pass
+    EMBEDDING_MAX_BATCH_SIZE: int = 128
+    EMBEDDING_BACKEND: str = "torch"  # torch, torch-int8 (quantized, CPU) or onnx
+    EMBEDDING_ONNX_PATH: str = ""  # defaults to ./data/models/<model>.onnx
+    EMBEDDING_CACHE_ENABLED: bool = True  # reuse embeddings of identical (normalized) texts
+    QUERY_EMBEDDING_CACHE_SIZE: int = 1024  # search queries kept in the in-process LRU
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = 3600  # 0 = no expiry
+    
     # Search engine selection
     PRIMARY_SEARCH_ENGINE: str = "elasticsearch"  # elasticsearch or meilisearch
     FALLBACK_SEARCH_ENGINE: str = "meilisearch"   # elasticsearch or meilisearch
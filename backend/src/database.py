@@ -5,7 +5,11 @@ from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, Asyn
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
+import logging
 import sqlite3
+import struct
+
+import numpy as np
 
 from .config import settings
 
@@ -18,6 +22,38 @@ engine = create_async_engine(
     pool_recycle=300,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _encode_vector(value) -> bytes:
+    """pgvector binary format: dim (uint16), unused (uint16), big-endian float32 values"""
+    array = np.asarray(value, dtype=">f4")
+    return struct.pack(">HH", array.shape[0], 0) + array.tobytes()
+
+
+def _decode_vector(data: bytes) -> np.ndarray:
+    dim = struct.unpack_from(">H", data)[0]
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=4)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def register_vector_codec(dbapi_connection, connection_record):
+    """Exchange pgvector values with asyncpg in binary instead of text"""
+    if engine.dialect.driver != "asyncpg":
+        return
+
+    async def _register(conn):
+        await conn.set_type_codec(
+            "vector", encoder=_encode_vector, decoder=_decode_vector, format="binary"
+        )
+
+    try:
+        dbapi_connection.run_async(_register)
+    except Exception as e:
+        # Extension not installed yet (created by init_db); text format is used
+        logger.debug(f"pgvector binary codec not registered: {e}")
+
+
 # Create session factory
 AsyncSessionLocal = async_sessionmaker(
     engine, 
@@ -56,6 +92,13 @@ async def init_db():
             got_lock = True
 
         if got_lock:
+            # pgvector must exist before tables with vector columns are created
+            try:
+                async with conn.begin_nested():
+                    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+            except Exception as e:
+                print(f"pgvector extension not available: {e}")
+
             # Create all tables
             await conn.run_sync(Base.metadata.create_all)
         
@@ -66,13 +109,102 @@ async def init_db():
             except Exception as e:
                 print(f"Extensions might already exist: {e}")
             
+            # Stored tsvector column for full-text search, kept current by a trigger.
+            # The text search configuration is picked from the video's dataset.
+            result = await conn.execute(text("""
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'transcript_segments'
+                AND column_name = 'search_config'
+            """))
+            has_search_config = result.scalar() is not None
+
+            await conn.execute(text("""
+                ALTER TABLE transcript_segments
+                ADD COLUMN IF NOT EXISTS search_vector tsvector,
+                ADD COLUMN IF NOT EXISTS search_config VARCHAR(20)
+            """))
+
+            config_case = " ".join(
+                f"WHEN '{name}' THEN '{config}'" for name, config in models.TEXT_SEARCH_CONFIGS.items()
+            )
+            config_expr = f"CASE v.dataset {config_case} ELSE '{models.DEFAULT_TEXT_SEARCH_CONFIG}' END"
+
+            await conn.execute(text(f"""
+                CREATE OR REPLACE FUNCTION transcript_segments_search_vector_update()
+                RETURNS trigger AS $$
+                BEGIN
+                    SELECT {config_expr} INTO NEW.search_config
+                    FROM videos v WHERE v.id = NEW.video_id;
+                    NEW.search_config := coalesce(NEW.search_config, '{models.DEFAULT_TEXT_SEARCH_CONFIG}');
+                    NEW.search_vector := to_tsvector(NEW.search_config::regconfig, coalesce(NEW.transcript_text, ''));
+                    RETURN NEW;
+                END
+                $$ LANGUAGE plpgsql
+            """))
+
+            await conn.execute(text("""
+                DROP TRIGGER IF EXISTS transcript_segments_search_vector_trigger
+                ON transcript_segments
+            """))
+
+            await conn.execute(text("""
+                CREATE TRIGGER transcript_segments_search_vector_trigger
+                BEFORE INSERT OR UPDATE OF transcript_text, video_id ON transcript_segments
+                FOR EACH ROW EXECUTE FUNCTION transcript_segments_search_vector_update()
+            """))
+
+            if not has_search_config:
+                # Columns were just added to an existing table: backfill once
+                await conn.execute(text(f"""
+                    UPDATE transcript_segments s
+                    SET search_config = {config_expr}
+                    FROM videos v
+                    WHERE v.id = s.video_id AND s.search_config IS NULL
+                """))
+                await conn.execute(text(f"""
+                    UPDATE transcript_segments
+                    SET search_config = coalesce(search_config, '{models.DEFAULT_TEXT_SEARCH_CONFIG}'),
+                        search_vector = to_tsvector(
+                            coalesce(search_config, '{models.DEFAULT_TEXT_SEARCH_CONFIG}')::regconfig,
+                            coalesce(transcript_text, '')
+                        )
+                """))
+
+            # pgvector embeddings: convert the legacy JSON text column and index it.
+            # Run in a savepoint so a server without the extension keeps working
+            # (semantic search then falls back to in-process scoring).
+            try:
+                async with conn.begin_nested():
+                    result = await conn.execute(text("""
+                        SELECT data_type FROM information_schema.columns
+                        WHERE table_name = 'transcript_segments'
+                        AND column_name = 'embedding'
+                    """))
+                    if result.scalar() == 'text':
+                        await conn.execute(text(f"""
+                            ALTER TABLE transcript_segments
+                            ALTER COLUMN embedding TYPE vector({models.EMBEDDING_DIM})
+                            USING nullif(embedding, '')::vector({models.EMBEDDING_DIM})
+                        """))
+                    await conn.execute(text("""
+                        CREATE INDEX IF NOT EXISTS idx_segment_embedding_hnsw
+                        ON transcript_segments
+                        USING hnsw (embedding vector_cosine_ops)
+                        WITH (m = 16, ef_construction = 64)
+                    """))
+            except Exception as e:
+                print(f"pgvector not available, embedding index skipped: {e}")
+
             # Create full-text search indexes
             await conn.execute(text("""
-                CREATE INDEX IF NOT EXISTS transcript_text_fts_idx 
-                ON transcript_segments 
-                USING gin(to_tsvector('english', transcript_text))
+                CREATE INDEX IF NOT EXISTS idx_segment_search_vector
+                ON transcript_segments
+                USING gin(search_vector)
             """))
-            
+
+            # Superseded by idx_segment_search_vector
+            await conn.execute(text("DROP INDEX IF EXISTS transcript_text_fts_idx"))
+
             await conn.execute(text("""
                 CREATE INDEX IF NOT EXISTS transcript_text_trigram_idx 
                 ON transcript_segments 
@@ -128,6 +260,10 @@ async def init_db():
             except Exception:
                 pass
 
+    # Connections opened before the vector extension existed have no binary
+    # vector codec; drop them so the pool reconnects with it
+    await engine.dispose()
+
 
 def get_db_engine():
     """Get synchronous database engine for scripts"""
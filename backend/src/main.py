@@ -14,6 +14,7 @@ from .routes import meili_search, meilisearch_admin, meilisearch_search, summari
 from .routes import optimized_search, unified_search
 from .config import settings
 from .routes.upload import import_status
+from .services.prewarm import prewarm
 
 
 @asynccontextmanager
@@ -21,6 +22,7 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
     await init_db()
+    await prewarm(settings.PREWARM)
     yield
     # Shutdown - cleanup if needed
 
@@ -42,6 +44,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination metadata for list endpoints that return bare arrays
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Total-Count-Estimated"],
 )
 
 # Enable gzip compression to reduce payload size
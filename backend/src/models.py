@@ -1,7 +1,11 @@
 """
 Database models for the Political Transcript Search Platform
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON, Index
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.types import TypeDecorator
+from pgvector.sqlalchemy import Vector
+import numpy as np
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -10,6 +14,59 @@ from typing import Optional, Dict, Any, List
 from .database import Base
 
 
+# Dimensions of the sentence embedding model (all-MiniLM-L6-v2)
+EMBEDDING_DIM = 384
+
+class EmbeddingVector(TypeDecorator):
+    """
+    Embedding column: pgvector vector(n) on Postgres, raw float32 bytes elsewhere
+
+    Values are numpy float32 arrays. With asyncpg, vectors use pgvector's binary
+    wire format (codec registered in database.py) and are decoded with
+    np.frombuffer instead of parsing text.
+    """
+    impl = Vector
+    cache_ok = True
+
+    def __init__(self, dim: int):
+        super().__init__(dim)
+        self.dim = dim
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(Vector(self.dim))
+        return dialect.type_descriptor(LargeBinary())
+
+    def bind_processor(self, dialect):
+        if dialect.name != "postgresql":
+            def process(value):
+                return None if value is None else np.asarray(value, dtype=np.float32).tobytes()
+        elif dialect.driver == "asyncpg":
+            def process(value):
+                return None if value is None else np.asarray(value, dtype=np.float32)
+        else:
+            def process(value):
+                if value is None:
+                    return None
+                return "[" + ",".join(map(str, np.asarray(value, dtype=np.float32).tolist())) + "]"
+        return process
+
+    def result_processor(self, dialect, coltype):
+        def process(value):
+            if value is None or isinstance(value, np.ndarray):
+                return value
+            if isinstance(value, (bytes, memoryview)):
+                return np.frombuffer(value, dtype=np.float32)
+            # Text format '[0.1,0.2,...]' (drivers without the binary codec)
+            return np.array(value.strip("[]").split(","), dtype=np.float32)
+        return process
+
+
+# Postgres text search configuration per Video.dataset; anything else uses the default
+TEXT_SEARCH_CONFIGS: Dict[str, str] = {"tweede_kamer": "dutch"}
+DEFAULT_TEXT_SEARCH_CONFIG = "english"
+
+
 class Video(Base):
     """Video metadata table"""
     __tablename__ = "videos"
@@ -116,6 +173,12 @@ class TranscriptSegment(Base):
     speaker_party: Mapped[Optional[str]] = mapped_column(String(20), nullable=True, index=True)  # For Tweede Kamer transcripts
     segment_type: Mapped[str] = mapped_column(String(20), default="spoken", index=True)  # "spoken" or "announcement"
     transcript_text: Mapped[str] = mapped_column(Text, nullable=False)
+    # Full-text search vector and the text search configuration it was built with
+    # (chosen from the video's dataset), maintained by a database trigger (see database.init_db)
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR().with_variant(Text(), "sqlite"), nullable=True, deferred=True
+    )
+    search_config: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     video_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
     timestamp_start: Mapped[Optional[str]] = mapped_column(String(20))  # e.g., "00:07:02"
     timestamp_end: Mapped[Optional[str]] = mapped_column(String(20))    # e.g., "00:07:04"
@@ -175,7 +238,7 @@ class TranscriptSegment(Base):
     moderation_selfharm_flag: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
     
     # Vector Embeddings for Semantic Search
-    embedding: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Will store as text, converted to vector in queries
+    embedding: Mapped[Optional[Any]] = mapped_column(EmbeddingVector(EMBEDDING_DIM), nullable=True)  # pgvector vector(384)
     embedding_generated_at: Mapped[Optional[DateTime]] = mapped_column(DateTime, nullable=True)
     
     # Metadata
@@ -274,6 +337,72 @@ class SummaryPreset(Base):
         return f"<SummaryPreset(id={self.id}, name='{self.name}', is_default={self.is_default})>"
 
 
+class EmbeddingCache(Base):
+    """Embeddings keyed by normalized text, shared by all segments with the same text"""
+    __tablename__ = "embedding_cache"
+    
+    model_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    text_hash: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256 of the normalized text
+    embedding: Mapped[Any] = mapped_column(EmbeddingVector(EMBEDDING_DIM), nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now())
+    
+    def __repr__(self):
+        return f"<EmbeddingCache(model_name='{self.model_name}', text_hash='{self.text_hash[:12]}')>"
+
+
+class EmbeddingJob(Base):
+    """A background embedding job; all API workers read and control it through this row"""
+    __tablename__ = "embedding_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # running, paused, cancelling, completed, failed, cancelled
+    status: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    force_regenerate: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    batch_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    worker_processes: Mapped[int] = mapped_column(Integer, nullable=False)
+    owner: Mapped[str] = mapped_column(String(255), nullable=False)  # host:pid of the worker running the job
+
+    # Progress, written by the owner
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    processed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    errors: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    batches: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cache_hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_segment_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    encode_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    write_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    error_messages: Mapped[List[str]] = mapped_column(JSON, nullable=False, default=list)
+
+    # Running time: finished active periods plus the current one since resumed_at
+    active_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    resumed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)  # owner heartbeat
+
+    def __repr__(self):
+        return f"<EmbeddingJob(id={self.id}, status='{self.status}', processed={self.processed}/{self.total})>"
+
+
+class ImportManifestEntry(Base):
+    """A file read by a directory import, as it was when it was imported"""
+    __tablename__ = "import_manifest"
+    
+    path: Mapped[str] = mapped_column(String(1024), primary_key=True)  # absolute path
+    parser: Mapped[str] = mapped_column(String(20), nullable=False, index=True)  # html, vlos
+    parser_version: Mapped[str] = mapped_column(String(20), nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)  # sha256 of the file
+    # Deleting the video drops its entry, so the file is imported again
+    video_id: Mapped[int] = mapped_column(Integer, ForeignKey("videos.id", ondelete="CASCADE"), nullable=False)
+    imported_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now())
+    
+    def __repr__(self):
+        return f"<ImportManifestEntry(path='{self.path}', parser='{self.parser}', video_id={self.video_id})>"
+
+
 # Create database indexes for better performance
 Index('idx_segment_video_speaker', TranscriptSegment.video_id, TranscriptSegment.speaker_id)
 Index('idx_segment_video_seconds', TranscriptSegment.video_id, TranscriptSegment.video_seconds)
@@ -292,5 +421,8 @@ Index('idx_segment_analytics', TranscriptSegment.stresslens_score, TranscriptSeg
 Index('idx_segment_emotion', TranscriptSegment.emotion_label, TranscriptSegment.emotion_intensity)
 Index('idx_segment_heat_score', TranscriptSegment.heat_score)
 
+# Full-text search index on the stored tsvector column
+Index('idx_segment_search_vector', TranscriptSegment.search_vector, postgresql_using='gin')
+
 # Indexes for semantic search embeddings
 Index('idx_segment_embedding_generated', TranscriptSegment.embedding_generated_at)
@@ -1,6 +1,19 @@
 """
 HTML parser for political transcript files
+
+Two backends produce identical output:
+- "html.parser": BeautifulSoup with the pure-Python html.parser (reference)
+- "lxml": lxml's C parser; each segment's fields are collected in a single walk
+  of its subtree instead of one find_all scan per analytics block
+
+Both backends only locate elements and their text; turning that text into
+segment fields is shared, which keeps the outputs equal. libxml2 repairs broken
+markup differently from html.parser, so the lxml backend only parses documents
+with well-formed markup; others (unclosed elements, CDATA sections, NUL
+characters, unknown entities, tables, ...) are parsed with html.parser.
 """
+import html.entities
+import importlib.util
 import re
 from typing import Dict, List, Optional, Tuple, Any
 from bs4 import BeautifulSoup, Tag
@@ -8,13 +21,168 @@ from datetime import datetime
 import logging
 from pathlib import Path
 
+HAS_LXML = importlib.util.find_spec("lxml") is not None
+
 logger = logging.getLogger(__name__)
 
+PARSER_BACKENDS = ("html.parser", "lxml")
+
+# Bump when the parsed output changes: directory imports reparse files read by another version
+PARSER_VERSION = "1"
+
+# Strings inside these tags are not "text" for BeautifulSoup's get_text()
+_STRING_CONTAINER_TAGS = frozenset(("script", "style", "template", "rt", "rp"))
+_STRESS_INDICATOR_RE = re.compile(r'.*[Ss]tress.*')
+
+# Page metadata: key, tag name, attributes to match, attribute holding the value (None = text)
+_PAGE_TAGS = (
+    ('og_title', 'meta', {'property': 'og:title'}, 'content'),
+    ('title', 'title', {}, None),
+    ('modified_time', 'meta', {'property': 'article:modified_time'}, 'content'),
+    ('description', 'meta', {'name': 'description'}, 'content'),
+    ('og_url', 'meta', {'property': 'og:url'}, 'content'),
+    ('thumbnail', 'meta', {'name': 'twitter:image'}, 'content'),
+    ('vimeo_src', 'iframe', {'id': 'vimeoPlayer'}, 'src'),
+)
+
+SEGMENT_CLASS = 'mb-4 border-b mx-6 my-4'
+PLAY_BUTTON_CLASS = 'transcript-play-video'
+SPEAKER_CLASS = 'text-md inline'
+TIMESTAMP_CLASS = 'text-xs text-gray-600 inline ml-2'
+TRANSCRIPT_CLASS = 'flex-auto text-md text-gray-600 leading-loose'
+SENTIMENT_CLASS = 'mb-4 flex gap-2'  # also holds the readability metrics
+MODERATION_CLASS = 'mb-4'
+METRIC_CELL_CLASS = 'mb-2'
+TOPIC_CLASS = 'flex gap-2 py-2 border-b'
+TOPIC_CELL_CLASS = 'w-1/2'
+STRESS_CLASS = 'hidden sm:block'
+
+
+# Markup that libxml2 parses differently from html.parser: NUL characters, <! markup other
+# than comments (CDATA, conditional sections, doctypes after the start), malformed comments,
+# elements whose content is raw text for libxml2 or whose end tags it implies, iframe content
+_LEADING_DOCTYPE_RE = re.compile(r'\s*<!doctype[^>]*>', re.IGNORECASE)
+_LXML_DIVERGENT_RE = re.compile(
+    r'\x00|<!(?!--)|<!---?>'
+    r'|</?\s*(?:table|tbody|thead|tfoot|tr|td|th|caption|colgroup|col|li|dd|dt|form|fieldset|p'
+    r'|noembed|noframes|xmp|textarea|plaintext|listing|select|option|optgroup)\b'
+    r'|<iframe\b[^>]*>(?!\s*</iframe)',
+    re.IGNORECASE
+)
+# Comments and start/end tags (name, attributes)
+_MARKUP_RE = re.compile(r'<!--.*?-->|<(/?)([A-Za-z][A-Za-z0-9]*)((?:"[^"]*"|\'[^\']*\'|[^\'">])*)>', re.DOTALL)
+_RAW_TEXT_END_RES = {name: re.compile(f'</{name}', re.IGNORECASE) for name in ('script', 'style')}
+# Document structure elements: only valid while nothing but <html>/<head> is open
+_DOCUMENT_TAGS = frozenset(('html', 'head', 'body', 'title'))
+_VOID_TAGS = frozenset(('area', 'base', 'br', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr'))
+# Character references: complete ones (with ";") and legacy named ones without it
+_CHAR_REF_RE = re.compile(r'&(?:#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[A-Za-z][A-Za-z0-9]*;?)')
+_LEGACY_ENTITIES = tuple(name for name in html.entities.html5 if not name.endswith(';'))
+
+
+def _lxml_compatible(content: str) -> bool:
+    """
+    Whether libxml2 builds the same tree and text as html.parser for a document
+
+    The trees only agree for well-formed markup: every element is closed, in
+    order, and none of the constructs the parsers repair differently occur.
+    """
+    doctype = _LEADING_DOCTYPE_RE.match(content)
+    start = doctype.end() if doctype else 0
+    if _LXML_DIVERGENT_RE.search(content, start):
+        return False
+    
+    # Unknown entities and references without ";" are decoded differently
+    for match in _CHAR_REF_RE.finditer(content):
+        reference = match.group()[1:]
+        if not reference.endswith(';'):
+            if reference.startswith('#') or reference.startswith(_LEGACY_ENTITIES):
+                return False
+        elif not reference.startswith('#') and reference not in html.entities.html5:
+            return False
+    
+    open_tags = []
+    comments = 0
+    position = start
+    while True:
+        match = _MARKUP_RE.search(content, position)
+        if match is None:
+            break
+        position = match.end()
+        closing, name, attributes = match.groups()
+        if name is None:
+            comments += 1
+            continue
+        name = name.lower()
+        if name in _DOCUMENT_TAGS and not closing and not set(open_tags) <= {'html', 'head'}:
+            return False
+        if closing:
+            if not open_tags or open_tags[-1] != name:
+                return False
+            open_tags.pop()
+        elif name not in _VOID_TAGS and not attributes.endswith('/'):
+            open_tags.append(name)
+            if name in _RAW_TEXT_END_RES:
+                end = _RAW_TEXT_END_RES[name].search(content, position)
+                if end is None:
+                    return False
+                position = end.start()
+    
+    # An unclosed comment is text for html.parser
+    return not open_tags and content.count('<!--', start) == comments
+
+
+def _has_class(classes: List[str], wanted: str) -> bool:
+    """BeautifulSoup's class_ matching: one of the element's classes, or all of them in order"""
+    return wanted in classes or wanted == ' '.join(classes)
+
+
+def _lxml_strings(element, strip: bool = True):
+    """Strings below an lxml element, as BeautifulSoup's get_text() collects them"""
+    if element.tag in _STRING_CONTAINER_TAGS:
+        return
+    if element.text:
+        text = element.text.strip() if strip else element.text
+        if text:
+            yield text
+    for child in element:
+        if isinstance(child.tag, str):
+            yield from _lxml_strings(child, strip)
+        if child.tail:
+            text = child.tail.strip() if strip else child.tail
+            if text:
+                yield text
+
+
+def _lxml_string(element) -> Optional[str]:
+    """
+    BeautifulSoup's Tag.string for an lxml element: the text at the end of a chain
+    of only children, or None (also for text get_text() would not include)
+    """
+    while True:
+        if element.tag in _STRING_CONTAINER_TAGS:
+            return None
+        children = len(element)
+        if element.text:
+            return element.text if children == 0 else None
+        if children != 1:
+            return None
+        child = element[0]
+        if child.tail or not isinstance(child.tag, str):
+            return None
+        element = child
+
 
 class TranscriptHTMLParser:
     """Parser for political transcript HTML files"""
     
-    def __init__(self):
+    def __init__(self, backend: str = "html.parser"):
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown HTML parser backend: {backend} (expected one of {', '.join(PARSER_BACKENDS)})")
+        if backend == "lxml" and not HAS_LXML:
+            logger.warning("lxml not available, falling back to html.parser")
+            backend = "html.parser"
+        self.backend = backend
         self.video_metadata = {}
         self.segments = []
     
@@ -25,17 +193,51 @@ class TranscriptHTMLParser:
         Args:
             file_path: Path to the HTML file
             
+        Returns:
+            Dictionary containing video metadata and transcript segments
+        """
+        with open(file_path, 'rb') as f:
+            raw_content = f.read()
+        return self.parse_content(raw_content, file_path)
+    
+    def parse_content(self, raw_content: bytes, file_path: str) -> Dict[str, Any]:
+        """
+        Parse the content of an HTML transcript file, already read into memory
+        
+        Args:
+            raw_content: File content (UTF-8)
+            file_path: Path the content was read from (for the filename metadata)
+            
         Returns:
             Dictionary containing video metadata and transcript segments
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Same text as reading the file in text mode (universal newlines)
+            content = raw_content.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+            
+            filename = Path(file_path).name
+            
+            if self.backend == "lxml" and _lxml_compatible(content):
+                import lxml.html
+                from lxml import etree
+                
+                try:
+                    document = lxml.html.document_fromstring(content)
+                except (etree.ParserError, ValueError):
+                    # Empty documents and XML declarations; html.parser copes with both
+                    document = None
+                if document is not None:
+                    video_metadata = self._build_video_metadata(filename, self._page_tags_lxml(document))
+                    segments = self._extract_transcript_segments_lxml(document)
+                    return {
+                        'video_metadata': video_metadata,
+                        'segments': segments,
+                        'total_segments': len(segments)
+                    }
             
             soup = BeautifulSoup(content, 'html.parser')
             
             # Extract video metadata from filename and HTML
-            filename = Path(file_path).name
             video_metadata = self._extract_video_metadata(soup, filename)
             
             # Extract transcript segments
@@ -53,6 +255,35 @@ class TranscriptHTMLParser:
     
     def _extract_video_metadata(self, soup: BeautifulSoup, filename: str) -> Dict[str, Any]:
         """Extract video metadata from HTML and filename"""
+        page_tags = {}
+        for key, name, attrs, value_attr in _PAGE_TAGS:
+            tag = soup.find(name, attrs)
+            if tag:
+                page_tags[key] = tag.get_text() if value_attr is None else tag.get(value_attr, '')
+        return self._build_video_metadata(filename, page_tags)
+    
+    def _page_tags_lxml(self, document) -> Dict[str, str]:
+        """First match of each metadata tag, in one pass over meta/title/iframe elements"""
+        page_tags = {}
+        for element in document.iter('meta', 'title', 'iframe'):
+            for key, name, attrs, value_attr in _PAGE_TAGS:
+                if key in page_tags or element.tag != name:
+                    continue
+                if all(element.get(attr) == value for attr, value in attrs.items()):
+                    page_tags[key] = (
+                        ''.join(_lxml_strings(element, strip=False)) if value_attr is None
+                        else element.get(value_attr, '')
+                    )
+        return page_tags
+    
+    def _build_video_metadata(self, filename: str, page_tags: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Video metadata from the filename and the page's metadata tags
+        
+        Args:
+            filename: HTML file name
+            page_tags: Values of the metadata tags found (see _PAGE_TAGS); missing tags are absent
+        """
         metadata = {
             'filename': filename,
             'title': '',
@@ -68,13 +299,10 @@ class TranscriptHTMLParser:
         }
         
         # Extract title from meta tag or title tag
-        title_tag = soup.find('meta', {'property': 'og:title'})
-        if title_tag:
-            metadata['title'] = title_tag.get('content', '').replace('Roll Call Factba.se - ', '')
-        else:
-            title_tag = soup.find('title')
-            if title_tag:
-                metadata['title'] = title_tag.get_text().replace('Roll Call Factba.se - ', '')
+        if 'og_title' in page_tags:
+            metadata['title'] = page_tags['og_title'].replace('Roll Call Factba.se - ', '')
+        elif 'title' in page_tags:
+            metadata['title'] = page_tags['title'].replace('Roll Call Factba.se - ', '')
         
         # Extract date from filename (e.g., "may-16-2025", "april-30-2020", "february-6-2019")
         date_patterns = [
@@ -117,10 +345,9 @@ class TranscriptHTMLParser:
             
             # Try to extract from meta modified time
             if not metadata['date']:
-                modified_tag = soup.find('meta', {'property': 'article:modified_time'})
-                if modified_tag:
+                if 'modified_time' in page_tags:
                     try:
-                        modified_time = modified_tag.get('content', '')
+                        modified_time = page_tags['modified_time']
                         # Parse ISO format: 2024-04-22T15:47:56+00:00
                         metadata['date'] = datetime.fromisoformat(modified_time.replace('Z', '+00:00')).date()
                     except ValueError:
@@ -243,19 +470,16 @@ class TranscriptHTMLParser:
             metadata['record_type'] = 'Public Forum'
         
         # Extract description
-        desc_tag = soup.find('meta', {'name': 'description'})
-        if desc_tag:
-            metadata['description'] = desc_tag.get('content', '')
+        if 'description' in page_tags:
+            metadata['description'] = page_tags['description']
         
         # Extract URL
-        url_tag = soup.find('meta', {'property': 'og:url'})
-        if url_tag:
-            metadata['url'] = url_tag.get('content', '')
+        if 'og_url' in page_tags:
+            metadata['url'] = page_tags['og_url']
         
         # Extract video thumbnail URL and construct video URL
-        video_thumb_tag = soup.find('meta', {'name': 'twitter:image'})
-        if video_thumb_tag:
-            thumb_url = video_thumb_tag.get('content', '')
+        if 'thumbnail' in page_tags:
+            thumb_url = page_tags['thumbnail']
             if 'media-cdn.factba.se' in thumb_url:
                 metadata['video_thumbnail_url'] = thumb_url
                 
@@ -268,9 +492,8 @@ class TranscriptHTMLParser:
                     metadata['video_url'] = f"https://factba.se/video/{video_id}"
         
         # Extract Vimeo video ID from iframe
-        vimeo_iframe = soup.find('iframe', {'id': 'vimeoPlayer'})
-        if vimeo_iframe:
-            vimeo_src = vimeo_iframe.get('src', '')
+        if 'vimeo_src' in page_tags:
+            vimeo_src = page_tags['vimeo_src']
             # Pattern: https://player.vimeo.com/video/941627232?h=...
             vimeo_id_match = re.search(r'player\.vimeo\.com/video/(\d+)', vimeo_src)
             if vimeo_id_match:
@@ -279,16 +502,17 @@ class TranscriptHTMLParser:
         
         return metadata
     
+    
     def _extract_transcript_segments(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
         """Extract all transcript segments from HTML"""
         segments = []
         
         # Find all transcript segments
-        segment_divs = soup.find_all('div', class_='mb-4 border-b mx-6 my-4')
+        segment_divs = soup.find_all('div', class_=SEGMENT_CLASS)
         
         for segment_div in segment_divs:
             try:
-                segment_data = self._parse_segment(segment_div)
+                segment_data = self._build_segment(self._segment_parts(segment_div))
                 if segment_data:
                     segments.append(segment_data)
             except Exception as e:
@@ -297,34 +521,228 @@ class TranscriptHTMLParser:
         
         return segments
     
-    def _parse_segment(self, segment_div: Tag) -> Optional[Dict[str, Any]]:
-        """Parse a single transcript segment"""
+    def _extract_transcript_segments_lxml(self, document) -> List[Dict[str, Any]]:
+        """Extract all transcript segments from an lxml document"""
+        segments = []
+        
+        for segment_div in document.iter('div'):
+            if not _has_class((segment_div.get('class') or '').split(), SEGMENT_CLASS):
+                continue
+            try:
+                segment_data = self._build_segment(self._segment_parts_lxml(segment_div))
+                if segment_data:
+                    segments.append(segment_data)
+            except Exception as e:
+                logger.warning(f"Error parsing segment: {str(e)}")
+                continue
+        
+        return segments
+    
+    def _segment_parts(self, segment_div: Tag) -> Dict[str, Any]:
+        """
+        Locate the elements of a segment and collect their text
+        
+        Returns:
+            Raw values for _build_segment; 'details' is None when the segment has
+            no analytics section
+        """
+        play_button = segment_div.find('a', class_=PLAY_BUTTON_CLASS)
+        h2_tag = segment_div.find('h2', class_=SPEAKER_CLASS)
+        timestamp_span = segment_div.find('span', class_=TIMESTAMP_CLASS)
+        text_div = segment_div.find('div', class_=TRANSCRIPT_CLASS)
+        
+        parts = {
+            'id': segment_div.get('id', ''),
+            'seconds': play_button.get('data-seconds') if play_button else None,
+            'speaker_name': h2_tag.get_text(strip=True) if h2_tag else None,
+            'timestamp_text': timestamp_span.get_text(strip=True) if timestamp_span else None,
+            'transcript_text': text_div.get_text(strip=True) if text_div else None,
+            'details': None,
+        }
+        
+        # Find the expandable details section
+        details_div = segment_div.find('div', {'x-show': 'openDetails'})
+        if details_div:
+            def rows(row_class: str, cell_class: str) -> List[List[str]]:
+                return [
+                    [cell.get_text(strip=True) for cell in row.find_all('div', class_=cell_class)]
+                    for row in details_div.find_all('div', class_=row_class)
+                ]
+            
+            parts['details'] = {
+                'sentiment_rows': rows(SENTIMENT_CLASS, METRIC_CELL_CLASS),
+                'moderation_rows': rows(MODERATION_CLASS, METRIC_CELL_CLASS),
+                'topic_rows': rows(TOPIC_CLASS, TOPIC_CELL_CLASS),
+                'readability_texts': [
+                    div.get_text(strip=True) for div in details_div.find_all('div', class_=SENTIMENT_CLASS)
+                ],
+                # Stresslens values are looked up in the whole segment
+                'stress_texts': [
+                    div.get_text(strip=True) for div in segment_div.find_all('div', class_=STRESS_CLASS)
+                ],
+                'stress_indicator_texts': [
+                    div.get_text(strip=True) for div in segment_div.find_all('div', string=_STRESS_INDICATOR_RE)
+                ],
+            }
+        
+        return parts
+    
+    def _segment_parts_lxml(self, segment_div) -> Dict[str, Any]:
+        """
+        Same values as _segment_parts, collected in a single walk of the segment
+        
+        An element of interest gets a text collector when the walk enters it, and
+        every string met while collectors are open is appended to all of them.
+        Metric and topic cells are added to each enclosing row they belong to.
+        """
+        first: Dict[str, Any] = {}  # field -> value or collector of the first matching element
+        details: Dict[str, list] = {
+            'sentiment_rows': [],
+            'moderation_rows': [],
+            'topic_rows': [],
+            'readability_texts': [],
+            'stress_texts': [],
+            'stress_indicator_texts': [],
+        }
+        detail_rows = (
+            ('sentiment_rows', SENTIMENT_CLASS, METRIC_CELL_CLASS),
+            ('moderation_rows', MODERATION_CLASS, METRIC_CELL_CLASS),
+            ('topic_rows', TOPIC_CLASS, TOPIC_CELL_CLASS),
+        )
+        open_collectors: List[List[str]] = []
+        open_rows: List[Tuple[str, List[List[str]]]] = []  # (cell class, cells) of the enclosing rows
+        
+        def collect(text: Optional[str]):
+            if text and open_collectors:
+                text = text.strip()
+                if text:
+                    for collector in open_collectors:
+                        collector.append(text)
+        
+        # Frames: [element, child iterator, collector opened, rows opened, children in details, excluded]
+        walk = [[segment_div, iter(segment_div), False, 0, False, False]]
+        while walk:
+            frame = walk[-1]
+            element = next(frame[1], None)
+            
+            if element is None:
+                element, _, collector_opened, rows_opened, _, _ = walk.pop()
+                if collector_opened:
+                    open_collectors.pop()
+                if rows_opened:
+                    del open_rows[-rows_opened:]
+                if walk and not walk[-1][5]:
+                    collect(element.tail)
+                continue
+            
+            if not isinstance(element.tag, str):
+                # Comments and processing instructions: only their tail is text
+                if not frame[5]:
+                    collect(element.tail)
+                continue
+            
+            tag = element.tag
+            in_details = frame[4]
+            excluded = frame[5] or tag in _STRING_CONTAINER_TAGS
+            classes = (element.get('class') or '').split()
+            own: List[str] = []
+            wants_text = False
+            rows_opened = 0
+            details_root = False
+            
+            if tag == 'a':
+                if 'seconds' not in first and _has_class(classes, PLAY_BUTTON_CLASS):
+                    first['seconds'] = element.get('data-seconds')
+            elif tag == 'h2':
+                if 'speaker_name' not in first and _has_class(classes, SPEAKER_CLASS):
+                    first['speaker_name'] = own
+                    wants_text = True
+            elif tag == 'span':
+                if 'timestamp_text' not in first and _has_class(classes, TIMESTAMP_CLASS):
+                    first['timestamp_text'] = own
+                    wants_text = True
+            elif tag == 'div':
+                if 'transcript_text' not in first and _has_class(classes, TRANSCRIPT_CLASS):
+                    first['transcript_text'] = own
+                    wants_text = True
+                if in_details:
+                    for cell_class, cells in open_rows:
+                        if _has_class(classes, cell_class):
+                            cells.append(own)
+                            wants_text = True
+                    for rows_key, row_class, cell_class in detail_rows:
+                        if _has_class(classes, row_class):
+                            cells = []
+                            details[rows_key].append(cells)
+                            open_rows.append((cell_class, cells))
+                            rows_opened += 1
+                    if _has_class(classes, SENTIMENT_CLASS):
+                        details['readability_texts'].append(own)
+                        wants_text = True
+                if 'details' not in first and element.get('x-show') == 'openDetails':
+                    first['details'] = details
+                    details_root = True
+                if _has_class(classes, STRESS_CLASS):
+                    details['stress_texts'].append(own)
+                    wants_text = True
+                if not excluded:
+                    string = _lxml_string(element)
+                    if string is not None and _STRESS_INDICATOR_RE.search(string):
+                        details['stress_indicator_texts'].append(string.strip())
+            
+            if wants_text:
+                open_collectors.append(own)
+            if not excluded:
+                collect(element.text)
+            walk.append([element, iter(element), wants_text, rows_opened, in_details or details_root, excluded])
+        
+        def text(collector: Optional[List[str]]) -> Optional[str]:
+            return ''.join(collector) if collector is not None else None
+        
+        parts = {
+            'id': segment_div.get('id', ''),
+            'seconds': first.get('seconds'),
+            'speaker_name': text(first.get('speaker_name')),
+            'timestamp_text': text(first.get('timestamp_text')),
+            'transcript_text': text(first.get('transcript_text')),
+            'details': None,
+        }
+        if 'details' in first:
+            parts['details'] = {
+                'sentiment_rows': [[text(cell) for cell in cells] for cells in details['sentiment_rows']],
+                'moderation_rows': [[text(cell) for cell in cells] for cells in details['moderation_rows']],
+                'topic_rows': [[text(cell) for cell in cells] for cells in details['topic_rows']],
+                'readability_texts': [text(collector) for collector in details['readability_texts']],
+                'stress_texts': [text(collector) for collector in details['stress_texts']],
+                'stress_indicator_texts': details['stress_indicator_texts'],
+            }
+        
+        return parts
+    
+    def _build_segment(self, parts: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Turn the raw values of a segment into its fields"""
         segment_data = {}
         
         # Extract segment ID
-        segment_id = segment_div.get('id', '')
-        if segment_id:
-            segment_data['segment_id'] = segment_id.split('-')[-1]  # Get the number part
+        if parts['id']:
+            segment_data['segment_id'] = parts['id'].split('-')[-1]  # Get the number part
         
         # Extract video seconds from play button
-        play_button = segment_div.find('a', class_='transcript-play-video')
-        if play_button:
-            seconds = play_button.get('data-seconds')
-            if seconds:
-                segment_data['video_seconds'] = int(seconds)
+        if parts['seconds']:
+            segment_data['video_seconds'] = int(parts['seconds'])
         
         # Extract speaker name and timestamp
-        speaker_info = self._extract_speaker_info(segment_div)
+        speaker_info = self._extract_speaker_info(parts['speaker_name'], parts['timestamp_text'])
         segment_data.update(speaker_info)
         
         # Extract transcript text
-        text_div = segment_div.find('div', class_='flex-auto text-md text-gray-600 leading-loose')
-        if text_div:
-            segment_data['transcript_text'] = text_div.get_text(strip=True)
+        if parts['transcript_text'] is not None:
+            segment_data['transcript_text'] = parts['transcript_text']
         
         # Extract analytics data from expandable section
-        analytics_data = self._extract_analytics_data(segment_div)
-        segment_data.update(analytics_data)
+        if parts['details'] is not None:
+            analytics_data = self._extract_analytics_data(parts['details'])
+            segment_data.update(analytics_data)
         
         # Calculate text metrics
         if 'transcript_text' in segment_data:
@@ -334,19 +752,16 @@ class TranscriptHTMLParser:
         
         return segment_data if segment_data.get('transcript_text') else None
     
-    def _extract_speaker_info(self, segment_div: Tag) -> Dict[str, Any]:
+    def _extract_speaker_info(self, speaker_name: Optional[str], timestamp_text: Optional[str]) -> Dict[str, Any]:
         """Extract speaker name and timestamp information"""
         speaker_info = {}
         
-        # Find speaker name in h2 tag
-        h2_tag = segment_div.find('h2', class_='text-md inline')
-        if h2_tag:
-            speaker_info['speaker_name'] = h2_tag.get_text(strip=True)
+        # Speaker name from the h2 tag
+        if speaker_name is not None:
+            speaker_info['speaker_name'] = speaker_name
         
-        # Find timestamp in span tag
-        timestamp_span = segment_div.find('span', class_='text-xs text-gray-600 inline ml-2')
-        if timestamp_span:
-            timestamp_text = timestamp_span.get_text(strip=True)
+        # Timestamp from the span tag
+        if timestamp_text is not None:
             # Parse timestamp like "00:07:02-00:07:04 (2 sec)"
             timestamp_match = re.match(r'(\d{2}:\d{2}:\d{2})-(\d{2}:\d{2}:\d{2})\s*\((\d+)\s*sec\)', timestamp_text)
             if timestamp_match:
@@ -356,51 +771,39 @@ class TranscriptHTMLParser:
         
         return speaker_info
     
-    def _extract_analytics_data(self, segment_div: Tag) -> Dict[str, Any]:
+    def _extract_analytics_data(self, details: Dict[str, list]) -> Dict[str, Any]:
         """Extract sentiment, moderation, topic, and readability data"""
         analytics_data = {}
         
-        # Find the expandable details section
-        details_div = segment_div.find('div', {'x-show': 'openDetails'})
-        if not details_div:
-            return analytics_data
-        
         # Extract sentiment analysis
-        sentiment_data = self._extract_sentiment_data(details_div)
+        sentiment_data = self._extract_sentiment_data(details['sentiment_rows'])
         analytics_data.update(sentiment_data)
         
         # Extract content moderation
-        moderation_data = self._extract_moderation_data(details_div)
+        moderation_data = self._extract_moderation_data(details['moderation_rows'])
         analytics_data.update(moderation_data)
         
         # Extract topic classification
-        topic_data = self._extract_topic_data(details_div)
+        topic_data = self._extract_topic_data(details['topic_rows'])
         analytics_data.update(topic_data)
         
         # Extract readability metrics
-        readability_data = self._extract_readability_data(details_div)
+        readability_data = self._extract_readability_data(details['readability_texts'])
         analytics_data.update(readability_data)
         
         # Extract stresslens data
-        stresslens_data = self._extract_stresslens_data(segment_div)
+        stresslens_data = self._extract_stresslens_data(details['stress_texts'], details['stress_indicator_texts'])
         analytics_data.update(stresslens_data)
         
         return analytics_data
     
-    def _extract_sentiment_data(self, details_div: Tag) -> Dict[str, Any]:
-        """Extract sentiment analysis data"""
+    def _extract_sentiment_data(self, rows: List[List[str]]) -> Dict[str, Any]:
+        """Extract sentiment analysis data from the texts of each row's 'mb-2' cells"""
         sentiment_data = {}
         
-        # Look for sentiment sections with the correct HTML structure
-        sentiment_divs = details_div.find_all('div', class_='mb-4 flex gap-2')
-        
-        for div in sentiment_divs:
-            # Get all child divs with class 'mb-2'
-            child_divs = div.find_all('div', class_='mb-2')
-            if len(child_divs) >= 3:
-                name_text = child_divs[0].get_text(strip=True)
-                score_text = child_divs[1].get_text(strip=True)
-                label_text = child_divs[2].get_text(strip=True)
+        for cells in rows:
+            if len(cells) >= 3:
+                name_text, score_text, label_text = cells[:3]
                 
                 # Loughran McDonald sentiment (prefer Relative version)
                 if 'Loughran McDonald' in name_text and 'Relative' in name_text:
@@ -428,19 +831,13 @@ class TranscriptHTMLParser:
         
         return sentiment_data
     
-    def _extract_moderation_data(self, details_div: Tag) -> Dict[str, Any]:
-        """Extract content moderation scores"""
+    def _extract_moderation_data(self, rows: List[List[str]]) -> Dict[str, Any]:
+        """Extract content moderation scores from the texts of each row's 'mb-2' cells"""
         moderation_data = {}
         
-        # Look for moderation sections with the correct HTML structure
-        moderation_divs = details_div.find_all('div', class_='mb-4')
-        
-        for div in moderation_divs:
-            # Get all child divs with class 'mb-2'
-            child_divs = div.find_all('div', class_='mb-2')
-            if len(child_divs) >= 3:
-                name_text = child_divs[0].get_text(strip=True)
-                score_text = child_divs[1].get_text(strip=True)
+        for cells in rows:
+            if len(cells) >= 3:
+                name_text, score_text = cells[:2]
                 
                 # Only process basic moderation categories (not subcategories like "Violence > Graphic")
                 if '>' in name_text:
@@ -478,20 +875,15 @@ class TranscriptHTMLParser:
         
         return moderation_data
     
-    def _extract_topic_data(self, details_div: Tag) -> Dict[str, Any]:
-        """Extract topic classification data"""
+    def _extract_topic_data(self, rows: List[List[str]]) -> Dict[str, Any]:
+        """Extract topic classification data from the texts of each row's 'w-1/2' cells"""
         topic_data = {}
         
-        # Look for topic sections with the correct HTML structure
-        topic_divs = details_div.find_all('div', class_='flex gap-2 py-2 border-b')
-        
         current_topic = {}
-        for div in topic_divs:
-            # Get child divs with class 'w-1/2'
-            child_divs = div.find_all('div', class_='w-1/2')
-            if len(child_divs) >= 2:
-                key_text = child_divs[0].get_text(strip=True).rstrip(':')
-                value_text = child_divs[1].get_text(strip=True)
+        for cells in rows:
+            if len(cells) >= 2:
+                key_text = cells[0].rstrip(':')
+                value_text = cells[1]
                 
                 if key_text == 'Topic':
                     current_topic['name'] = value_text
@@ -523,15 +915,11 @@ class TranscriptHTMLParser:
         
         return topic_data
     
-    def _extract_readability_data(self, details_div: Tag) -> Dict[str, Any]:
-        """Extract readability metrics"""
+    def _extract_readability_data(self, texts: List[str]) -> Dict[str, Any]:
+        """Extract readability metrics from the texts of the 'mb-4 flex gap-2' sections"""
         readability_data = {}
         
-        # Look for readability sections
-        readability_divs = details_div.find_all('div', class_='mb-4 flex gap-2')
-        
-        for div in readability_divs:
-            text_content = div.get_text(strip=True)
+        for text_content in texts:
             
             if 'Flesch-Kincaid Grade' in text_content:
                 score_match = re.search(r'Flesch-Kincaid Grade\s+([\d.]+)', text_content)
@@ -565,15 +953,17 @@ class TranscriptHTMLParser:
         
         return readability_data
     
-    def _extract_stresslens_data(self, segment_div: Tag) -> Dict[str, Any]:
-        """Extract stresslens stress analytics from HTML"""
-        stresslens_data = {}
+    def _extract_stresslens_data(self, texts: List[str], indicator_texts: List[str]) -> Dict[str, Any]:
+        """
+        Extract stresslens stress analytics
         
-        # Look for stresslens display in the segment
-        stress_divs = segment_div.find_all('div', class_='hidden sm:block')
+        Args:
+            texts: Texts of the segment's stresslens displays ('hidden sm:block' divs)
+            indicator_texts: Texts of the segment's divs whose only string mentions stress
+        """
+        stresslens_data = {}
         
-        for div in stress_divs:
-            text_content = div.get_text(strip=True)
+        for text_content in texts:
             
             # Check for "No StressLens" case
             if 'No StressLens' in text_content:
@@ -608,9 +998,7 @@ class TranscriptHTMLParser:
                     break
         
         # Also check for stress level indicators in segment header
-        stress_indicators = segment_div.find_all('div', string=re.compile(r'.*[Ss]tress.*'))
-        for indicator in stress_indicators:
-            text = indicator.get_text(strip=True)
+        for text in indicator_texts:
             if 'No StressLens' not in text:
                 # Try to extract numeric values from any stress-related text
                 numbers = re.findall(r'\d+\.?\d*', text)
@@ -3,16 +3,25 @@ VLOS XML parser for Tweede Kamer proceedings
 
 Enhanced parser that properly handles admin fragments, chair mapping, 
 attendees detection, speaker resolution, merging, and deduplication.
+
+With streaming=True the document is read with an incremental pull parser:
+processed subtrees are dropped as they close, so memory stays bounded and
+large plenary sessions parse in linear time. Both modes give the same result.
 """
 from __future__ import annotations
 
+import codecs
 import re
 import xml.etree.ElementTree as ET
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime, date, time
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+# Bump when the parsed output changes: directory imports reparse files read by another version
+PARSER_VERSION = "1"
 
 def _parse_time_to_seconds(value: Optional[str]) -> Optional[int]:
     if not value:
@@ -166,6 +175,23 @@ FALSE_SPEAKER_PATTERNS = [
 ]
 
 
+def _combine_patterns(patterns: List[re.Pattern]) -> re.Pattern:
+    """Fold a list of anchored patterns into one alternation matched in a single pass.
+    
+    All patterns above are case-insensitive except ones that only match digits,
+    so compiling the alternation with IGNORECASE keeps every match the same.
+    """
+    return re.compile("|".join(f"(?:{pattern.pattern})" for pattern in patterns), re.IGNORECASE)
+
+
+_ANNOUNCEMENT_RE = _combine_patterns(ANNOUNCEMENT_PATTERNS)
+_FALSE_SPEAKER_RE = _combine_patterns(FALSE_SPEAKER_PATTERNS)
+
+# Speaker lines repeat throughout a session (and across sessions), so their
+# classification is memoized per distinct string
+SPEAKER_CACHE_SIZE = 8192
+
+
 def _strip_preamble(text: str) -> str:
     """Strip leading speaker preamble using label patterns."""
     if not text:
@@ -278,6 +304,101 @@ def _is_chair_speech(text: str) -> bool:
     return bool(CHAIR_PATTERNS['chair_speech'].match(text.strip()))
 
 
+def _is_false_speaker(candidate_text: str) -> bool:
+    """Check if text that looks like a speaker is actually just content."""
+    if not candidate_text:
+        return True
+    
+    # Check against false speaker patterns
+    if _FALSE_SPEAKER_RE.match(candidate_text):
+        return True
+    
+    # Very short phrases are likely false speakers
+    if len(candidate_text.strip()) < 4:
+        return True
+    
+    return False
+
+
+@lru_cache(maxsize=SPEAKER_CACHE_SIZE)
+def _extract_speaker_name(text: str) -> str:
+    """Extract clean speaker name from speaker line text.
+
+    Uses enhanced speaker detection patterns and better fallback logic.
+    """
+    if not text:
+        return "Onbekend"
+
+    # Remove XML tags but keep inner text
+    clean_text = re.sub(r"<[^>]+>", "", text).strip()
+
+    # Special-case voorzitter (handle both "De voorzitter" and "Voorzitter")
+    m_voor = re.match(r"^\s*(De\s+)?voorzitter\s*:", clean_text, re.IGNORECASE)
+    if m_voor:
+        return "De voorzitter" if m_voor.group(1) else "Voorzitter"
+
+    # Try the original pattern
+    m = SPEAKER_FULL_RE.match(clean_text)
+    if m:
+        prefix = (m.group("prefix") or "").strip()
+        name = (m.group("name") or "").strip()
+
+        # If no recognized prefix, try some heuristics
+        if not prefix:
+            if name.lower() == "voorzitter":
+                return "Voorzitter"
+            # Check if this looks like a valid name (starts with capital letter, reasonable length, no common words)
+            if name and len(name.split()) <= 4 and re.match(r"^[A-Z]", name) and not any(word.lower() in ['speaker', 'pattern', 'text', 'content', 'here', 'random', 'just', 'some'] for word in name.split()):
+                # Could be a speaker name without prefix - accept it
+                return name
+            return "Onbekend"
+
+        # Preserve Minister and Staatssecretaris prefixes (they are part of the speaker name)
+        if prefix.lower().startswith("minister") or prefix.lower().startswith("staatssecretaris"):
+            return f"{prefix} {name}".strip()
+
+        # For 'De heer' and 'Mevrouw' prefixes, return only the name
+        return name or "Onbekend"
+
+    # Final fallback: check if it looks like a simple name pattern (no colon)
+    if ':' not in clean_text:
+        simple_name_match = re.match(r"^\s*([A-Z][a-z]+(?:\s+[a-z]+\s+[A-Z][a-z]+)*)\s*$", clean_text)
+        if simple_name_match:
+            return simple_name_match.group(1).strip()
+
+    return "Onbekend"
+
+
+def _extract_party(text: str) -> str:
+    """Extract political party code from speaker line text and normalize it.
+
+    This will:
+    - match party tokens inside parentheses like (PVV), (PvdA), (P.v.d.A.), (D66), (GroenLinks)
+    - normalize by removing dots and whitespace and returning an uppercase token
+    """
+    if not text:
+        return ""
+
+    match = _PARTY_RE.search(text)
+    if not match:
+        return ""
+
+    raw = match.group(1).strip()
+    # Remove dots and spaces commonly used in party abbreviations (e.g., "P.v.d.A." -> "PVDA")
+    normalized = re.sub(r"[.\s]", "", raw)
+    # Uppercase for consistency (downstream code can map to human-friendly names if needed)
+    normalized = normalized.upper()
+    return normalized
+
+
+@lru_cache(maxsize=SPEAKER_CACHE_SIZE)
+def _classify_speaker_line(candidate: str) -> Optional[str]:
+    """Party of a speaker line label (the text before its colon), or None if it is not a speaker."""
+    if _is_false_speaker(candidate) or _extract_speaker_name(candidate + ":") == "Onbekend":
+        return None
+    return _extract_party(candidate)
+
+
 def _merge_consecutive_parts(parts: List[ActivityPart]) -> List[ActivityPart]:
     """Merge consecutive parts with same speaker and contiguous timestamps."""
     if not parts:
@@ -346,12 +467,115 @@ def _cleanup_paragraph_text(text: str) -> Tuple[str, str]:
     return text_raw, text_plain
 
 
+# Tags whose first non-empty text gives the session title / date
+_TITLE_TAGS = ("titel", "sessionTitle", "title", "VergaderingTitel", "vergadering_titel")
+_DATE_TAGS = ("datum", "date", "Datum", "vergadering_datum")
+_CHAIR_TAGS = ("voorzitter", "chairman")
+
+# A <tekst> block takes its speaker and timing from the direct children of up to
+# this many ancestors
+_TEKST_CONTEXT_LEVELS = 5
+_CONTEXT_TAGS = ("spreker", "markeertijdbegin", "markeertijdeind")
+
+# Elements whose whole subtree is read when they close (streaming mode)
+_SUBTREE_TAGS = frozenset(("alineaitem", "spreker") + _CHAIR_TAGS)
+
+STREAM_CHUNK_SIZE = 1 << 20
+
+_SCRAPER_COMMENT_RE = re.compile(r"^\s*<!--\s*scraper-metadata:base64:[\s\S]*?-->\s*")
+_LEADING_BOM_RE = re.compile(r"^(?:\s*(?:\ufeff|\u00EF\u00BB\u00BF))+")
+# First "<" that does not open a comment: everything the cleanup touches lies before it
+_FIRST_MARKUP_RE = re.compile(r"<(?!!--)[\s\S]{3}")
+
+
+def _local_name(tag: str) -> str:
+    return tag.split('}')[-1] if '}' in tag else tag
+
+
+def _sanitize_xml_text(text: str) -> str:
+    """Drop the scraper metadata comment and BOM characters the scraper leaves in."""
+    text = _SCRAPER_COMMENT_RE.sub("", text)
+    text = text.replace("\ufeff", "")
+    return _LEADING_BOM_RE.sub("", text)
+
+
+def _sanitized_xml_chunks(chunks: Iterable[bytes], encoding: str) -> Iterator[str]:
+    """Decode XML bytes incrementally, cleaned the way _sanitize_xml_text cleans a whole document."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    head: Optional[str] = ""
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if head is None:
+            yield text.replace("\ufeff", "")
+            continue
+        # Buffer the start of the document until the cleanup can be applied in one go
+        head += text
+        if _FIRST_MARKUP_RE.search(head):
+            yield _sanitize_xml_text(head)
+            head = None
+    text = decoder.decode(b"", final=True)
+    if head is not None:
+        yield _sanitize_xml_text(head + text)
+    elif text:
+        yield text.replace("\ufeff", "")
+
+
+def _parse_session_date(date_value: Optional[str]) -> Optional[date]:
+    if not date_value:
+        return None
+    for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%Y%m%d", "%d/%m/%Y"):
+        try:
+            # accept datetime strings
+            return datetime.strptime(date_value[:10], fmt).date()
+        except Exception:
+            continue
+    return None
+
+
+def _alineaitem_text(item: ET.Element) -> str:
+    """Text of an alineaitem including nested markup, pieces joined with spaces."""
+    return " ".join(item.itertext()).strip()
+
+
+@dataclass
+class _PendingPart:
+    """Spoken content whose speaker and times still depend on document-level values."""
+    current_speaker: Optional[str]
+    detected_party: Optional[str]
+    after_chair_line: bool  # a "De voorzitter:" line came before it in the document
+    mark_start: Optional[str]
+    mark_end: Optional[str]
+    text_raw: str
+    text_plain: str
+
+
+@dataclass(eq=False)
+class _OpenElement:
+    """An element the streaming parser has entered but not yet left."""
+    element: ET.Element
+    tag: str
+    index: int  # position in document order
+    keep_subtree: bool  # an ancestor reads this subtree when it closes
+    context: List[Tuple[str, Optional[str]]] = field(default_factory=list)  # see _element_context
+    texts: List[str] = field(default_factory=list)  # alineaitem texts of a <tekst>
+    closed: bool = False
+    # activiteithoofd only, for _find_chair_from_activities
+    mentions_chair: bool = False
+    spreker_name: Optional[str] = None
+
+
 class VLOSXMLParser:
     """Enhanced VLOS XML parser with admin fragment handling and deduplication."""
 
-    def __init__(self, cursor=None):
-        """Initialize the parser with an optional database cursor for testing."""
+    def __init__(self, cursor=None, streaming: bool = False):
+        """Initialize the parser with an optional database cursor for testing.
+        
+        Args:
+            cursor: Database cursor (tests only)
+            streaming: Parse incrementally instead of building the whole tree
+        """
         self.cursor = cursor
+        self.streaming = streaming
         # Add conn attribute for tests that expect it
         self.conn = None
         self._session_metadata = SessionMetadata()
@@ -496,9 +720,8 @@ class VLOSXMLParser:
         text = text.strip()
         
         # Check against known announcement patterns (legacy)
-        for pattern in ANNOUNCEMENT_PATTERNS:
-            if pattern.match(text):
-                return True
+        if _ANNOUNCEMENT_RE.match(text):
+            return True
         
         # Additional legacy heuristics
         if len(text) > 200 and text.count(',') > 5:
@@ -529,19 +752,7 @@ class VLOSXMLParser:
     
     def _is_false_speaker(self, candidate_text: str) -> bool:
         """Check if text that looks like a speaker is actually just content."""
-        if not candidate_text:
-            return True
-            
-        # Check against false speaker patterns
-        for pattern in FALSE_SPEAKER_PATTERNS:
-            if pattern.match(candidate_text):
-                return True
-                
-        # Very short phrases are likely false speakers
-        if len(candidate_text.strip()) < 4:
-            return True
-            
-        return False
+        return _is_false_speaker(candidate_text)
     
     def _parse_datetime_to_seconds(self, value: Optional[str]) -> Optional[int]:
         """Convert ISO datetime string to seconds since midnight.
@@ -559,124 +770,383 @@ class VLOSXMLParser:
             return None
 
     def _extract_speaker_name(self, text: str) -> str:
-        """Extract clean speaker name from speaker line text.
- 
-        Uses enhanced speaker detection patterns and better fallback logic.
-        """
-        if not text:
-            return "Onbekend"
- 
-        # Remove XML tags but keep inner text
-        clean_text = re.sub(r"<[^>]+>", "", text).strip()
- 
-        # Special-case voorzitter (handle both "De voorzitter" and "Voorzitter")
-        m_voor = re.match(r"^\s*(De\s+)?voorzitter\s*:", clean_text, re.IGNORECASE)
-        if m_voor:
-            return "De voorzitter" if m_voor.group(1) else "Voorzitter"
- 
-        # Try the original pattern
-        m = SPEAKER_FULL_RE.match(clean_text)
-        if m:
-            prefix = (m.group("prefix") or "").strip()
-            name = (m.group("name") or "").strip()
- 
-            # If no recognized prefix, try some heuristics
-            if not prefix:
-                if name.lower() == "voorzitter":
-                    return "Voorzitter"
-                # Check if this looks like a valid name (starts with capital letter, reasonable length, no common words)
-                if name and len(name.split()) <= 4 and re.match(r"^[A-Z]", name) and not any(word.lower() in ['speaker', 'pattern', 'text', 'content', 'here', 'random', 'just', 'some'] for word in name.split()):
-                    # Could be a speaker name without prefix - accept it
-                    return name
-                return "Onbekend"
- 
-            # Preserve Minister and Staatssecretaris prefixes (they are part of the speaker name)
-            if prefix.lower().startswith("minister") or prefix.lower().startswith("staatssecretaris"):
-                return f"{prefix} {name}".strip()
- 
-            # For 'De heer' and 'Mevrouw' prefixes, return only the name
-            return name or "Onbekend"
-        
-        # Final fallback: check if it looks like a simple name pattern (no colon)
-        if ':' not in clean_text:
-            simple_name_match = re.match(r"^\s*([A-Z][a-z]+(?:\s+[a-z]+\s+[A-Z][a-z]+)*)\s*$", clean_text)
-            if simple_name_match:
-                return simple_name_match.group(1).strip()
-            
-        return "Onbekend"
+        """Extract clean speaker name from speaker line text (memoized per distinct text)."""
+        return _extract_speaker_name(text)
 
     def _extract_party(self, text: str) -> str:
-        """Extract political party code from speaker line text and normalize it.
-
-        This will:
-        - match party tokens inside parentheses like (PVV), (PvdA), (P.v.d.A.), (D66), (GroenLinks)
-        - normalize by removing dots and whitespace and returning an uppercase token
-        """
-        if not text:
-            return ""
-
-        match = _PARTY_RE.search(text)
-        if not match:
-            return ""
-
-        raw = match.group(1).strip()
-        # Remove dots and spaces commonly used in party abbreviations (e.g., "P.v.d.A." -> "PVDA")
-        normalized = re.sub(r"[.\s]", "", raw)
-        # Uppercase for consistency (downstream code can map to human-friendly names if needed)
-        normalized = normalized.upper()
-        return normalized
+        """Extract political party code from speaker line text and normalize it."""
+        return _extract_party(text)
 
     def parse_content(self, raw_content: bytes, file_path: str) -> Dict[str, Any]:
         """Parse XML content directly from bytes without file I/O."""
+        filename = Path(file_path).name
+        if self.streaming:
+            return self._parse_stream(
+                lambda: (raw_content[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(raw_content), STREAM_CHUNK_SIZE)),
+                filename,
+            )
+        
         try:
             text = raw_content.decode("utf-8")
         except Exception:
             # Fall back to latin-1 then convert
             text = raw_content.decode("latin-1")
         
-        # Drop leading scraper metadata comment if present
-        text = re.sub(r"^\s*<!--\s*scraper-metadata:base64:[\s\S]*?-->\s*", "", text)
-        # Remove any BOM characters and common double-encoded BOM glyphs
-        text = text.replace("\ufeff", "")
-        text = re.sub(r"^(?:\s*(?:\ufeff|\u00EF\u00BB\u00BF))+", "", text)
-        # Parse XML
-        root = ET.fromstring(text)
-
-        filename = Path(file_path).name
+        # Drop leading scraper metadata comment and BOM characters, then parse XML
+        root = ET.fromstring(_sanitize_xml_text(text))
         return self._parse_xml_root(root, filename)
 
+    def parse_chunks(self, read_chunks: Callable[[], Iterable[bytes]], file_path: str) -> Dict[str, Any]:
+        """Parse XML content from a source of byte chunks, incrementally.
+        
+        `read_chunks` is called again to re-read the content from the start if it
+        is not UTF-8.
+        """
+        return self._parse_stream(read_chunks, Path(file_path).name)
+
     def parse_file(self, file_path: str) -> Dict[str, Any]:
+        if self.streaming:
+            def read_chunks() -> Iterator[bytes]:
+                with open(file_path, "rb") as f:
+                    yield from iter(lambda: f.read(STREAM_CHUNK_SIZE), b"")
+            return self.parse_chunks(read_chunks, file_path)
+        
         # Read and sanitize XML content (remove scraper comment, stray BOMs)
         raw = Path(file_path).read_bytes()
-        filename = Path(file_path).name
         return self.parse_content(raw, file_path)
     
-    def _parse_xml_root(self, root: ET.Element, filename: str) -> Dict[str, Any]:
-        """Parse XML root element into structured data."""
-        
-        # Reset session metadata for new document
+    def _reset_document_state(self):
+        """Reset session metadata for a new document."""
         self._session_metadata = SessionMetadata()
         self._resolved_chair = None
+        self._after_chair_line = False
+    
+    def _parse_xml_root(self, root: ET.Element, filename: str) -> Dict[str, Any]:
+        """Parse XML root element into structured data."""
+        self._reset_document_state()
 
-        title = self._find_text(root, ["titel", "sessionTitle", "title", "VergaderingTitel", "vergadering_titel"]) or filename
-        date_value = self._find_text(root, ["datum", "date", "Datum", "vergadering_datum"]) or root.attrib.get("date")
-        session_date: Optional[date] = None
-        if date_value:
-            for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%Y%m%d", "%d/%m/%Y"):
-                try:
-                    # accept datetime strings
-                    session_date = datetime.strptime(date_value[:10], fmt).date()
-                    break
-                except Exception:
-                    continue
+        title = self._find_text(root, _TITLE_TAGS) or filename
+        date_value = self._find_text(root, _DATE_TAGS) or root.attrib.get("date")
 
         # Extract chair from XML metadata first
-        chair_element = self._find_element(root, ["voorzitter", "chairman"])
+        chair_name = None
+        chair_element = self._find_element(root, _CHAIR_TAGS)
         if chair_element is not None:
             chair_name = self._build_name_from_element(chair_element)
-            if chair_name:
-                self._resolved_chair = chair_name
-                self._session_metadata.chair = chair_name
+
+        # Build parent map for efficient parent lookups (replaces catastrophic gc.get_objects())
+        parent_map = {child: parent for parent in root.iter() for child in parent}
+        # Ancestors are shared by many <tekst> blocks; summarize each one once
+        contexts: Dict[ET.Element, List[Tuple[str, Optional[str]]]] = {}
+        
+        pending_parts: List[_PendingPart] = []
+        for tekst in root.iter():
+            if _local_name(tekst.tag) != "tekst":
+                continue
+            
+            ancestors = []
+            node = parent_map.get(tekst)
+            while node is not None and len(ancestors) < _TEKST_CONTEXT_LEVELS:
+                if node not in contexts:
+                    contexts[node] = self._element_context(node)
+                ancestors.append((_local_name(node.tag), contexts[node]))
+                node = parent_map.get(node)
+            current_speaker, mark_start, mark_end, _ = self._tekst_context(ancestors)
+            
+            # Collect all alineaitem texts for this tekst block
+            texts = [
+                _alineaitem_text(item)
+                for alinea in tekst if _local_name(alinea.tag) == "alinea"
+                for item in alinea if _local_name(item.tag) == "alineaitem"
+            ]
+            pending_parts.extend(self._tekst_parts([text for text in texts if text], current_speaker, mark_start, mark_end))
+        
+        activities_chair = None
+        if self._after_chair_line and not chair_name:
+            # Try to find chair from first activity head with role containing 'voorzitter'
+            activities_chair = self._find_chair_from_activities(root)
+        
+        return self._build_result(
+            filename, title, _parse_session_date(date_value), pending_parts, chair_name, activities_chair
+        )
+    
+    def _parse_stream(self, read_chunks: Callable[[], Iterable[bytes]], filename: str) -> Dict[str, Any]:
+        """Streaming counterpart of parse_content: decode, clean up and parse in one pass."""
+        try:
+            return self._parse_events(_sanitized_xml_chunks(read_chunks(), "utf-8"), filename)
+        except UnicodeDecodeError:
+            # Same fallback as parse_content; the stream is read again from the start
+            return self._parse_events(_sanitized_xml_chunks(read_chunks(), "latin-1"), filename)
+    
+    def _parse_events(self, text_chunks: Iterable[str], filename: str) -> Dict[str, Any]:
+        """Parse a document incrementally with the same result as _parse_xml_root.
+        
+        Open elements are kept on a stack. An element is summarized when it closes
+        (speaker names and timing for its parent, alineaitem texts for its <tekst>)
+        and then detached, unless an enclosing element still has to read it. A
+        <tekst> block is processed once the ancestors that give its speaker and
+        timing have closed. The session date and chair can appear anywhere in the
+        document, so they are applied to the parts at the end.
+        """
+        self._reset_document_state()
+        
+        def events() -> Iterator[Tuple[str, ET.Element]]:
+            pull_parser = ET.XMLPullParser(events=("start", "end"))
+            for chunk in text_chunks:
+                pull_parser.feed(chunk)
+                yield from pull_parser.read_events()
+            pull_parser.close()
+            yield from pull_parser.read_events()
+        
+        stack: List[_OpenElement] = []
+        heads: List[_OpenElement] = []  # open activiteithoofd elements
+        waiting: deque = deque()  # (tekst, its context ancestors nearest first), in document order
+        pending_parts: List[_PendingPart] = []
+        # (document index, value) of the first match, as _find_text / _find_element pick it
+        title: Optional[Tuple[int, str]] = None
+        date_found: Optional[Tuple[int, str]] = None
+        activities_chair: Optional[Tuple[int, str]] = None
+        chair_frame: Optional[_OpenElement] = None
+        chair_name: Optional[str] = None
+        root_date: Optional[str] = None
+        index = 0
+        
+        for event, element in events():
+            if event == "start":
+                tag = _local_name(element.tag)
+                parent = stack[-1] if stack else None
+                if parent is None:
+                    root_date = element.attrib.get("date")
+                frame = _OpenElement(
+                    element=element,
+                    tag=tag,
+                    index=index,
+                    keep_subtree=parent is not None and (parent.keep_subtree or parent.tag in _SUBTREE_TAGS),
+                )
+                index += 1
+                if tag == "tekst":
+                    waiting.append((frame, stack[-_TEKST_CONTEXT_LEVELS:][::-1]))
+                elif tag == "activiteithoofd":
+                    heads.append(frame)
+                if tag in _CHAIR_TAGS and chair_frame is None:
+                    chair_frame = frame
+                stack.append(frame)
+                continue
+            
+            frame = stack.pop()
+            frame.closed = True
+            tag = frame.tag
+            text = element.text
+            parent = stack[-1] if stack else None
+            
+            if text:
+                if tag in _TITLE_TAGS and text.strip() and (title is None or frame.index < title[0]):
+                    title = (frame.index, text.strip())
+                if tag in _DATE_TAGS and text.strip() and (date_found is None or frame.index < date_found[0]):
+                    date_found = (frame.index, text.strip())
+                if heads and CHAIR_PATTERNS['role_contains_chair'].search(text):
+                    for head in heads:
+                        head.mentions_chair = True
+            
+            if tag == "spreker":
+                name = self._build_name_from_element(element)
+                if name:
+                    for head in heads:
+                        if head.spreker_name is None:
+                            head.spreker_name = name
+                if parent is not None:
+                    parent.context.append((tag, name))
+            elif tag in ("markeertijdbegin", "markeertijdeind"):
+                if parent is not None:
+                    parent.context.append((tag, text))
+            elif tag == "alineaitem":
+                if len(stack) >= 2 and stack[-1].tag == "alinea" and stack[-2].tag == "tekst":
+                    item_text = _alineaitem_text(element)
+                    if item_text:
+                        stack[-2].texts.append(item_text)
+            elif tag == "activiteithoofd":
+                heads.pop()
+                if frame.mentions_chair and frame.spreker_name:
+                    if activities_chair is None or frame.index < activities_chair[0]:
+                        activities_chair = (frame.index, frame.spreker_name)
+            if frame is chair_frame:
+                chair_name = self._build_name_from_element(element)
+            
+            if parent is not None and not frame.keep_subtree:
+                parent.element.remove(element)
+            
+            # Emit the parts of every <tekst> whose speaker and timing are settled
+            while waiting and waiting[0][0].closed:
+                tekst, ancestors = waiting[0]
+                closed = []
+                for ancestor in ancestors:
+                    if not ancestor.closed:
+                        break
+                    closed.append(ancestor)
+                current_speaker, mark_start, mark_end, settled = self._tekst_context(
+                    [(ancestor.tag, ancestor.context) for ancestor in closed]
+                )
+                if len(closed) < len(ancestors) and not settled:
+                    break
+                waiting.popleft()
+                pending_parts.extend(self._tekst_parts(tekst.texts, current_speaker, mark_start, mark_end))
+        
+        return self._build_result(
+            filename,
+            title[1] if title else filename,
+            _parse_session_date(date_found[1] if date_found else root_date),
+            pending_parts,
+            chair_name,
+            activities_chair[1] if activities_chair and self._after_chair_line and not chair_name else None,
+        )
+    
+    def _element_context(self, element: ET.Element) -> List[Tuple[str, Optional[str]]]:
+        """Speaker names and timing markers among an element's direct children, in order."""
+        context = []
+        for child in element:
+            tag = _local_name(child.tag)
+            if tag == "spreker":
+                context.append((tag, self._build_name_from_element(child)))
+            elif tag in ("markeertijdbegin", "markeertijdeind"):
+                context.append((tag, child.text))
+        return context
+    
+    def _tekst_context(
+        self, ancestors: List[Tuple[str, List[Tuple[str, Optional[str]]]]]
+    ) -> Tuple[Optional[str], Optional[str], Optional[str], bool]:
+        """Speaker and timing of a <tekst> block from its ancestors.
+        
+        Args:
+            ancestors: (tag, _element_context) of the nearest ancestors, parent first
+        
+        Returns:
+            Tuple of (current_speaker, mark_start, mark_end, settled); settled means
+            more distant ancestors could not change the result
+        """
+        current_speaker = None
+        mark_start = None
+        mark_end = None
+        
+        # Try to find an associated <spreker> in ancestor nodes and set current_speaker
+        # Also look for timing info at woordvoerder level first
+        for tag, context in ancestors:
+            # If a spreker child exists, compose its aanhef + verslagnaam
+            for child_tag, value in context:
+                if child_tag == "spreker":
+                    if value:
+                        current_speaker = value + ":"
+                        break
+                # Get timing from woordvoerder level if available
+                elif child_tag == "markeertijdbegin" and value:
+                    mark_start = value  # Prioritize woordvoerder timing
+                elif child_tag == "markeertijdeind" and value:
+                    mark_end = value
+            
+            # Check if this parent is a woordvoerder with timing
+            if tag == "woordvoerder":
+                for child_tag, value in context:
+                    if child_tag == "markeertijdbegin" and value:
+                        mark_start = value
+                    if child_tag == "markeertijdeind" and value:
+                        mark_end = value
+            
+            if current_speaker:
+                break
+        
+        # Continue to collect timing from higher levels as fallback
+        if not mark_start or not mark_end:
+            for tag, context in ancestors:
+                for child_tag, value in context:
+                    if child_tag == "markeertijdbegin" and value and not mark_start:
+                        mark_start = value
+                    if child_tag == "markeertijdeind" and value and not mark_end:
+                        mark_end = value
+        
+        settled = bool(current_speaker and mark_start and mark_end)
+        return current_speaker, mark_start, mark_end, settled
+    
+    def _tekst_parts(
+        self,
+        texts: List[str],
+        current_speaker: Optional[str],
+        mark_start: Optional[str],
+        mark_end: Optional[str],
+    ) -> List[_PendingPart]:
+        """Turn the alineaitem texts of one <tekst> block into spoken parts.
+        
+        Admin fragments and attendee lists go to the session metadata; speaker
+        lines set the speaker of the content that follows them.
+        """
+        parts: List[_PendingPart] = []
+        detected_party = None
+        
+        for raw_text in texts:
+            # Check for admin fragments first
+            admin_type, admin_value = _detect_admin_fragment(raw_text)
+            if admin_type != 'none':
+                self._handle_admin_fragment(admin_type, admin_value, raw_text)
+                continue  # Don't emit as activity part
+            
+            # Check for attendee lists
+            members, ministers = _detect_attendees(raw_text)
+            if members or ministers:
+                self._session_metadata.attendees_members.extend(members)
+                self._session_metadata.attendees_ministers.extend(ministers)
+                continue  # Don't emit as activity part
+            
+            # Check if this is a chair speech; the chair is resolved in _build_result
+            if _is_chair_speech(raw_text):
+                self._after_chair_line = True
+                current_speaker = "De voorzitter:"
+                continue  # Skip the label, wait for content
+            
+            # Check for speaker lines
+            elif ":" in raw_text and len(raw_text) <= 120:
+                candidate = raw_text.split(":", 1)[0].strip()
+                party = _classify_speaker_line(candidate)
+                if party is not None:
+                    current_speaker = candidate + ":"
+                    # detect party from this speaker line if present - always check, don't just check if None
+                    detected_party = party
+                    continue  # Skip the label, wait for content
+            
+            # This is actual content - create activity part
+            text_raw, text_plain = _cleanup_paragraph_text(raw_text)
+            
+            # Skip very short content
+            if len(text_plain) < 2:
+                continue
+            
+            parts.append(_PendingPart(
+                current_speaker=current_speaker,
+                detected_party=detected_party,
+                after_chair_line=self._after_chair_line,
+                mark_start=mark_start,
+                mark_end=mark_end,
+                text_raw=text_raw,
+                text_plain=text_plain,
+            ))
+        
+        return parts
+    
+    def _build_result(
+        self,
+        filename: str,
+        title: str,
+        session_date: Optional[date],
+        pending_parts: List[_PendingPart],
+        chair_name: Optional[str],
+        activities_chair: Optional[str],
+    ) -> Dict[str, Any]:
+        """Resolve speakers and times of the parts and build the parse result.
+        
+        Args:
+            chair_name: Name from the <voorzitter> element
+            activities_chair: Chair found from the activity heads, used for parts
+                after the first "De voorzitter:" line when there is no chair_name
+        """
+        if chair_name:
+            self._session_metadata.chair = chair_name
 
         video_metadata: Dict[str, Any] = {
             "filename": filename,
@@ -694,169 +1164,30 @@ class VLOSXMLParser:
 
         segments: List[Dict[str, Any]] = []
         activity_parts: List[ActivityPart] = []
-
-        # Namespace-insensitive traversal helpers
-        def local(el: ET.Element) -> str:
-            t = el.tag
-            return t.split('}')[-1] if '}' in t else t
-    
-        # Build parent map for efficient parent lookups (replaces catastrophic gc.get_objects())
-        parent_map = {}
-        for parent in root.iter():
-            for child in parent:
-                parent_map[child] = parent
         
-        def _find_parent(node):
-            return parent_map.get(node)
-    
-        # Extract session start/end times if available
-        start_time = self._find_text(root, ["aanvangstijd", "start_time"]) or None
-        end_time = self._find_text(root, ["sluiting", "eindtijd", "end_time"]) or None
-
-        # Find all text blocks under any <tekst> elements
-        idx = 0
-        for tekst in root.iter():
-            if local(tekst) != "tekst":
-                continue
-                
-            # Reset speaker tracking when entering a new <tekst> element
-            current_speaker = None
-            detected_party = None
+        for pending in pending_parts:
+            # Normalize timestamps
+            start_dt = _normalize_time_to_iso(pending.mark_start, session_date) if pending.mark_start else None
+            end_dt = _normalize_time_to_iso(pending.mark_end, session_date) if pending.mark_end else None
             
-            # Look for timing info within ancestor activiteithoofd (search up to a few levels)
-            mark_start = None
-            mark_end = None
-            parent = tekst
+            # Swap if end < start and mark warning
+            if start_dt and end_dt and end_dt < start_dt:
+                start_dt, end_dt = end_dt, start_dt
+                # Could log warning here
             
-            # Try to find an associated <spreker> in ancestor nodes and set current_speaker
-            # Also look for timing info at woordvoerder level first
-            temp_parent = parent
-            for _ in range(5):
-                temp_parent = _find_parent(temp_parent)
-                if temp_parent is None:
-                    break
-                # If a spreker child exists, compose its aanhef + verslagnaam
-                for ch in list(temp_parent):
-                    if local(ch) == "spreker":
-                        speaker_name = self._build_name_from_element(ch)
-                        if speaker_name:
-                            current_speaker = speaker_name + ":"
-                            break
-                    # Get timing from woordvoerder level if available
-                    if local(ch) == "markeertijdbegin" and ch.text:
-                        mark_start = ch.text  # Prioritize woordvoerder timing
-                    if local(ch) == "markeertijdeind" and ch.text:
-                        mark_end = ch.text
-                        
-                # Check if this parent is a woordvoerder with timing
-                if local(temp_parent) == "woordvoerder":
-                    for ch in temp_parent:
-                        if local(ch) == "markeertijdbegin" and ch.text:
-                            mark_start = ch.text
-                        if local(ch) == "markeertijdeind" and ch.text:
-                            mark_end = ch.text
-                            
-                if current_speaker:
-                    break
-                    
-            # Continue to collect timing from higher levels as fallback
-            if not mark_start or not mark_end:
-                parent = tekst
-                for _ in range(5):
-                    parent = _find_parent(parent)
-                    if parent is None:
-                        break
-                    for ch in list(parent):
-                        if local(ch) == "markeertijdbegin" and ch.text and not mark_start:
-                            mark_start = ch.text
-                        if local(ch) == "markeertijdeind" and ch.text and not mark_end:
-                            mark_end = ch.text
-
-            # Collect all alineaitem texts for this tekst block
-            collected_texts = []
-            for alinea in tekst:
-                if local(alinea) != "alinea":
-                    continue
-                for item in alinea:
-                    if local(item) != "alineaitem":
-                        continue
-                        
-                    # Gather text content
-                    raw_text_parts: List[str] = []
-                    def _gather_text(e: ET.Element):
-                        if e.text:
-                            raw_text_parts.append(e.text)
-                        for c in list(e):
-                            _gather_text(c)
-                            if c.tail:
-                                raw_text_parts.append(c.tail)
-                    _gather_text(item)
-                    raw_text = (" ".join(raw_text_parts)).strip()
-                    if raw_text:
-                        collected_texts.append(raw_text)
+            # Resolve speaker with the chair as it was known at this point of the document
+            self._resolved_chair = chair_name or (activities_chair if pending.after_chair_line else None)
+            speaker_info = self._resolve_speaker(pending.current_speaker, pending.detected_party)
             
-            # Process the collected texts
-            for raw_text in collected_texts:
-                # Check for admin fragments first
-                admin_type, admin_value = _detect_admin_fragment(raw_text)
-                if admin_type != 'none':
-                    self._handle_admin_fragment(admin_type, admin_value, raw_text)
-                    continue  # Don't emit as activity part
-                
-                # Check for attendee lists
-                members, ministers = _detect_attendees(raw_text)
-                if members or ministers:
-                    self._session_metadata.attendees_members.extend(members)
-                    self._session_metadata.attendees_ministers.extend(ministers)
-                    continue  # Don't emit as activity part
-                
-                # Check if this is a chair speech and resolve chair if needed
-                if _is_chair_speech(raw_text):
-                    if not self._resolved_chair:
-                        # Try to find chair from first activity head with role containing 'voorzitter'
-                        self._resolved_chair = self._find_chair_from_activities(root)
-                    current_speaker = "De voorzitter:"
-                    continue  # Skip the label, wait for content
-                
-                # Check for speaker lines
-                elif ":" in raw_text and len(raw_text) <= 120:
-                    candidate = raw_text.split(":", 1)[0].strip()
-                    if not self._is_false_speaker(candidate):
-                        name = self._extract_speaker_name(candidate + ":")
-                        if name != "Onbekend":
-                            current_speaker = candidate + ":"
-                            # detect party from this speaker line if present - always check, don't just check if None
-                            detected_party = self._extract_party(candidate)
-                            continue  # Skip the label, wait for content
-                
-                # This is actual content - create activity part
-                text_raw, text_plain = _cleanup_paragraph_text(raw_text)
-                
-                # Skip very short content
-                if len(text_plain) < 2:
-                    continue
-                
-                # Normalize timestamps
-                start_dt = _normalize_time_to_iso(mark_start, session_date) if mark_start else None
-                end_dt = _normalize_time_to_iso(mark_end, session_date) if mark_end else None
-                
-                # Swap if end < start and mark warning
-                if start_dt and end_dt and end_dt < start_dt:
-                    start_dt, end_dt = end_dt, start_dt
-                    # Could log warning here
-                
-                # Resolve speaker
-                speaker_info = self._resolve_speaker(current_speaker, detected_party)
-                
-                part = ActivityPart(
-                    type='spoken',
-                    speaker=speaker_info,
-                    start=start_dt,
-                    end=end_dt,
-                    text_raw=text_raw,
-                    text_plain=text_plain
-                )
-                activity_parts.append(part)
+            activity_parts.append(ActivityPart(
+                type='spoken',
+                speaker=speaker_info,
+                start=start_dt,
+                end=end_dt,
+                text_raw=pending.text_raw,
+                text_plain=pending.text_plain
+            ))
+        self._resolved_chair = chair_name or (activities_chair if self._after_chair_line else None)
         
         # Post-process activity parts
         activity_parts = _merge_consecutive_parts(activity_parts)
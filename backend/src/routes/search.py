@@ -3,22 +3,183 @@ Search endpoints for the Political Transcript Search Platform
 """
 import logging
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, text, or_, and_
+from sqlalchemy import select, func, text, or_, and_, case
 from sqlalchemy.orm import selectinload
-from typing import Optional, List, Dict, Any
+from sqlalchemy.sql import Select
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, date
 
 from ..database import get_db
-from ..models import TranscriptSegment, Video, Speaker, Topic, SegmentTopic
+from ..models import (
+    TranscriptSegment, Video, Speaker, Topic, SegmentTopic,
+    TEXT_SEARCH_CONFIGS, DEFAULT_TEXT_SEARCH_CONFIG,
+)
 from ..schemas import SearchResponse, SearchFilters, TranscriptSegmentResponse
 from ..config import settings
 from ..services.embedding_service import embedding_service
+from ..services.embedding_worker import ACTIVE_STATUSES, EmbeddingJobRunning, embedding_worker
+from ..services.pagination import InvalidCursorError, apply_keyset, split_keyset_page
+from ..services.count_service import count_service
+from ..services.export_service import (
+    COLUMNAR_FORMATS, require_arrow, stream_columnar, stream_csv, stream_json_array, stream_ndjson,
+)
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def _text_search_configs(dataset: Optional[str]) -> List[str]:
+    """Text search configurations to query for a dataset filter (all configs for 'all')"""
+    if dataset and dataset.lower() != "all":
+        return [TEXT_SEARCH_CONFIGS.get(dataset, DEFAULT_TEXT_SEARCH_CONFIG)]
+    return sorted({DEFAULT_TEXT_SEARCH_CONFIG, *TEXT_SEARCH_CONFIGS.values()})
+
+
+def _apply_search_filters(
+    query: Select,
+    q: str,
+    search_type: str,
+    speaker: Optional[str] = None,
+    source: Optional[str] = None,
+    topic: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    sentiment: Optional[str] = None,
+    dataset: Optional[str] = None,
+    min_readability: Optional[float] = None,
+    max_readability: Optional[float] = None,
+    format: Optional[str] = None,
+    candidate: Optional[str] = None,
+    place: Optional[str] = None,
+    record_type: Optional[str] = None,
+    min_stresslens: Optional[float] = None,
+    max_stresslens: Optional[float] = None,
+    stresslens_rank: Optional[int] = None,
+    has_harassment: Optional[bool] = None,
+    has_hate: Optional[bool] = None,
+    has_violence: Optional[bool] = None,
+    has_sexual: Optional[bool] = None,
+    has_selfharm: Optional[bool] = None,
+) -> Tuple[Select, bool, Dict[str, Any]]:
+    """
+    Apply the search text condition and filters to a query over transcript_segments
+
+    Returns:
+        Tuple of (filtered query, whether videos was joined, tsquery per text search config)
+    """
+    ts_queries: Dict[str, Any] = {}
+    joined_video = False
+    
+    # Add search conditions
+    conditions = []
+    
+    # Text search
+    if search_type == "fulltext":
+        # One tsquery per language; each only matches rows indexed with that configuration
+        ts_queries = {config: func.plainto_tsquery(config, q) for config in _text_search_configs(dataset)}
+        conditions.append(or_(*[
+            and_(
+                TranscriptSegment.search_config == config,
+                TranscriptSegment.search_vector.op('@@')(ts_query)
+            )
+            for config, ts_query in ts_queries.items()
+        ]))
+    elif search_type == "exact":
+        conditions.append(TranscriptSegment.transcript_text.ilike(f"%{q}%"))
+    elif search_type == "fuzzy":
+        conditions.append(
+            text("transcript_text % :query OR similarity(transcript_text, :query) > 0.3")
+        )
+    
+    # Speaker filter
+    if speaker:
+        conditions.append(TranscriptSegment.speaker_name.ilike(f"%{speaker}%"))
+    
+    # Source filter
+    if source:
+        query = query.join(Video)
+        joined_video = True
+        conditions.append(Video.source.ilike(f"%{source}%"))
+    
+    # Dataset filter
+    if dataset and dataset.lower() != "all":
+        if not joined_video:
+            query = query.join(Video)
+            joined_video = True
+        conditions.append(Video.dataset == dataset)
+    
+    # Date filters
+    if date_from or date_to:
+        if not joined_video:
+            query = query.join(Video)
+            joined_video = True
+        if date_from:
+            conditions.append(Video.date >= date_from)
+        if date_to:
+            conditions.append(Video.date <= date_to)
+    
+    # Sentiment filter
+    if sentiment:
+        if sentiment.lower() == "positive":
+            conditions.append(TranscriptSegment.sentiment_loughran_score > 0)
+        elif sentiment.lower() == "negative":
+            conditions.append(TranscriptSegment.sentiment_loughran_score < 0)
+        elif sentiment.lower() == "neutral":
+            conditions.append(TranscriptSegment.sentiment_loughran_score == 0)
+    
+    # Readability filters
+    if min_readability is not None:
+        conditions.append(TranscriptSegment.flesch_kincaid_grade >= min_readability)
+    if max_readability is not None:
+        conditions.append(TranscriptSegment.flesch_kincaid_grade <= max_readability)
+    
+    # Topic filter
+    if topic:
+        query = query.join(SegmentTopic).join(Topic)
+        conditions.append(Topic.name.ilike(f"%{topic}%"))
+    
+    # Event metadata filters
+    if format or candidate or place or record_type:
+        if not joined_video:
+            query = query.join(Video)
+            joined_video = True
+        if format:
+            conditions.append(Video.format.ilike(f"%{format}%"))
+        if candidate:
+            conditions.append(Video.candidate.ilike(f"%{candidate}%"))
+        if place:
+            conditions.append(Video.place.ilike(f"%{place}%"))
+        if record_type:
+            conditions.append(Video.record_type.ilike(f"%{record_type}%"))
+    
+    # Stresslens filters
+    if min_stresslens is not None:
+        conditions.append(TranscriptSegment.stresslens_score >= min_stresslens)
+    if max_stresslens is not None:
+        conditions.append(TranscriptSegment.stresslens_score <= max_stresslens)
+    if stresslens_rank is not None:
+        conditions.append(TranscriptSegment.stresslens_rank == stresslens_rank)
+    
+    # Moderation flags filters
+    if has_harassment is True:
+        conditions.append(TranscriptSegment.moderation_harassment_flag == True)
+    if has_hate is True:
+        conditions.append(TranscriptSegment.moderation_hate_flag == True)
+    if has_violence is True:
+        conditions.append(TranscriptSegment.moderation_violence_flag == True)
+    if has_sexual is True:
+        conditions.append(TranscriptSegment.moderation_sexual_flag == True)
+    if has_selfharm is True:
+        conditions.append(TranscriptSegment.moderation_selfharm_flag == True)
+    
+    # Apply conditions
+    if conditions:
+        query = query.where(and_(*conditions))
+    return query, joined_video, ts_queries
+
+
 @router.get("/", response_model=SearchResponse, response_model_exclude_none=True)
 async def search_transcripts(
     q: str = Query(..., description="Search query"),
@@ -55,10 +216,15 @@ async def search_transcripts(
     search_type: str = Query("fulltext", description="Search type: fulltext, exact, fuzzy"),
     sort_by: str = Query("relevance", description="Sort by: relevance, date, speaker, sentiment, stresslens"),
     sort_order: str = Query("desc", description="Sort order: asc, desc"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous response's next_cursor (overrides page)"),
+    count_mode: str = Query("exact", pattern="^(exact|estimate|none)$", description="Total count: exact, estimate (fast, approximate for large results), none"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Search transcript segments with advanced filtering and sorting
+
+    Pages can be addressed by number or, for constant cost at any depth, by
+    passing back the returned next_cursor.
     """
     try:
         # Build base query
@@ -69,146 +235,66 @@ async def search_transcripts(
             selectinload(TranscriptSegment.speaker),
             selectinload(TranscriptSegment.segment_topics).selectinload(SegmentTopic.topic)
         )
-        joined_video = False
-        
-        # Add search conditions
-        conditions = []
-        
-        # Text search
-        if search_type == "fulltext":
-            ts_vector = func.to_tsvector('english', TranscriptSegment.transcript_text)
-            ts_query = func.plainto_tsquery('english', q)
-            conditions.append(ts_vector.op('@@')(ts_query))
-        elif search_type == "exact":
-            conditions.append(TranscriptSegment.transcript_text.ilike(f"%{q}%"))
-        elif search_type == "fuzzy":
-            conditions.append(
-                text("transcript_text % :query OR similarity(transcript_text, :query) > 0.3")
-            )
-        
-        # Speaker filter
-        if speaker:
-            conditions.append(TranscriptSegment.speaker_name.ilike(f"%{speaker}%"))
-        
-        # Source filter
-        if source:
-            query = query.join(Video)
-            joined_video = True
-            conditions.append(Video.source.ilike(f"%{source}%"))
-        
-        # Dataset filter
-        if dataset and dataset.lower() != "all":
-            if not joined_video:
-                query = query.join(Video)
-                joined_video = True
-            conditions.append(Video.dataset == dataset)
-        
-        # Date filters
-        if date_from or date_to:
-            if not joined_video:
-                query = query.join(Video)
-                joined_video = True
-            if date_from:
-                conditions.append(Video.date >= date_from)
-            if date_to:
-                conditions.append(Video.date <= date_to)
-        
-        # Sentiment filter
-        if sentiment:
-            if sentiment.lower() == "positive":
-                conditions.append(TranscriptSegment.sentiment_loughran_score > 0)
-            elif sentiment.lower() == "negative":
-                conditions.append(TranscriptSegment.sentiment_loughran_score < 0)
-            elif sentiment.lower() == "neutral":
-                conditions.append(TranscriptSegment.sentiment_loughran_score == 0)
-        
-        # Readability filters
-        if min_readability is not None:
-            conditions.append(TranscriptSegment.flesch_kincaid_grade >= min_readability)
-        if max_readability is not None:
-            conditions.append(TranscriptSegment.flesch_kincaid_grade <= max_readability)
-        
-        # Topic filter
-        if topic:
-            query = query.join(SegmentTopic).join(Topic)
-            conditions.append(Topic.name.ilike(f"%{topic}%"))
-        
-        # Event metadata filters
-        if format or candidate or place or record_type:
-            if not joined_video:
-                query = query.join(Video)
-                joined_video = True
-            if format:
-                conditions.append(Video.format.ilike(f"%{format}%"))
-            if candidate:
-                conditions.append(Video.candidate.ilike(f"%{candidate}%"))
-            if place:
-                conditions.append(Video.place.ilike(f"%{place}%"))
-            if record_type:
-                conditions.append(Video.record_type.ilike(f"%{record_type}%"))
-        
-        # Stresslens filters
-        if min_stresslens is not None:
-            conditions.append(TranscriptSegment.stresslens_score >= min_stresslens)
-        if max_stresslens is not None:
-            conditions.append(TranscriptSegment.stresslens_score <= max_stresslens)
-        if stresslens_rank is not None:
-            conditions.append(TranscriptSegment.stresslens_rank == stresslens_rank)
-        
-        # Moderation flags filters
-        if has_harassment is True:
-            conditions.append(TranscriptSegment.moderation_harassment_flag == True)
-        if has_hate is True:
-            conditions.append(TranscriptSegment.moderation_hate_flag == True)
-        if has_violence is True:
-            conditions.append(TranscriptSegment.moderation_violence_flag == True)
-        if has_sexual is True:
-            conditions.append(TranscriptSegment.moderation_sexual_flag == True)
-        if has_selfharm is True:
-            conditions.append(TranscriptSegment.moderation_selfharm_flag == True)
+        query, joined_video, ts_queries = _apply_search_filters(
+            query, q, search_type,
+            speaker=speaker, source=source, topic=topic,
+            date_from=date_from, date_to=date_to, sentiment=sentiment, dataset=dataset,
+            min_readability=min_readability, max_readability=max_readability,
+            format=format, candidate=candidate, place=place, record_type=record_type,
+            min_stresslens=min_stresslens, max_stresslens=max_stresslens, stresslens_rank=stresslens_rank,
+            has_harassment=has_harassment, has_hate=has_hate, has_violence=has_violence,
+            has_sexual=has_sexual, has_selfharm=has_selfharm
+        )
         
-        # Apply conditions
-        if conditions:
-            query = query.where(and_(*conditions))
         
         # Add sorting
         if sort_by == "relevance" and search_type == "fulltext":
-            ts_vector = func.to_tsvector('english', TranscriptSegment.transcript_text)
-            ts_query = func.plainto_tsquery('english', q)
-            query = query.order_by(func.ts_rank_cd(ts_vector, ts_query).desc())
-        elif sort_by == "date":
-            if not joined_video:
-                query = query.join(Video)
-                joined_video = True
-            order_col = Video.date
-        elif sort_by == "speaker":
-            order_col = TranscriptSegment.speaker_name
-        elif sort_by == "sentiment":
-            order_col = TranscriptSegment.sentiment_loughran_score
-        elif sort_by == "stresslens":
-            order_col = TranscriptSegment.stresslens_score
+            if len(ts_queries) == 1:
+                rank = func.ts_rank_cd(TranscriptSegment.search_vector, next(iter(ts_queries.values())))
+            else:
+                rank = case(
+                    {
+                        config: func.ts_rank_cd(TranscriptSegment.search_vector, ts_query)
+                        for config, ts_query in ts_queries.items()
+                    },
+                    value=TranscriptSegment.search_config
+                )
+            sort_keys = [(rank, True)]
+        elif sort_by == "relevance":
+            # Relevance only applies to fulltext; keep a stable order for paging
+            sort_keys = []
         else:
-            order_col = TranscriptSegment.created_at
-        
-        if sort_by != "relevance":
-            if sort_order == "desc":
-                query = query.order_by(order_col.desc())
+            if sort_by == "date":
+                if not joined_video:
+                    query = query.join(Video)
+                    joined_video = True
+                order_col = Video.date
+            elif sort_by == "speaker":
+                order_col = TranscriptSegment.speaker_name
+            elif sort_by == "sentiment":
+                order_col = TranscriptSegment.sentiment_loughran_score
+            elif sort_by == "stresslens":
+                order_col = TranscriptSegment.stresslens_score
             else:
-                query = query.order_by(order_col.asc())
+                order_col = TranscriptSegment.created_at
+            sort_keys = [(order_col, sort_order == "desc")]
+        
+        # Segment id breaks ties so the keyset cursor is unambiguous
+        sort_keys.append((TranscriptSegment.id, sort_keys[0][1] if sort_keys else sort_order == "desc"))
         
         # Count total results
-        count_query = select(func.count()).select_from(query.subquery())
-        result = await db.execute(count_query)
-        total = result.scalar_one()
+        total, total_exact = await count_service.count(db, query, count_mode)
         
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
+        # Apply pagination (cursor takes precedence over page)
+        try:
+            query = apply_keyset(query, sort_keys, page_size, cursor=cursor, offset=(page - 1) * page_size)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         # Execute query
         result = await db.execute(query)
         
-        segments = result.scalars().all()
+        segments, next_cursor = split_keyset_page(result.all(), query, page_size)
         
         # Build response
         return SearchResponse(
@@ -216,7 +302,9 @@ async def search_transcripts(
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=(total + page_size - 1) // page_size,
+            total_pages=(total + page_size - 1) // page_size if total is not None else None,
+            total_estimated=not total_exact if total is not None else None,
+            next_cursor=next_cursor,
             query=q,
             filters=SearchFilters(
                 speaker=speaker,
@@ -243,6 +331,8 @@ async def search_transcripts(
             )
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Search error")
         raise HTTPException(status_code=500, detail=f"Search error: {str(e)}")
@@ -337,10 +427,86 @@ async def search_suggestions(
         raise HTTPException(status_code=500, detail=f"Suggestion error: {str(e)}")
 
 
+# Exported fields: (record key, CSV header)
+EXPORT_FIELDS = [
+    ("segment_id", "Segment ID"),
+    ("speaker_name", "Speaker"),
+    ("transcript_text", "Text"),
+    ("video_title", "Video Title"),
+    ("source", "Source"),
+    ("date", "Date"),
+    ("timestamp", "Timestamp"),
+    ("sentiment_loughran_score", "Sentiment Score"),
+    ("primary_topic", "Primary Topic"),
+    ("format", "Format"),
+    ("candidate", "Candidate"),
+    ("place", "Place"),
+    ("record_type", "Record Type"),
+    ("stresslens_score", "Stresslens Score"),
+    ("stresslens_rank", "Stresslens Rank"),
+    ("moderation_harassment_flag", "Harassment Flag"),
+    ("moderation_hate_flag", "Hate Flag"),
+    ("moderation_violence_flag", "Violence Flag"),
+    ("moderation_sexual_flag", "Sexual Flag"),
+    ("moderation_selfharm_flag", "Self-harm Flag"),
+]
+
+
+def _export_columns() -> List[Any]:
+    """Plain columns selected for export (no ORM entities)"""
+    # Highest-scoring topic of the segment
+    primary_topic = (
+        select(Topic.name)
+        .join(SegmentTopic, SegmentTopic.topic_id == Topic.id)
+        .where(SegmentTopic.segment_id == TranscriptSegment.id)
+        .order_by(SegmentTopic.score.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return [
+        TranscriptSegment.id,
+        TranscriptSegment.segment_id,
+        TranscriptSegment.speaker_name,
+        TranscriptSegment.transcript_text,
+        Video.title.label("video_title"),
+        Video.source,
+        Video.date,
+        TranscriptSegment.timestamp_start,
+        TranscriptSegment.timestamp_end,
+        TranscriptSegment.sentiment_loughran_score,
+        primary_topic.label("primary_topic"),
+        Video.format,
+        Video.candidate,
+        Video.place,
+        Video.record_type,
+        TranscriptSegment.stresslens_score,
+        TranscriptSegment.stresslens_rank,
+        TranscriptSegment.moderation_harassment_flag,
+        TranscriptSegment.moderation_hate_flag,
+        TranscriptSegment.moderation_violence_flag,
+        TranscriptSegment.moderation_sexual_flag,
+        TranscriptSegment.moderation_selfharm_flag,
+    ]
+
+
+def _export_record(row) -> Dict[str, Any]:
+    """Shape one exported row as an ordered record keyed like EXPORT_FIELDS"""
+    values = row._mapping
+    video_date = values["date"]
+    return {
+        key: (
+            f"{values['timestamp_start']}-{values['timestamp_end']}" if key == "timestamp"
+            else (video_date.date() if isinstance(video_date, datetime) else video_date) if key == "date"
+            else values[key]
+        )
+        for key, _ in EXPORT_FIELDS
+    }
+
+
 @router.get("/export")
 async def export_search_results(
     q: str = Query(..., description="Search query"),
-    format: str = Query("csv", description="Export format: csv, json"),
+    format: str = Query("csv", description="Export format: csv, jsonl (newline-delimited JSON), json, parquet, arrow"),
     speaker: Optional[str] = Query(None),
     source: Optional[str] = Query(None),
     topic: Optional[str] = Query(None),
@@ -369,81 +535,62 @@ async def export_search_results(
     
     search_type: str = Query("fulltext"),
     limit: int = Query(1000, le=settings.MAX_SEARCH_RESULTS),
-    db: AsyncSession = Depends(get_db)
 ):
     """
-    Export search results in CSV or JSON format
+    Export search results in CSV, JSON Lines or JSON format
+
+    Rows are streamed from a server-side cursor in chunks, so memory use does
+    not grow with the export size.
     """
+    if format not in ("csv", "jsonl", "ndjson", "json", *COLUMNAR_FORMATS):
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {format}")
+    if format in COLUMNAR_FORMATS:
+        try:
+            require_arrow()
+        except RuntimeError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+    
     try:
-        # Reuse search logic but with higher limit
-        search_response = await search_transcripts(
-            q=q, page=1, page_size=limit,
+        query = select(*_export_columns()).select_from(TranscriptSegment)
+        query, joined_video, _ = _apply_search_filters(
+            query, q, search_type,
             speaker=speaker, source=source, topic=topic,
             date_from=date_from, date_to=date_to, sentiment=sentiment, dataset=dataset,
             format=event_format, candidate=candidate, place=place, record_type=record_type,
             min_stresslens=min_stresslens, max_stresslens=max_stresslens, stresslens_rank=stresslens_rank,
             has_harassment=has_harassment, has_hate=has_hate, has_violence=has_violence,
-            has_sexual=has_sexual, has_selfharm=has_selfharm,
-            search_type=search_type, db=db
+            has_sexual=has_sexual, has_selfharm=has_selfharm
         )
-        
-        if format == "csv":
-            # Convert to CSV format
-            import io
-            import csv
-            from fastapi.responses import StreamingResponse
-            
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Header
-            writer.writerow([
-                "Segment ID", "Speaker", "Text", "Video Title", "Source", 
-                "Date", "Timestamp", "Sentiment Score", "Primary Topic",
-                "Format", "Candidate", "Place", "Record Type",
-                "Stresslens Score", "Stresslens Rank",
-                "Harassment Flag", "Hate Flag", "Violence Flag", "Sexual Flag", "Self-harm Flag"
-            ])
-            
-            # Data rows
-            for result in search_response.results:
-                writer.writerow([
-                    result.segment_id,
-                    result.speaker_name,
-                    result.transcript_text,
-                    result.video.title if result.video else "",
-                    result.video.source if result.video else "",
-                    result.video.date if result.video else "",
-                    f"{result.timestamp_start}-{result.timestamp_end}",
-                    result.sentiment_loughran_score,
-                    result.primary_topic if hasattr(result, 'primary_topic') else "",
-                    result.video.format if result.video else "",
-                    result.video.candidate if result.video else "",
-                    result.video.place if result.video else "",
-                    result.video.record_type if result.video else "",
-                    result.stresslens_score,
-                    result.stresslens_rank,
-                    result.moderation_harassment_flag,
-                    result.moderation_hate_flag,
-                    result.moderation_violence_flag,
-                    result.moderation_sexual_flag,
-                    result.moderation_selfharm_flag
-                ])
-            
-            output.seek(0)
-            
-            return StreamingResponse(
-                io.BytesIO(output.getvalue().encode('utf-8')),
-                media_type="text/csv",
-                headers={"Content-Disposition": f"attachment; filename=search_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"}
-            )
-        
-        else:  # JSON format
-            from fastapi.responses import JSONResponse
-            return JSONResponse(content=search_response.dict())
-    
+        if not joined_video:
+            query = query.outerjoin(Video, Video.id == TranscriptSegment.video_id)
+        query = query.order_by(TranscriptSegment.id).limit(limit)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export error: {str(e)}")
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if format in COLUMNAR_FORMATS:
+        # Raw typed columns (separate timestamp_start/timestamp_end) in record batches
+        body = stream_columnar(query, format)
+        media_type, extension = COLUMNAR_FORMATS[format]
+    elif format == "csv":
+        body = stream_csv(
+            query,
+            [header for _, header in EXPORT_FIELDS],
+            lambda row: list(_export_record(row).values())
+        )
+        media_type, extension = "text/csv", "csv"
+    elif format == "json":
+        body = stream_json_array(query, _export_record)
+        media_type, extension = "application/json", "json"
+    else:
+        body = stream_ndjson(query, _export_record)
+        media_type, extension = "application/x-ndjson", "jsonl"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=search_results_{timestamp}.{extension}"}
+    )
 
 
 @router.get("/semantic")
@@ -464,6 +611,7 @@ async def semantic_search(
     candidate: Optional[str] = Query(None, description="Filter by candidate name"),
     place: Optional[str] = Query(None, description="Filter by event place"),
     record_type: Optional[str] = Query(None, description="Filter by record type"),
+    dataset: Optional[str] = Query(None, description="Dataset filter: all|trump|tweede_kamer"),
     
     db: AsyncSession = Depends(get_db)
 ):
@@ -474,45 +622,31 @@ async def semantic_search(
     even when the exact keywords don't appear in the text.
     """
     try:
-        # Build filters dictionary
-        filters = {}
-        if speaker:
-            filters["speaker"] = speaker
-        if date_from:
-            filters["min_date"] = date_from
-        if date_to:
-            filters["max_date"] = date_to
+        # All filters are applied in SQL, before the nearest-neighbour ranking
+        filters = {
+            "speaker": speaker,
+            "min_date": date_from,
+            "max_date": date_to,
+            "source": source,
+            "format": format,
+            "candidate": candidate,
+            "place": place,
+            "record_type": record_type,
+            "dataset": dataset,
+        }
             
-        # Perform semantic search
+        # Perform semantic search for every result up to the requested page
         raw_results = await embedding_service.semantic_search(
             db=db,
             query_text=q,
-            limit=page_size * 2,  # Get more results to account for post-filtering
+            limit=page * page_size,
             similarity_threshold=similarity_threshold,
             filters=filters
         )
         
-        # Apply additional filters that aren't handled by the embedding service
         filtered_results = []
         for result in raw_results:
-            # Get video information for additional filtering
-            video_query = select(Video).where(Video.id == result["video_id"])
-            video_result = await db.execute(video_query)
-            video = video_result.scalar_one_or_none()
-            
-            # Apply video-level filters
-            if source and video and video.source and source.lower() not in video.source.lower():
-                continue
-            if format and video and video.format and format.lower() not in video.format.lower():
-                continue
-            if candidate and video and video.candidate and candidate.lower() not in video.candidate.lower():
-                continue
-            if place and video and video.place and place.lower() not in video.place.lower():
-                continue
-            if record_type and video and video.record_type and record_type.lower() not in video.record_type.lower():
-                continue
-            
-            # Add video info to result
+            video = result.pop("video", None)
             if video:
                 result["video"] = {
                     "id": video.id,
@@ -525,7 +659,6 @@ async def semantic_search(
                     "record_type": video.record_type,
                     "video_thumbnail_url": video.video_thumbnail_url
                 }
-            
             filtered_results.append(result)
         
         # Apply pagination
@@ -574,7 +707,8 @@ async def semantic_search(
                 "format": format,
                 "candidate": candidate,
                 "place": place,
-                "record_type": record_type
+                "record_type": record_type,
+                "dataset": dataset
             }
         }
     
@@ -586,31 +720,88 @@ async def semantic_search(
 @router.post("/generate-embeddings")
 async def generate_embeddings_endpoint(
     force_regenerate: bool = Query(False, description="Force regeneration of existing embeddings"),
-    batch_size: int = Query(100, ge=10, le=1000, description="Batch size for processing"),
-    db: AsyncSession = Depends(get_db)
+    batch_size: int = Query(64, ge=8, le=1000, description="Segments per encode batch"),
 ):
     """
-    Generate or regenerate embeddings for all transcript segments
+    Start generating embeddings for transcript segments in the background
     
     This is typically run after importing new data or when updating the embedding model.
+    Track the job with GET /embedding-job.
     """
     try:
-        result = await embedding_service.generate_embeddings_for_segments(
-            db=db,
-            force_regenerate=force_regenerate,
-            batch_size=batch_size
-        )
+        job = await embedding_worker.start(force_regenerate=force_regenerate, batch_size=batch_size)
         
         return {
-            "message": "Embedding generation completed",
-            "stats": result
+            "message": "Embedding generation started",
+            "job": job
         }
     
+    except EmbeddingJobRunning:
+        raise HTTPException(status_code=400, detail="Embedding generation is already running")
     except Exception as e:
         logger.error(f"Embedding generation error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Embedding generation error: {str(e)}")
 
 
+@router.get("/query-embedding-cache")
+async def query_embedding_cache_stats():
+    """
+    Hit/miss counters of the in-process query embedding cache (per worker)
+    """
+    return embedding_service.query_cache_stats()
+
+
+@router.delete("/query-embedding-cache")
+async def clear_query_embedding_cache():
+    """
+    Empty the query embedding cache of this worker and reset its counters
+    """
+    embedding_service.clear_query_cache()
+    return embedding_service.query_cache_stats()
+
+
+async def _require_embedding_job():
+    if (await embedding_worker.status())["status"] not in ACTIVE_STATUSES:
+        raise HTTPException(status_code=400, detail="No embedding job is running")
+
+
+@router.get("/embedding-job")
+async def embedding_job_status():
+    """
+    Progress and throughput of the background embedding job, whichever worker runs it
+    """
+    return await embedding_worker.status()
+
+
+@router.post("/embedding-job/pause")
+async def pause_embedding_job():
+    """
+    Pause the background embedding job after the batches in flight
+    """
+    await _require_embedding_job()
+    return await embedding_worker.pause()
+
+
+@router.post("/embedding-job/resume")
+async def resume_embedding_job():
+    """
+    Resume a paused embedding job
+    """
+    await _require_embedding_job()
+    return await embedding_worker.resume()
+
+
+@router.post("/embedding-job/cancel")
+async def cancel_embedding_job():
+    """
+    Cancel the background embedding job; finished batches stay stored
+
+    A job run by another worker reports "cancelling" until that worker stops it.
+    """
+    await _require_embedding_job()
+    return await embedding_worker.cancel()
+
+
 @router.get("/embedding-status")
 async def embedding_status(db: AsyncSession = Depends(get_db)):
     """
@@ -2,12 +2,16 @@
 Segments API endpoints for the Political Transcript Search Platform
 """
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
+from datetime import datetime
 import logging
 
 from ..database import get_db
-from ..services.segments_service import fetch_segments_page, get_segment_by_id
+from ..services.segments_service import build_segments_export_query, fetch_segments_page, get_segment_by_id
+from ..services.export_service import COLUMNAR_FORMATS, require_arrow, stream_columnar, stream_csv, stream_ndjson
+from ..services.pagination import InvalidCursorError
 from ..schemas import SegmentsPage, SegmentOut, TranscriptSegmentResponse
 
 logger = logging.getLogger(__name__)
@@ -24,6 +28,8 @@ async def list_segments(
     dataset: Optional[str] = Query(None, description="Filter by dataset (trump, tweede_kamer)"),
     q: Optional[str] = Query(None, description="Search query in transcript text"),
     processed: Optional[bool] = Query(None, description="Filter by 5-class sentiment processing status (true=processed, false=unprocessed)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous response's pagination.next_cursor (overrides page)"),
+    count_mode: str = Query("exact", pattern="^(exact|estimate|none)$", description="Total count: exact, estimate (fast, approximate for large results), none"),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -31,10 +37,11 @@ async def list_segments(
     
     This endpoint provides a simplified view of transcript segments optimized for 
     listing and searching. Use the search endpoints for more advanced analytics.
+    For infinite scroll, follow pagination.next_cursor with count_mode=none.
     """
     try:
         # Fetch segments with pagination
-        segments, total = await fetch_segments_page(
+        segments, total, total_exact, next_cursor = await fetch_segments_page(
             db=db,
             page=page,
             page_size=page_size,
@@ -42,7 +49,9 @@ async def list_segments(
             video_id=video_id,
             dataset=dataset,
             q=q,
-            processed=processed
+            processed=processed,
+            cursor=cursor,
+            count_mode=count_mode
         )
         
         # Convert to response format
@@ -83,7 +92,7 @@ async def list_segments(
             data.append(SegmentOut.model_validate(segment_dict))
         
         # Calculate pagination metadata
-        total_pages = (total + page_size - 1) // page_size
+        total_pages = (total + page_size - 1) // page_size if total is not None else None
         
         return SegmentsPage(
             data=data,
@@ -92,18 +101,77 @@ async def list_segments(
                 "page_size": page_size,
                 "total": total,
                 "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_prev": page > 1
+                "total_estimated": not total_exact if total is not None else None,
+                "has_next": next_cursor is not None,
+                "has_prev": cursor is not None or page > 1,
+                "next_cursor": next_cursor
             },
             message="Success",
             status_code=200
         )
     
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching segments: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch segments: {str(e)}")
 
 
+@router.get("/export")
+async def export_segments(
+    format: str = Query("parquet", description="Export format: parquet, arrow (IPC stream), csv, jsonl"),
+    speaker: Optional[str] = Query(None, description="Filter by speaker name (partial match)"),
+    video_id: Optional[int] = Query(None, description="Filter by specific video ID"),
+    dataset: Optional[str] = Query(None, description="Filter by dataset (trump, tweede_kamer)"),
+    q: Optional[str] = Query(None, description="Search query in transcript text"),
+    processed: Optional[bool] = Query(None, description="Filter by 5-class sentiment processing status"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of segments (default: all)"),
+):
+    """
+    Bulk export of transcript segments with all analytics columns
+
+    Rows are streamed from a server-side cursor in chunks. Parquet and Arrow
+    exports write one columnar record batch per chunk.
+    """
+    try:
+        query = build_segments_export_query(
+            speaker=speaker,
+            video_id=video_id,
+            dataset=dataset,
+            q=q,
+            processed=processed,
+            limit=limit
+        )
+        
+        if format in COLUMNAR_FORMATS:
+            require_arrow()
+            media_type, extension = COLUMNAR_FORMATS[format]
+            body = stream_columnar(query, format)
+        elif format == "csv":
+            body = stream_csv(query, [column.key for column in query.selected_columns], tuple)
+            media_type, extension = "text/csv", "csv"
+        elif format in ("jsonl", "ndjson"):
+            body = stream_ndjson(query, lambda row: dict(row._mapping))
+            media_type, extension = "application/x-ndjson", "jsonl"
+        else:
+            raise HTTPException(status_code=400, detail=f"Unsupported export format: {format}")
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return StreamingResponse(
+            body,
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename=segments_{timestamp}.{extension}"}
+        )
+    
+    except HTTPException:
+        raise
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting segments: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to export segments: {str(e)}")
+
+
 @router.get("/{segment_id}", response_model=TranscriptSegmentResponse)
 async def get_segment(
     segment_id: int,
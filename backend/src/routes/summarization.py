@@ -288,6 +288,8 @@ async def search_summaries(
     q: str = Query(default="", description="Search query for summaries (empty for all summaries)"),
     page: int = Query(default=1, ge=1, description="Page number"),
     page_size: int = Query(default=25, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(default=None, description="Opaque cursor from a previous response's next_cursor (overrides page)"),
+    count_mode: str = Query(default="exact", pattern="^(exact|estimate|none)$", description="Total count: exact, estimate (fast, approximate for large results), none"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -296,71 +298,46 @@ async def search_summaries(
     - **q**: Search query to match against summary text and video titles
     - **page**: Page number (starts from 1)
     - **page_size**: Number of results per page
+    - **cursor**: Continue after the last result of a previous page
+    - **count_mode**: `exact` to return totals, `estimate` for fast approximate totals, `none` to skip counting
     """
     try:
-        from sqlalchemy import select, func, or_
+        from sqlalchemy import select, or_
         from ..models import VideoSummary, Video
-        
-        # Calculate offset
-        offset = (page - 1) * page_size
+        from ..services.count_service import count_service
+        from ..services.pagination import InvalidCursorError, apply_keyset, split_keyset_page
         
         # Build search query - if no query provided, return all summaries
+        search_query = (
+            select(VideoSummary)
+            .join(Video, VideoSummary.video_id == Video.id)
+            .options(selectinload(VideoSummary.video))
+        )
         if q.strip():
-            # Search with filters
-            search_query = (
-                select(VideoSummary)
-                .join(Video, VideoSummary.video_id == Video.id)
-                .where(
-                    or_(
-                        VideoSummary.summary_text.ilike(f"%{q}%"),
-                        Video.title.ilike(f"%{q}%"),
-                        Video.description.ilike(f"%{q}%") if Video.description.is_not(None) else False
-                    )
-                )
-                .options(selectinload(VideoSummary.video))
-                .order_by(VideoSummary.generated_at.desc())
-                .offset(offset)
-                .limit(page_size)
+            search_filter = or_(
+                VideoSummary.summary_text.ilike(f"%{q}%"),
+                Video.title.ilike(f"%{q}%"),
+                Video.description.ilike(f"%{q}%") if Video.description.is_not(None) else False
             )
-            
-            # Get total count with filters
-            count_query = (
-                select(func.count(VideoSummary.id))
-                .join(Video, VideoSummary.video_id == Video.id)
-                .where(
-                    or_(
-                        VideoSummary.summary_text.ilike(f"%{q}%"),
-                        Video.title.ilike(f"%{q}%"),
-                        Video.description.ilike(f"%{q}%") if Video.description.is_not(None) else False
-                    )
-                )
-            )
-        else:
-            # Return all summaries
-            search_query = (
-                select(VideoSummary)
-                .join(Video, VideoSummary.video_id == Video.id)
-                .options(selectinload(VideoSummary.video))
-                .order_by(VideoSummary.generated_at.desc())
-                .offset(offset)
-                .limit(page_size)
-            )
-            
-            # Get total count without filters
-            count_query = (
-                select(func.count(VideoSummary.id))
-                .join(Video, VideoSummary.video_id == Video.id)
+            search_query = search_query.where(search_filter)
+        
+        total, total_exact = await count_service.count(db, search_query, count_mode)
+        
+        # Newest first; id breaks ties so the cursor is unambiguous
+        sort_keys = [(VideoSummary.generated_at, True), (VideoSummary.id, True)]
+        try:
+            search_query = apply_keyset(
+                search_query, sort_keys, page_size, cursor=cursor, offset=(page - 1) * page_size
             )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         # Execute queries
         result = await db.execute(search_query)
-        summaries = result.scalars().all()
-        
-        count_result = await db.execute(count_query)
-        total = count_result.scalar_one()
+        summaries, next_cursor = split_keyset_page(result.all(), search_query, page_size)
         
         # Calculate pagination info
-        total_pages = (total + page_size - 1) // page_size
+        total_pages = (total + page_size - 1) // page_size if total is not None else None
         
         # Format results
         results = []
@@ -384,9 +361,13 @@ async def search_summaries(
             "page": page,
             "page_size": page_size,
             "total_pages": total_pages,
+            "total_estimated": not total_exact if total is not None else None,
+            "next_cursor": next_cursor,
             "query": q
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to search summaries: {str(e)}")
 
@@ -1,7 +1,7 @@
 """
 Video management endpoints for the Political Transcript Search Platform
 """
-from fastapi import APIRouter, Depends, Query, HTTPException, Path
+from fastapi import APIRouter, Depends, Query, HTTPException, Path, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc, case
 from sqlalchemy.orm import selectinload
@@ -11,6 +11,8 @@ from datetime import date
 from ..database import get_db
 from ..models import Video, TranscriptSegment, Speaker, SegmentTopic
 from ..schemas import VideoResponse, VideoCreateRequest, VideoUpdateRequest, TranscriptSegmentResponse
+from ..services.pagination import InvalidCursorError, apply_keyset, split_keyset_page
+from ..services.count_service import count_service
 
 router = APIRouter()
 
@@ -129,10 +131,17 @@ async def get_video_segments(
     page_size: int = Query(50, ge=1, le=200, description="Results per page"),
     speaker: Optional[str] = Query(None, description="Filter by speaker"),
     q: Optional[str] = Query(None, description="Filter by keyword in transcript text"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header (overrides page)"),
+    count_mode: str = Query("none", pattern="^(exact|estimate|none)$", description="Total count in X-Total-Count header: exact, estimate, none"),
+    response: Response = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get transcript segments for a specific video
+
+    When more segments follow, the cursor for the next page is returned in the
+    X-Next-Cursor response header. With count_mode set, the total is returned in
+    X-Total-Count (and X-Total-Count-Estimated: true when approximate).
     """
     try:
         # First check if video exists
@@ -158,20 +167,29 @@ async def get_video_segments(
         if q:
             query = query.where(TranscriptSegment.transcript_text.ilike(f"%{q}%"))
         
-        # Order by video seconds
-        query = query.order_by(TranscriptSegment.video_seconds)
+        total, total_exact = await count_service.count(db, query, count_mode)
+        if total is not None:
+            response.headers["X-Total-Count"] = str(total)
+            if not total_exact:
+                response.headers["X-Total-Count-Estimated"] = "true"
+        
+        # Order by video seconds, then id to keep the cursor unambiguous
+        sort_keys = [(TranscriptSegment.video_seconds, False), (TranscriptSegment.id, False)]
         
         # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
+        query = apply_keyset(query, sort_keys, page_size, cursor=cursor, offset=(page - 1) * page_size)
         
         result = await db.execute(query)
-        segments = result.scalars().all()
+        segments, next_cursor = split_keyset_page(result.all(), query, page_size)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
         return [TranscriptSegmentResponse.from_orm(segment) for segment in segments]
     
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         import logging
         logging.getLogger(__name__).exception("Error fetching video segments")
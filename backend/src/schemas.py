@@ -189,10 +189,12 @@ class SearchFilters(BaseModel):
 class SearchResponse(BaseModel):
     """Search response schema"""
     results: List[TranscriptSegmentResponse]
-    total: int
+    total: Optional[int]  # None when counting was skipped (count_mode=none)
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int]
+    total_estimated: Optional[bool] = None  # True when total is a planner estimate
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to fetch the next page
     query: str
     filters: SearchFilters
 
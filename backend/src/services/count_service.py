@@ -0,0 +1,158 @@
+"""
+Result counting service for paginated listings
+
+Supports three count modes:
+- exact: a full count(*) of the filtered query, run on every request
+- estimate: a capped count that is exact for small result sets; large ones are
+  estimated, first from a cached count for the same filters and otherwise from the
+  Postgres planner's row estimate, while an exact count is computed in the
+  background and cached for subsequent requests
+- none: no counting at all
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable, Select
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper so a statement can be planned with its bound parameters"""
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+class CountService:
+    """Counts filtered queries with optional estimation and a per-filter-set cache"""
+
+    def __init__(self):
+        self.cache_ttl = settings.COUNT_CACHE_TTL_SECONDS
+        self.cache_size = settings.COUNT_CACHE_MAX_ENTRIES
+        self.estimate_cap = settings.COUNT_ESTIMATE_CAP
+        self._cache: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._pending: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def count(self, db: AsyncSession, stmt: Select, mode: str = "exact") -> Tuple[Optional[int], bool]:
+        """
+        Count rows of an (unpaginated) statement
+
+        Args:
+            db: Database session
+            stmt: Filtered query, before ordering and pagination
+            mode: "exact", "estimate" or "none"
+
+        Returns:
+            Tuple of (total or None, whether the total is exact)
+
+        Raises:
+            ValueError: For any other mode
+        """
+        if mode not in ("exact", "estimate", "none"):
+            raise ValueError(f"Unknown count mode: {mode}")
+        if mode == "none":
+            return None, False
+
+        if mode == "estimate":
+            # Count at most cap + 1 rows: exact when the result set is small
+            capped_stmt = select(func.count()).select_from(stmt.limit(self.estimate_cap + 1).subquery())
+            capped = (await db.execute(capped_stmt)).scalar_one()
+            if capped <= self.estimate_cap:
+                return capped, True
+
+            # A cached count may be up to cache_ttl old, so it is only an estimate
+            key = self._cache_key(db, stmt)
+            cached = self._get_cached(key)
+            if cached is not None:
+                return max(cached, capped), False
+
+            estimate = await self._planner_estimate(db, stmt)
+            self._schedule_exact_count(key, stmt)
+            return max(estimate or 0, capped), False
+
+        total = (await db.execute(select(func.count()).select_from(stmt.subquery()))).scalar_one()
+        if total > self.estimate_cap:
+            # Fresh count for later estimates of the same filters
+            self._set_cached(self._cache_key(db, stmt), total)
+        return total, True
+
+    def _cache_key(self, db: AsyncSession, stmt: Select) -> str:
+        """Normalized filter-set key: the compiled SQL plus its bound parameter values"""
+        compiled = stmt.compile(dialect=db.get_bind().dialect)
+        params = sorted((name, repr(value)) for name, value in compiled.params.items())
+        return json.dumps([str(compiled), params])
+
+    def _get_cached(self, key: str) -> Optional[int]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, total = entry
+        if time.monotonic() - stored_at > self.cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return total
+
+    def _set_cached(self, key: str, total: int):
+        self._cache[key] = (time.monotonic(), total)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _planner_estimate(self, db: AsyncSession, stmt: Select) -> Optional[int]:
+        """Row estimate from the Postgres planner (None on other databases or on failure)"""
+        if db.get_bind().dialect.name != "postgresql":
+            return None
+        try:
+            # In a savepoint: a failed statement must not abort the request's transaction
+            async with db.begin_nested():
+                plan = (await db.execute(_Explain(stmt))).scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except Exception as e:
+            logger.warning(f"Planner row estimate failed: {str(e)}")
+            return None
+
+    def _schedule_exact_count(self, key: str, stmt: Select):
+        """Compute the exact count in the background on its own session and cache it"""
+        if key in self._pending:
+            return
+        self._pending.add(key)
+
+        async def _run():
+            from ..database import AsyncSessionLocal
+            try:
+                async with AsyncSessionLocal() as session:
+                    total = (await session.execute(select(func.count()).select_from(stmt.subquery()))).scalar_one()
+                self._set_cached(key, total)
+            except Exception as e:
+                logger.warning(f"Background count failed: {str(e)}")
+            finally:
+                self._pending.discard(key)
+
+        task = asyncio.create_task(_run())
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+# Global count service instance
+count_service = CountService()
@@ -7,15 +7,17 @@ Provides full-text search, aggregations, and advanced query capabilities.
 import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 from urllib.parse import urlencode
 
-from elasticsearch import AsyncElasticsearch, exceptions
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session
 
 from ..config import settings
 
+if TYPE_CHECKING:
+    from elasticsearch import AsyncElasticsearch
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,9 +28,12 @@ class ElasticsearchService:
         self.client = None
         self.index_name = settings.ELASTICSEARCH_INDEX
         
-    async def get_client(self) -> AsyncElasticsearch:
+    async def get_client(self) -> "AsyncElasticsearch":
         """Get or create Elasticsearch client"""
         if not self.client:
+            # Deferred so workers that never use Elasticsearch don't import the client
+            from elasticsearch import AsyncElasticsearch
+
             es_config = {
                 "hosts": [settings.ELASTICSEARCH_URL],
                 "timeout": settings.ELASTICSEARCH_TIMEOUT,
@@ -189,6 +194,8 @@ class ElasticsearchService:
             }
         }
         
+        from elasticsearch import exceptions
+
         try:
             # Check if index exists
             index_exists = await client.indices.exists(index=self.index_name)
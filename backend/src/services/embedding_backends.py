@@ -0,0 +1,120 @@
+"""
+Inference backends for sentence embeddings
+
+All backends share one contract so EmbeddingService can tokenize, bucket and
+pad once and then run whichever runtime is configured:
+- torch: SentenceTransformer in full precision (reference)
+- torch-int8: the same model with dynamically int8-quantized Linear layers
+- onnx: ONNX Runtime on an exported encoder, with mean pooling done in numpy
+
+Select one with EMBEDDING_BACKEND. Export an ONNX model with
+`scripts/benchmark_embedding_backends.py --export-onnx`.
+"""
+import importlib.util
+import logging
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Only check that the packages are installed; torch, sentence-transformers and
+# onnxruntime are imported when a backend is first loaded
+HAS_SENTENCE_TRANSFORMERS = importlib.util.find_spec("sentence_transformers") is not None
+HAS_ONNXRUNTIME = (
+    importlib.util.find_spec("onnxruntime") is not None
+    and importlib.util.find_spec("transformers") is not None
+)
+
+BACKENDS = ("torch", "torch-int8", "onnx")
+
+
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return np.divide(embeddings, norms, out=np.zeros_like(embeddings), where=norms > 0)
+
+
+class TorchBackend:
+    """SentenceTransformer forward pass, optionally with int8 dynamic quantization"""
+
+    def __init__(self, model_name: str, quantize: bool = False):
+        if not HAS_SENTENCE_TRANSFORMERS:
+            raise RuntimeError("sentence-transformers package not available. Please install it to use semantic search.")
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        self._torch = torch
+        self.model = SentenceTransformer(model_name, device="cpu" if quantize else None)
+        if quantize:
+            # Quantized kernels are CPU-only
+            self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.model.eval()
+        self.tokenizer = self.model.tokenizer
+        self.max_seq_length = self.model.max_seq_length
+
+    def encode(self, features: Dict[str, np.ndarray]) -> np.ndarray:
+        """L2-normalized sentence embeddings for one padded batch"""
+        torch = self._torch
+        device = self.model.device
+        inputs = {key: torch.from_numpy(value).to(device) for key, value in features.items()}
+        with torch.no_grad():
+            output = self.model(inputs)["sentence_embedding"]
+        return _normalize(output.cpu().numpy().astype(np.float32))
+
+
+class OnnxBackend:
+    """ONNX Runtime encoder with mean pooling (matches all-MiniLM-L6-v2's pooling)"""
+
+    def __init__(self, model_name: str, model_path: Optional[str] = None):
+        if not HAS_ONNXRUNTIME:
+            raise RuntimeError("onnxruntime and transformers packages are required for the onnx embedding backend.")
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        model_path = model_path or os.path.join("./data/models", f"{model_name}.onnx")
+        if not os.path.exists(model_path):
+            raise RuntimeError(
+                f"ONNX model not found at {model_path}. "
+                f"Export it with scripts/benchmark_embedding_backends.py --export-onnx {model_path}"
+            )
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self._input_names = {node.name for node in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(f"sentence-transformers/{model_name}")
+        # Same limit SentenceTransformer applies for this model
+        self.max_seq_length = 256
+
+    def encode(self, features: Dict[str, np.ndarray]) -> np.ndarray:
+        """L2-normalized sentence embeddings for one padded batch"""
+        inputs = {key: value.astype(np.int64) for key, value in features.items() if key in self._input_names}
+        token_embeddings = self.session.run(None, inputs)[0]
+        mask = features["attention_mask"][..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return _normalize(pooled.astype(np.float32))
+
+
+def load_backend(name: str, model_name: str, onnx_path: Optional[str] = None):
+    """
+    Create an embedding backend
+
+    Raises:
+        ValueError: for an unknown backend name
+        RuntimeError: when the backend's packages or model file are missing
+    """
+    logger.info(f"Loading embedding model {model_name} with backend {name}")
+    if name == "torch":
+        return TorchBackend(model_name)
+    if name == "torch-int8":
+        return TorchBackend(model_name, quantize=True)
+    if name == "onnx":
+        return OnnxBackend(model_name, onnx_path)
+    raise ValueError(f"Unknown embedding backend: {name} (expected one of {', '.join(BACKENDS)})")
+
+
+def backend_available(name: str) -> bool:
+    """Whether the packages a backend needs are installed"""
+    if name == "onnx":
+        return HAS_ONNXRUNTIME
+    return HAS_SENTENCE_TRANSFORMERS
@@ -0,0 +1,236 @@
+"""
+Memory-mapped embedding matrix for exact in-process semantic search
+
+An alternative to the pgvector index for deployments without the extension.
+All segment embeddings live in one L2-normalized `.npy` matrix with a parallel
+id array. Every worker maps the same files read-only, so the pages are shared
+through the OS page cache. A query is one matrix-vector product plus an
+argpartition, which gives exact cosine top-k over the whole corpus.
+
+The files are rebuilt incrementally from `embedding_generated_at` and swapped in
+atomically, so readers never see a partially written matrix.
+"""
+import fcntl
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models import TranscriptSegment, EMBEDDING_DIM
+
+logger = logging.getLogger(__name__)
+
+# Rows scored per block; keeps the float32 upcast of a float16 matrix small
+_SCORE_BLOCK_ROWS = 65536
+
+
+class EmbeddingMatrixIndex:
+    """On-disk embedding matrix shared by all workers through mmap"""
+
+    def __init__(self, directory: Optional[str] = None, dtype: Optional[str] = None):
+        self.directory = directory or settings.EMBEDDING_INDEX_DIR
+        self.dtype = np.dtype(dtype or settings.EMBEDDING_INDEX_DTYPE)
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: Optional[np.ndarray] = None
+        self._meta: Dict[str, Any] = {}
+        self._loaded_version: Optional[int] = None
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    def _read_meta(self) -> Dict[str, Any]:
+        try:
+            with open(self._meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _ensure_loaded(self) -> bool:
+        """Map the current files, remapping when another process has published a new version"""
+        meta = self._read_meta()
+        if not meta:
+            return False
+        if meta.get("version") != self._loaded_version:
+            self._ids = np.load(os.path.join(self.directory, meta["ids_file"]), mmap_mode="r")
+            self._matrix = np.load(os.path.join(self.directory, meta["matrix_file"]), mmap_mode="r")
+            self._meta = meta
+            self._loaded_version = meta.get("version")
+        return True
+
+    @property
+    def size(self) -> int:
+        return len(self._ids) if self._ensure_loaded() else 0
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        k: int,
+        candidate_ids: Optional[Sequence[int]] = None,
+        similarity_threshold: Optional[float] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Exact cosine top-k over the matrix
+
+        Args:
+            query_embedding: Query vector
+            k: Number of results
+            candidate_ids: Restrict results to these segment ids (pre-filtered in SQL)
+            similarity_threshold: Drop results below this cosine similarity
+
+        Returns:
+            List of (segment id, similarity), highest first
+        """
+        if not self._ensure_loaded() or k <= 0:
+            return []
+        ids, matrix = self._ids, self._matrix
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        query = query / norm
+
+        scores = np.empty(len(ids), dtype=np.float32)
+        for start in range(0, len(ids), _SCORE_BLOCK_ROWS):
+            block = matrix[start:start + _SCORE_BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32, copy=False) @ query
+
+        if candidate_ids is not None:
+            allowed = np.isin(ids, np.asarray(candidate_ids, dtype=np.int64))
+            scores[~allowed] = -np.inf
+            k = min(k, int(allowed.sum()))
+        if k <= 0:
+            return []
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (int(ids[i]), float(scores[i]))
+            for i in top
+            if similarity_threshold is None or scores[i] >= similarity_threshold
+        ]
+
+    async def refresh(self, db: AsyncSession, batch_size: int = 5000) -> Dict[str, Any]:
+        """
+        Add embeddings generated since the last refresh and publish a new version
+
+        Only one process rebuilds at a time (file lock); the others keep serving
+        the previous version until the new meta file appears.
+
+        Returns:
+            Dictionary with refresh statistics
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                return await self._refresh_locked(db, batch_size)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    async def _refresh_locked(self, db: AsyncSession, batch_size: int) -> Dict[str, Any]:
+        meta = self._read_meta()
+        if meta and meta.get("dtype") != self.dtype.name:
+            # Storage precision changed: rebuild from scratch
+            meta = {}
+        watermark = (meta.get("watermark_at"), meta.get("watermark_id"))
+
+        # Changed rows, keyset-ordered by (embedding_generated_at, id)
+        new_ids: List[np.ndarray] = []
+        new_rows: List[np.ndarray] = []
+        last_at = datetime.fromisoformat(watermark[0]) if watermark[0] else None
+        last_id = watermark[1] or 0
+        while True:
+            stmt = (
+                select(TranscriptSegment.id, TranscriptSegment.embedding, TranscriptSegment.embedding_generated_at)
+                .where(TranscriptSegment.embedding.is_not(None))
+                .where(TranscriptSegment.embedding_generated_at.is_not(None))
+                .order_by(TranscriptSegment.embedding_generated_at, TranscriptSegment.id)
+                .limit(batch_size)
+            )
+            if last_at is not None:
+                stmt = stmt.where(or_(
+                    TranscriptSegment.embedding_generated_at > last_at,
+                    and_(TranscriptSegment.embedding_generated_at == last_at, TranscriptSegment.id > last_id),
+                ))
+            rows = (await db.execute(stmt)).all()
+            if not rows:
+                break
+            new_ids.append(np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)))
+            new_rows.append(np.asarray([np.asarray(row[1], dtype=np.float32) for row in rows]))
+            last_at, last_id = rows[-1][2], rows[-1][0]
+
+        if not new_ids:
+            return {"added": 0, "updated": 0, "total": self.size}
+
+        added_ids = np.concatenate(new_ids)
+        added_rows = np.concatenate(new_rows)
+        norms = np.linalg.norm(added_rows, axis=1, keepdims=True)
+        added_rows = np.divide(added_rows, norms, out=np.zeros_like(added_rows), where=norms > 0)
+
+        old_ids = np.empty(0, dtype=np.int64)
+        old_matrix = np.empty((0, EMBEDDING_DIM), dtype=self.dtype)
+        if meta:
+            old_ids = np.load(os.path.join(self.directory, meta["ids_file"]), mmap_mode="r")
+            old_matrix = np.load(os.path.join(self.directory, meta["matrix_file"]), mmap_mode="r")
+
+        # Later rows win for segments that were re-embedded (ids sorted, unique)
+        all_ids = np.concatenate([old_ids, added_ids])
+        unique_ids, first_in_reversed = np.unique(all_ids[::-1], return_index=True)
+        source_rows = len(all_ids) - 1 - first_in_reversed
+        updated = len(old_ids) + len(added_ids) - len(unique_ids)
+
+        version = int(meta.get("version", 0)) + 1
+        matrix_file = f"embeddings.{version}.npy"
+        ids_file = f"ids.{version}.npy"
+        matrix = np.lib.format.open_memmap(
+            os.path.join(self.directory, matrix_file), mode="w+",
+            dtype=self.dtype, shape=(len(unique_ids), EMBEDDING_DIM),
+        )
+        for start in range(0, len(unique_ids), _SCORE_BLOCK_ROWS):
+            src = source_rows[start:start + _SCORE_BLOCK_ROWS]
+            from_old = src < len(old_ids)
+            block = np.empty((len(src), EMBEDDING_DIM), dtype=self.dtype)
+            block[from_old] = old_matrix[src[from_old]]
+            block[~from_old] = added_rows[src[~from_old] - len(old_ids)]
+            matrix[start:start + len(src)] = block
+        matrix.flush()
+        del matrix
+        np.save(os.path.join(self.directory, ids_file), unique_ids)
+
+        new_meta = {
+            "version": version,
+            "matrix_file": matrix_file,
+            "ids_file": ids_file,
+            "dtype": self.dtype.name,
+            "count": int(len(unique_ids)),
+            "watermark_at": last_at.isoformat() if last_at else None,
+            "watermark_id": int(last_id),
+        }
+        tmp_meta = self._meta_path + ".tmp"
+        with open(tmp_meta, "w") as f:
+            json.dump(new_meta, f)
+        os.replace(tmp_meta, self._meta_path)
+
+        # Readers that already mapped the previous files keep them until they remap
+        for name in (meta.get("matrix_file"), meta.get("ids_file")):
+            if name:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+        logger.info(f"Embedding matrix v{version}: {len(unique_ids)} rows ({len(added_ids) - updated} added, {updated} updated)")
+        return {"added": int(len(added_ids) - updated), "updated": int(updated), "total": int(len(unique_ids))}
+
+
+# Global embedding matrix index instance
+embedding_index = EmbeddingMatrixIndex()
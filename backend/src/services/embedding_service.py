@@ -1,45 +1,64 @@
 """
 Embedding generation service for semantic search
 """
-import json
+import hashlib
 import logging
-from typing import List, Optional, Dict, Any
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import asyncio
 import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, text, func, and_
 from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
-from ..models import TranscriptSegment
+from ..models import TranscriptSegment, Video, EmbeddingCache, EMBEDDING_DIM
 from ..config import settings
-
-# Try to import sentence_transformers, fallback if not available
-try:
-    from sentence_transformers import SentenceTransformer
-    HAS_SENTENCE_TRANSFORMERS = True
-except ImportError:
-    SentenceTransformer = None
-    HAS_SENTENCE_TRANSFORMERS = False
+from .embedding_index import embedding_index
+from .embedding_backends import backend_available, load_backend
 
 logger = logging.getLogger(__name__)
 
+# Cache identity of the hash-based vectors used when no backend is installed
+FALLBACK_MODEL_ID = "hash-fallback"
+
 class EmbeddingService:
     """Service for generating and managing text embeddings for semantic search"""
     
     def __init__(self):
         self.model_name = "all-MiniLM-L6-v2"  # 384 dimensions, good balance of speed/quality
-        self._model: Optional[SentenceTransformer] = None
-        self.embedding_dim = 384
-        
+        self.backend = settings.EMBEDDING_BACKEND  # torch, torch-int8 or onnx
+        self._model = None
+        self.embedding_dim = EMBEDDING_DIM
+        self._vector_available: Optional[bool] = None
+        # Query text -> (stored at, embedding), least recently used first
+        self._query_cache: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+        self._query_cache_hits = 0
+        self._query_cache_misses = 0
+        
+    @property
+    def model_id(self) -> str:
+        """Model identity for cached embeddings (backends produce slightly different vectors)"""
+        if not self.has_model:
+            # Fallback vectors must never be served once a real model is installed
+            return FALLBACK_MODEL_ID
+        return self.model_name if self.backend == "torch" else f"{self.model_name}@{self.backend}"
+    
+    @property
+    def has_model(self) -> bool:
+        """Whether the configured backend can run (otherwise a hash-based fallback is used)"""
+        return backend_available(self.backend)
+    
     def _load_model(self):
-        """Lazy load the sentence transformer model"""
-        if not HAS_SENTENCE_TRANSFORMERS:
-            raise RuntimeError("sentence-transformers package not available. Please install it to use semantic search.")
+        """Lazy load the configured inference backend"""
+        if not self.has_model:
+            raise RuntimeError(f"Packages for the {self.backend} embedding backend are not available. Please install them to use semantic search.")
         
         if self._model is None:
-            logger.info(f"Loading embedding model: {self.model_name}")
-            self._model = SentenceTransformer(self.model_name)
+            self._model = load_backend(self.backend, self.model_name, settings.EMBEDDING_ONNX_PATH or None)
             logger.info("Embedding model loaded successfully")
         return self._model
     
@@ -53,20 +72,51 @@ class EmbeddingService:
         Returns:
             List of float values representing the embedding vector
         """
-        if not HAS_SENTENCE_TRANSFORMERS:
+        if not self.has_model:
             # Fallback: generate a simple hash-based embedding for testing
             return self._generate_simple_embedding(text)
-            
-        model = self._load_model()
         
-        # Clean and prepare text
-        cleaned_text = self._clean_text(text)
-        
-        # Generate embedding
-        embedding = model.encode(cleaned_text, normalize_embeddings=True)
+        return self.generate_embeddings_batch([text])[0]
+    
+    def embed_query(self, query_text: str) -> List[float]:
+        """
+        Embedding for a search query, served from an in-process LRU cache
         
-        # Convert to list for JSON serialization
-        return embedding.tolist()
+        Entries expire after QUERY_EMBEDDING_CACHE_TTL_SECONDS (0 = never) and the
+        cache holds at most QUERY_EMBEDDING_CACHE_SIZE queries.
+        """
+        key = self._clean_text(query_text)
+        entry = self._query_cache.get(key)
+        ttl = settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS
+        if entry is not None and (not ttl or time.monotonic() - entry[0] <= ttl):
+            self._query_cache.move_to_end(key)
+            self._query_cache_hits += 1
+            return entry[1]
+        
+        self._query_cache_misses += 1
+        embedding = self.generate_embedding(query_text)
+        self._query_cache[key] = (time.monotonic(), embedding)
+        self._query_cache.move_to_end(key)
+        while len(self._query_cache) > settings.QUERY_EMBEDDING_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return embedding
+    
+    def query_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size of the query embedding cache"""
+        lookups = self._query_cache_hits + self._query_cache_misses
+        return {
+            "hits": self._query_cache_hits,
+            "misses": self._query_cache_misses,
+            "hit_rate": self._query_cache_hits / lookups if lookups else 0.0,
+            "size": len(self._query_cache),
+            "max_size": settings.QUERY_EMBEDDING_CACHE_SIZE,
+            "ttl_seconds": settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        }
+    
+    def clear_query_cache(self):
+        self._query_cache.clear()
+        self._query_cache_hits = 0
+        self._query_cache_misses = 0
     
     def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
         """
@@ -78,37 +128,63 @@ class EmbeddingService:
         Returns:
             List of embedding vectors
         """
-        if not HAS_SENTENCE_TRANSFORMERS:
+        if not self.has_model:
             # Fallback: generate simple embeddings for testing
             return [self._generate_simple_embedding(text) for text in texts]
             
         model = self._load_model()
         
-        # Clean texts
+        # Clean texts, then tokenize once with truncation at the model's limit
         cleaned_texts = [self._clean_text(text) for text in texts]
-        
-        # Generate embeddings in batch
-        embeddings = model.encode(cleaned_texts, normalize_embeddings=True, batch_size=32, show_progress_bar=True)
+        tokenizer = model.tokenizer
+        encoded = tokenizer(cleaned_texts, truncation=True, max_length=model.max_seq_length)
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+        
+        # Encode length buckets (least padding) and put results back in input order
+        embeddings = np.zeros((len(texts), self.embedding_dim), dtype=np.float32)
+        for bucket in self._length_buckets(lengths):
+            features = tokenizer.pad(
+                {key: [encoded[key][i] for i in bucket] for key in encoded.keys()},
+                return_tensors="np"
+            )
+            embeddings[bucket] = model.encode(dict(features))
         
         # Convert to list of lists
-        return [embedding.tolist() for embedding in embeddings]
+        return embeddings.tolist()
+    
+    def _length_buckets(self, lengths: List[int]) -> List[List[int]]:
+        """
+        Group input indices into batches of similar token length
+        
+        Indices are sorted by length and cut into batches whose padded size
+        (count x longest) stays within EMBEDDING_MAX_BATCH_TOKENS.
+        """
+        max_tokens = settings.EMBEDDING_MAX_BATCH_TOKENS
+        max_size = settings.EMBEDDING_MAX_BATCH_SIZE
+        buckets: List[List[int]] = []
+        current: List[int] = []
+        for index in sorted(range(len(lengths)), key=lengths.__getitem__):
+            # Sorted ascending, so this text is the longest in the batch so far
+            if current and ((len(current) + 1) * lengths[index] > max_tokens or len(current) >= max_size):
+                buckets.append(current)
+                current = []
+            current.append(index)
+        if current:
+            buckets.append(current)
+        return buckets
     
     def _clean_text(self, text: str) -> str:
         """Clean and prepare text for embedding generation"""
         if not text:
             return ""
         
-        # Basic text cleaning
-        text = text.strip()
-        
-        # Remove excessive whitespace
-        text = ' '.join(text.split())
-        
-        # Truncate if too long (model has 512 token limit)
-        if len(text.split()) > 400:  # Leave some buffer for special tokens
-            text = ' '.join(text.split()[:400])
+        # Collapse whitespace and cap very long texts in a single split; exact
+        # truncation to the model's token limit happens in the tokenizer
+        words = text.split()
+        if len(words) > 400:
+            words = words[:400]
             
-        return text
+        return ' '.join(words)
     
     def _generate_simple_embedding(self, text: str) -> List[float]:
         """
@@ -173,6 +249,89 @@ class EmbeddingService:
             
         return float(dot_product / (norm1 * norm2))
     
+    def text_key(self, text: str) -> str:
+        """Embedding cache key: sha256 of the normalized text (the model name is a separate key column)"""
+        return hashlib.sha256(self._clean_text(text).encode("utf-8")).hexdigest()
+    
+    async def get_cached_embeddings(self, db: AsyncSession, keys: List[str]) -> Dict[str, Any]:
+        """Cached embeddings for this model by text key (missing keys are absent)"""
+        if not settings.EMBEDDING_CACHE_ENABLED or not keys:
+            return {}
+        cached = {}
+        for start in range(0, len(keys), 1000):
+            result = await db.execute(
+                select(EmbeddingCache.text_hash, EmbeddingCache.embedding)
+                .where(EmbeddingCache.model_name == self.model_id)
+                .where(EmbeddingCache.text_hash.in_(keys[start:start + 1000]))
+            )
+            cached.update({row.text_hash: row.embedding for row in result})
+        return cached
+    
+    async def cache_embeddings(self, db: AsyncSession, embeddings: Dict[str, Any]):
+        """Store embeddings by text key, keeping existing entries. Does not commit."""
+        if not settings.EMBEDDING_CACHE_ENABLED or not embeddings:
+            return
+        insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        await db.execute(
+            insert(EmbeddingCache).on_conflict_do_nothing(),
+            [
+                {"model_name": self.model_id, "text_hash": key, "embedding": embedding}
+                for key, embedding in embeddings.items()
+            ]
+        )
+    
+    async def embed_texts(
+        self,
+        db: AsyncSession,
+        texts: List[str],
+        encode: Optional[Callable[[List[str]], List[List[float]]]] = None
+    ) -> Tuple[List[Any], int]:
+        """
+        Embeddings for texts, encoding only distinct texts missing from the cache
+        
+        Args:
+            db: Database session (new cache entries are added, not committed)
+            texts: Input texts
+            encode: Batch encoder for the misses (defaults to generate_embeddings_batch)
+            
+        Returns:
+            Tuple of (embeddings in input order, number of texts served without encoding)
+        """
+        keys = [self.text_key(segment_text) for segment_text in texts]
+        embeddings = await self.get_cached_embeddings(db, list(dict.fromkeys(keys)))
+        
+        missing: Dict[str, str] = {}
+        for key, segment_text in zip(keys, texts):
+            if key not in embeddings:
+                missing.setdefault(key, segment_text)
+        
+        if missing:
+            encoded = dict(zip(missing, (encode or self.generate_embeddings_batch)(list(missing.values()))))
+            await self.cache_embeddings(db, encoded)
+            embeddings.update(encoded)
+        
+        return [embeddings[key] for key in keys], len(texts) - len(missing)
+    
+    async def write_embeddings(
+        self,
+        db: AsyncSession,
+        segment_ids: List[int],
+        embeddings: List[List[float]]
+    ):
+        """
+        Store a batch of embeddings with one executemany UPDATE by primary key
+
+        Does not commit.
+        """
+        generated_at = datetime.utcnow()
+        await db.execute(
+            update(TranscriptSegment),
+            [
+                {"id": segment_id, "embedding": embedding, "embedding_generated_at": generated_at}
+                for segment_id, embedding in zip(segment_ids, embeddings)
+            ]
+        )
+    
     async def generate_embeddings_for_segments(
         self, 
         db: AsyncSession, 
@@ -194,8 +353,9 @@ class EmbeddingService:
         """
         logger.info("Starting embedding generation for transcript segments")
         
-        # Build query for segments that need embeddings
-        query = select(TranscriptSegment)
+        # Only the columns needed to embed, walked by keyset on id (rows updated
+        # behind the cursor never shift the remaining work, unlike OFFSET)
+        query = select(TranscriptSegment.id, TranscriptSegment.transcript_text)
         
         if segment_ids:
             query = query.where(TranscriptSegment.id.in_(segment_ids))
@@ -214,74 +374,191 @@ class EmbeddingService:
         
         processed = 0
         errors = 0
-        
-        # Process in batches
-        offset = 0
-        while offset < total_segments:
+        cache_hits = 0
+        last_id = 0
+        batch_number = 0
+        
+        while True:
+            batch_query = query.where(TranscriptSegment.id > last_id).order_by(TranscriptSegment.id).limit(batch_size)
+            rows = (await db.execute(batch_query)).all()
+            if not rows:
+                break
+            
+            batch_number += 1
+            segment_ids_batch = [row.id for row in rows]
+            last_id = segment_ids_batch[-1]
+            
             try:
-                # Get batch of segments
-                batch_query = query.offset(offset).limit(batch_size)
-                result = await db.execute(batch_query)
-                segments = result.scalars().all()
-                
-                if not segments:
-                    break
-                
-                # Extract texts for batch processing
-                texts = [segment.transcript_text for segment in segments]
-                segment_ids_batch = [segment.id for segment in segments]
+                logger.info(f"Processing batch {batch_number}: {len(rows)} segments")
                 
-                logger.info(f"Processing batch {offset//batch_size + 1}: {len(segments)} segments")
+                # Generate embeddings in batch, encoding only uncached distinct texts
+                embeddings, hits = await self.embed_texts(db, [row.transcript_text for row in rows])
                 
-                # Generate embeddings in batch
-                embeddings = self.generate_embeddings_batch(texts)
-                
-                # Update database with embeddings
-                for segment_id, embedding in zip(segment_ids_batch, embeddings):
-                    try:
-                        # Convert embedding to JSON string for storage
-                        embedding_json = json.dumps(embedding)
-                        
-                        # Update segment with embedding
-                        await db.execute(
-                            update(TranscriptSegment)
-                            .where(TranscriptSegment.id == segment_id)
-                            .values(
-                                embedding=embedding_json,
-                                embedding_generated_at=datetime.utcnow()
-                            )
-                        )
-                        processed += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error updating segment {segment_id} with embedding: {str(e)}")
-                        errors += 1
-                
-                # Commit batch
+                await self.write_embeddings(db, segment_ids_batch, embeddings)
                 await db.commit()
-                
-                offset += batch_size
+                processed += len(rows)
+                cache_hits += hits
                 
                 # Progress logging
-                if processed % 1000 == 0:
+                if batch_number % 10 == 0:
                     logger.info(f"Progress: {processed}/{total_segments} segments processed")
                     
             except Exception as e:
-                logger.error(f"Error processing batch at offset {offset}: {str(e)}")
-                errors += len(segments) if 'segments' in locals() else batch_size
-                offset += batch_size
+                logger.error(f"Error processing batch ending at segment {last_id}: {str(e)}")
+                errors += len(rows)
                 await db.rollback()
         
         logger.info(f"Embedding generation completed. Processed: {processed}, Errors: {errors}")
         
+        if settings.SEMANTIC_SEARCH_ENGINE == "matrix" and processed:
+            await embedding_index.refresh(db)
+        
         return {
             "processed": processed,
             "total": total_segments,
             "errors": errors,
+            "cache_hits": cache_hits,
             "model_name": self.model_name,
+            "backend": self.backend,
             "embedding_dimensions": self.embedding_dim
         }
     
+    async def _has_vector_index(self, db: AsyncSession) -> bool:
+        """Whether the embedding column is a pgvector column (checked once per process)"""
+        if self._vector_available is None:
+            available = False
+            if db.get_bind().dialect.name == "postgresql":
+                try:
+                    result = await db.execute(text("""
+                        SELECT udt_name FROM information_schema.columns
+                        WHERE table_name = 'transcript_segments' AND column_name = 'embedding'
+                    """))
+                    available = result.scalar() == "vector"
+                except Exception as e:
+                    logger.warning(f"Could not inspect embedding column type: {str(e)}")
+            self._vector_available = available
+            if not available:
+                logger.warning("pgvector column not available, semantic search will score candidates in Python")
+        return self._vector_available
+    
+    def _filter_conditions(self, filters: Optional[Dict[str, Any]]) -> List[Any]:
+        """SQL conditions for semantic search filters (video columns require a join with Video)"""
+        conditions = []
+        if not filters:
+            return conditions
+        if filters.get("speaker"):
+            conditions.append(TranscriptSegment.speaker_name.ilike(f"%{filters['speaker']}%"))
+        if filters.get("video_id"):
+            conditions.append(TranscriptSegment.video_id == filters["video_id"])
+        if filters.get("min_date"):
+            conditions.append(Video.date >= filters["min_date"])
+        if filters.get("max_date"):
+            conditions.append(Video.date <= filters["max_date"])
+        for key, column in (
+            ("source", Video.source),
+            ("format", Video.format),
+            ("candidate", Video.candidate),
+            ("place", Video.place),
+            ("record_type", Video.record_type),
+        ):
+            if filters.get(key):
+                conditions.append(column.ilike(f"%{filters[key]}%"))
+        if filters.get("dataset") and filters["dataset"].lower() != "all":
+            conditions.append(Video.dataset == filters["dataset"])
+        return conditions
+    
+    async def _matrix_search(
+        self,
+        db: AsyncSession,
+        segments_query,
+        conditions: List[Any],
+        query_embedding: List[float],
+        limit: int,
+        similarity_threshold: float
+    ) -> List[Any]:
+        """Exact top-k from the memory-mapped embedding matrix; filters select candidate ids in SQL"""
+        if embedding_index.size == 0:
+            await embedding_index.refresh(db)
+        
+        candidate_ids = None
+        if conditions:
+            id_query = (
+                select(TranscriptSegment.id)
+                .join(Video, Video.id == TranscriptSegment.video_id)
+                .where(and_(*conditions))
+            )
+            candidate_ids = (await db.execute(id_query)).scalars().all()
+        
+        hits = embedding_index.search(query_embedding, limit, candidate_ids, similarity_threshold)
+        if not hits:
+            return []
+        
+        # Hydrate in rank order; ids of since-deleted segments simply drop out
+        result = await db.execute(segments_query.where(TranscriptSegment.id.in_([hit_id for hit_id, _ in hits])))
+        segments = {segment.id: segment for segment in result.scalars().all()}
+        return [(segments[hit_id], similarity) for hit_id, similarity in hits if hit_id in segments]
+    
+    async def _scan_search(
+        self,
+        db: AsyncSession,
+        segments_query,
+        conditions: List[Any],
+        query_embedding: List[float],
+        limit: int,
+        similarity_threshold: float
+    ) -> List[Any]:
+        """
+        Exact top-k without a vector index, in bounded memory
+
+        Only (id, embedding) of the filtered candidates are read, in keyset chunks
+        of SEMANTIC_SCAN_CHUNK_SIZE rows; a running top-k is kept between chunks
+        and only the winners are loaded as segments.
+        """
+        id_query = (
+            select(TranscriptSegment.id, TranscriptSegment.embedding)
+            .join(Video, Video.id == TranscriptSegment.video_id)
+            .where(TranscriptSegment.embedding.is_not(None))
+        )
+        if conditions:
+            id_query = id_query.where(and_(*conditions))
+        
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query_vec)
+        if query_norm == 0 or limit <= 0:
+            return []
+        top_ids = np.empty(0, dtype=np.int64)
+        top_scores = np.empty(0, dtype=np.float32)
+        last_id = 0
+        while True:
+            rows = (await db.execute(
+                id_query.where(TranscriptSegment.id > last_id)
+                .order_by(TranscriptSegment.id)
+                .limit(settings.SEMANTIC_SCAN_CHUNK_SIZE)
+            )).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            
+            matrix = np.asarray([np.asarray(row.embedding, dtype=np.float32) for row in rows])
+            norms = np.linalg.norm(matrix, axis=1) * query_norm
+            similarities = np.divide(matrix @ query_vec, norms, out=np.zeros(len(rows), dtype=np.float32), where=norms > 0)
+            keep = similarities >= similarity_threshold
+            top_ids = np.concatenate([top_ids, np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))[keep]])
+            top_scores = np.concatenate([top_scores, similarities[keep]])
+            if len(top_scores) > limit:
+                best = np.argpartition(-top_scores, limit - 1)[:limit]
+                top_ids, top_scores = top_ids[best], top_scores[best]
+        
+        order = np.argsort(-top_scores, kind="stable")
+        hits = [(int(top_ids[i]), float(top_scores[i])) for i in order]
+        if not hits:
+            return []
+        
+        # Hydrate in rank order
+        result = await db.execute(segments_query.where(TranscriptSegment.id.in_([hit_id for hit_id, _ in hits])))
+        segments = {segment.id: segment for segment in result.scalars().all()}
+        return [(segments[hit_id], similarity) for hit_id, similarity in hits if hit_id in segments]
+    
     async def semantic_search(
         self,
         db: AsyncSession,
@@ -293,75 +570,70 @@ class EmbeddingService:
         """
         Perform semantic search using vector similarity
         
+        With pgvector, the top-k is an ANN query on the HNSW cosine index with all
+        filters applied in SQL. With SEMANTIC_SEARCH_ENGINE=matrix, it is an exact
+        scan of the memory-mapped embedding matrix. Otherwise filtered candidates
+        are scored in Python, chunk by chunk.
+        
         Args:
             db: Database session
             query_text: Search query text
             limit: Maximum number of results to return
             similarity_threshold: Minimum similarity score to include in results
-            filters: Additional filters to apply (speaker, date range, etc.)
+            filters: Additional filters to apply (speaker, min_date/max_date, video_id,
+                source, format, candidate, place, record_type, dataset)
             
         Returns:
-            List of search results with similarity scores
+            List of search results with similarity scores, highest first
         """
         # Generate embedding for query
-        query_embedding = self.generate_embedding(query_text)
-        query_vector_str = json.dumps(query_embedding)
+        query_embedding = self.embed_query(query_text)
         
-        # Get all segments with embeddings (fallback to manual similarity calculation)
-        # Since we don't have pgvector, we'll fetch segments and compute similarity in Python
-        segments_query = select(TranscriptSegment).where(
-            TranscriptSegment.embedding.is_not(None)
+        segments_query = (
+            select(TranscriptSegment)
+            .join(Video, Video.id == TranscriptSegment.video_id)
+            .options(selectinload(TranscriptSegment.video))
+            .where(TranscriptSegment.embedding.is_not(None))
         )
-        
-        # Add basic filters
-        filter_conditions = []
-        if filters:
-            if filters.get("speaker"):
-                filter_conditions.append(TranscriptSegment.speaker_name.ilike(f"%{filters['speaker']}%"))
-            if filters.get("min_date") or filters.get("max_date"):
-                # We'll handle date filters after joining with videos
-                pass
-        
-        if filter_conditions:
-            segments_query = segments_query.where(and_(*filter_conditions))
-        
-        # Fetch segments - limit to reasonable amount for performance
-        segments_query = segments_query.limit(min(1000, limit * 5))  # Get more candidates
-        result = await db.execute(segments_query)
-        segments = result.scalars().all()
-        
-        # Calculate similarities and filter
-        results = []
-        for segment in segments:
-            try:
-                # Parse embedding from JSON
-                segment_embedding = json.loads(segment.embedding)
-                
-                # Calculate similarity
-                similarity = self.calculate_similarity(query_embedding, segment_embedding)
-                
-                if similarity >= similarity_threshold:
-                    segment_dict = {
-                        "id": segment.id,
-                        "segment_id": segment.segment_id,
-                        "speaker_name": segment.speaker_name,
-                        "transcript_text": segment.transcript_text,
-                        "video_id": segment.video_id,
-                        "video_seconds": segment.video_seconds,
-                        "timestamp_start": segment.timestamp_start,
-                        "timestamp_end": segment.timestamp_end,
-                        "similarity_score": similarity,
-                        "sentiment_loughran_score": segment.sentiment_loughran_score,
-                        "stresslens_score": segment.stresslens_score
-                    }
-                    results.append(segment_dict)
-            except (json.JSONDecodeError, TypeError, ValueError) as e:
-                logger.warning(f"Error parsing embedding for segment {segment.id}: {str(e)}")
-                continue
-        
-        # Sort by similarity (highest first) and limit results
-        results.sort(key=lambda x: x["similarity_score"], reverse=True)
-        results = results[:limit]
+        conditions = self._filter_conditions(filters)
+        if conditions:
+            segments_query = segments_query.where(and_(*conditions))
+        
+        if settings.SEMANTIC_SEARCH_ENGINE == "matrix":
+            scored = await self._matrix_search(db, segments_query, conditions, query_embedding, limit, similarity_threshold)
+        elif await self._has_vector_index(db):
+            distance = TranscriptSegment.embedding.cosine_distance(query_embedding)
+            segments_query = (
+                segments_query
+                .add_columns((1 - distance).label("similarity"))
+                .where(distance <= 1 - similarity_threshold)
+                .order_by(distance)
+                .limit(limit)
+            )
+            # Larger candidate list so selective filters still fill the top-k
+            await db.execute(text(f"SET LOCAL hnsw.ef_search = {max(int(settings.VECTOR_EF_SEARCH), limit)}"))
+            result = await db.execute(segments_query)
+            scored = [(segment, float(similarity)) for segment, similarity in result.all()]
+        else:
+            scored = await self._scan_search(db, segments_query, conditions, query_embedding, limit, similarity_threshold)
+        
+        results = [
+            {
+                "id": segment.id,
+                "segment_id": segment.segment_id,
+                "speaker_name": segment.speaker_name,
+                "transcript_text": segment.transcript_text,
+                "video_id": segment.video_id,
+                "video_seconds": segment.video_seconds,
+                "timestamp_start": segment.timestamp_start,
+                "timestamp_end": segment.timestamp_end,
+                "similarity_score": similarity,
+                "sentiment_loughran_score": segment.sentiment_loughran_score,
+                "stresslens_score": segment.stresslens_score,
+                "video": segment.video
+            }
+            for segment, similarity in scored
+        ]
         
         logger.info(f"Semantic search for '{query_text}' returned {len(results)} results")
         
@@ -0,0 +1,493 @@
+"""
+Background embedding generation job
+
+Embedding generation runs as a three-stage pipeline whose stages overlap:
+- reader: streams segments without embeddings (id, text) by keyset on id,
+  serves texts found in the embedding cache directly, and groups the distinct
+  uncached texts into batches of similar length
+- encoders: run the CPU-bound model encode in a process pool, so the event loop
+  keeps serving imports and searches
+- writer: stores finished batches with one bulk UPDATE each, fanning every
+  embedding out to all segments sharing its text, and adds them to the cache
+
+A single job runs across all API workers: the worker that starts it holds a
+Postgres advisory lock until the job ends. The job's status and progress live
+in its `embedding_jobs` row, so `status()`, `pause()`, `resume()` and `cancel()`
+work from any worker; the owner stores its progress and applies pause, resume
+and cancel requests every EMBEDDING_JOB_POLL_SECONDS. Callers without a
+long-lived event loop (scripts) `wait()` for the job they started before exiting.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from ..config import settings
+from ..database import AsyncSessionLocal
+from ..models import EmbeddingJob, TranscriptSegment
+from .embedding_index import embedding_index
+from .embedding_service import embedding_service
+
+logger = logging.getLogger(__name__)
+
+# Encode batches: (segment ids per text, cache keys, texts)
+# Write batches: (segment ids, embeddings, new cache entries by key)
+# None ends a stage
+_Batch = Optional[Tuple[Any, ...]]
+
+# Job statuses while its owner runs it
+ACTIVE_STATUSES = ("running", "paused", "cancelling")
+# Session advisory lock held by the worker running a job (init_db uses 91540531)
+JOB_LOCK_KEY = 91540532
+# An active job whose owner missed this many heartbeats has stopped with its worker
+STALE_AFTER_POLLS = 30
+
+
+class EmbeddingJobRunning(RuntimeError):
+    """An embedding job is already running in this or another worker"""
+
+
+def _encode_batch(texts: List[str]) -> List[List[float]]:
+    """Encode texts in a pool process (the model is loaded once per process)"""
+    return embedding_service.generate_embeddings_batch(texts)
+
+
+async def _latest_job(db: AsyncSession) -> Optional[EmbeddingJob]:
+    result = await db.execute(select(EmbeddingJob).order_by(EmbeddingJob.id.desc()).limit(1))
+    return result.scalar_one_or_none()
+
+
+def _is_stale(job: EmbeddingJob) -> bool:
+    stale_after = timedelta(seconds=settings.EMBEDDING_JOB_POLL_SECONDS * STALE_AFTER_POLLS)
+    return job.status in ACTIVE_STATUSES and datetime.utcnow() - job.updated_at > stale_after
+
+
+class EmbeddingWorker:
+    """Runs the background embedding job and controls it from any worker"""
+
+    def __init__(self):
+        self.processes = settings.EMBEDDING_WORKER_PROCESSES or max(1, (os.cpu_count() or 2) // 2)
+        self.batch_size = settings.EMBEDDING_WORKER_BATCH_SIZE
+        self._task: Optional[asyncio.Task] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock_connection: Optional[AsyncConnection] = None
+        # Job run by this worker, until its final state is stored
+        self._job_id: Optional[int] = None
+        self._resume = asyncio.Event()
+        self._resume.set()
+        self._reset()
+
+    def _reset(self):
+        # Progress of the job run by this worker, stored on its row by _save_progress()
+        self._progress: Dict[str, Any] = {
+            "processed": 0,
+            "errors": 0,
+            "batches": 0,
+            "cache_hits": 0,
+            "last_segment_id": 0,
+            "encode_seconds": 0.0,
+            "write_seconds": 0.0,
+            "error_messages": [],
+        }
+
+    @property
+    def running(self) -> bool:
+        """Whether this worker runs a job"""
+        return self._task is not None and not self._task.done()
+
+    async def status(self) -> Dict[str, Any]:
+        """Progress and throughput metrics of the current (or last) job of any worker"""
+        if self._job_id is not None:
+            await self._save_progress()
+        async with AsyncSessionLocal() as db:
+            job = await _latest_job(db)
+            if job is not None and job.id != self._job_id and _is_stale(job):
+                job.error_messages = (job.error_messages or []) + ["The worker running the job stopped"]
+                job.status = "failed"
+                job.resumed_at = None
+                job.finished_at = datetime.utcnow()
+                await db.commit()
+        return self._describe(job)
+
+    def _describe(self, job: Optional[EmbeddingJob]) -> Dict[str, Any]:
+        if job is None:
+            return {
+                "job_id": None, "status": "idle", "total": 0, "processed": 0, "errors": 0, "batches": 0,
+                "cache_hits": 0, "last_segment_id": 0, "started_at": None, "finished_at": None,
+                "error_messages": [], "progress": 0.0, "elapsed_seconds": 0.0, "segments_per_second": 0.0,
+                "eta_seconds": None, "encode_seconds": 0.0, "write_seconds": 0.0,
+                "worker_processes": self.processes, "owner": None,
+            }
+        elapsed = job.active_seconds
+        if job.resumed_at is not None:
+            elapsed += max((datetime.utcnow() - job.resumed_at).total_seconds(), 0.0)
+        rate = job.processed / elapsed if elapsed > 0 else 0.0
+        remaining = max(job.total - job.processed - job.errors, 0)
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "total": job.total,
+            "processed": job.processed,
+            "errors": job.errors,
+            "batches": job.batches,
+            "cache_hits": job.cache_hits,
+            "last_segment_id": job.last_segment_id,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+            "error_messages": list(job.error_messages or []),
+            "progress": (job.processed + job.errors) / job.total * 100 if job.total else 0.0,
+            "elapsed_seconds": round(elapsed, 2),
+            "segments_per_second": round(rate, 2),
+            "eta_seconds": round(remaining / rate, 1) if rate > 0 else None,
+            "encode_seconds": round(job.encode_seconds, 2),
+            "write_seconds": round(job.write_seconds, 2),
+            "worker_processes": job.worker_processes,
+            "owner": job.owner,
+        }
+
+    async def start(self, force_regenerate: bool = False, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Start a background job in this worker
+
+        Args:
+            force_regenerate: Re-embed segments that already have embeddings
+            batch_size: Segments per encode batch
+
+        Returns:
+            Job status
+
+        Raises:
+            EmbeddingJobRunning: A job is already running in this or another worker
+        """
+        if self.running or not await self._lock():
+            raise EmbeddingJobRunning("An embedding job is already running")
+
+        batch_size = batch_size or self.batch_size
+        try:
+            async with AsyncSessionLocal() as db:
+                now = datetime.utcnow()
+                # Holding the lock, any job still marked active stopped with its worker
+                await db.execute(
+                    update(EmbeddingJob)
+                    .where(EmbeddingJob.status.in_(ACTIVE_STATUSES))
+                    .values(status="failed", resumed_at=None, finished_at=now)
+                )
+                query = select(func.count(TranscriptSegment.id))
+                if not force_regenerate:
+                    query = query.where(TranscriptSegment.embedding_generated_at.is_(None))
+                job = EmbeddingJob(
+                    status="running",
+                    force_regenerate=force_regenerate,
+                    batch_size=batch_size,
+                    worker_processes=self.processes,
+                    owner=f"{socket.gethostname()}:{os.getpid()}",
+                    total=(await db.execute(query)).scalar_one(),
+                    error_messages=[],
+                    started_at=now,
+                    resumed_at=now,
+                    updated_at=now,
+                )
+                db.add(job)
+                await db.commit()
+        except Exception:
+            await self._unlock()
+            raise
+
+        self._job_id = job.id
+        self._reset()
+        self._resume.set()
+        self._task = asyncio.create_task(self._run(force_regenerate, batch_size))
+        return await self.status()
+
+    async def wait(self) -> Dict[str, Any]:
+        """Wait for the job run by this worker (if any) to finish"""
+        if self._task is not None:
+            try:
+                await asyncio.shield(self._task)
+            except asyncio.CancelledError:
+                if not self._task.cancelled():
+                    raise
+        return await self.status()
+
+    async def pause(self) -> Dict[str, Any]:
+        """Stop picking up new batches; in-flight batches still finish"""
+        await self._request("paused", ("running",))
+        return await self.status()
+
+    async def resume(self) -> Dict[str, Any]:
+        await self._request("running", ("paused",))
+        return await self.status()
+
+    async def cancel(self) -> Dict[str, Any]:
+        """Cancel the job; a job run by another worker stops at its next poll"""
+        await self._request("cancelling", ("running", "paused"))
+        if self.running:
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._job_id is not None:
+            # Cancelled before the job started running: _run never cleaned up
+            await self._finish("cancelled")
+        return await self.status()
+
+    async def _request(self, status: str, current: Tuple[str, ...]):
+        """Move the latest job from one of the `current` statuses to `status`; its owner applies it"""
+        async with AsyncSessionLocal() as db:
+            job = await _latest_job(db)
+            if job is None or job.status not in current:
+                return
+            now = datetime.utcnow()
+            values: Dict[str, Any] = {"status": status}
+            if status == "running":
+                values["resumed_at"] = now
+            elif job.resumed_at is not None:
+                values["active_seconds"] = job.active_seconds + (now - job.resumed_at).total_seconds()
+                values["resumed_at"] = None
+            await db.execute(
+                update(EmbeddingJob)
+                .where(EmbeddingJob.id == job.id, EmbeddingJob.status == job.status)
+                .values(**values)
+            )
+            await db.commit()
+        if job.id == self._job_id:
+            self._apply(status)
+
+    def _apply(self, status: str):
+        """Act on the status of this worker's job row"""
+        if status == "paused":
+            self._resume.clear()
+        elif status == "running":
+            self._resume.set()
+        elif self.running:
+            # Cancel requested, or given up on by another worker
+            self._task.cancel()
+
+    async def _lock(self) -> bool:
+        """
+        Take the job lock on a connection kept for the job's lifetime
+
+        Without advisory locks (SQLite in tests) the latest job holds the lock
+        while its owner keeps the heartbeat of its row current.
+        """
+        connection = await AsyncSessionLocal.kw["bind"].connect()
+        try:
+            result = await connection.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": JOB_LOCK_KEY})
+            got_lock = bool(result.scalar())
+        except Exception:
+            await connection.close()
+            async with AsyncSessionLocal() as db:
+                job = await _latest_job(db)
+            return job is None or job.status not in ACTIVE_STATUSES or _is_stale(job)
+        if not got_lock:
+            await connection.close()
+            return False
+        await connection.commit()
+        self._lock_connection = connection
+        return True
+
+    async def _unlock(self):
+        connection, self._lock_connection = self._lock_connection, None
+        if connection is None:
+            return
+        try:
+            await connection.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": JOB_LOCK_KEY})
+            await connection.commit()
+        finally:
+            await connection.close()
+
+    async def _save_progress(self) -> str:
+        """Store the progress of this worker's job on its row (the heartbeat); returns the row's status"""
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(EmbeddingJob)
+                .where(EmbeddingJob.id == self._job_id)
+                .values(**self._progress_values(), updated_at=datetime.utcnow())
+            )
+            status = (await db.execute(
+                select(EmbeddingJob.status).where(EmbeddingJob.id == self._job_id)
+            )).scalar_one()
+            await db.commit()
+        return status
+
+    def _progress_values(self) -> Dict[str, Any]:
+        return {**self._progress, "error_messages": list(self._progress["error_messages"])}
+
+    async def _watch(self):
+        """Store the progress and apply requests made through the job row, from any worker"""
+        while True:
+            await asyncio.sleep(settings.EMBEDDING_JOB_POLL_SECONDS)
+            try:
+                self._apply(await self._save_progress())
+            except Exception as e:
+                logger.warning(f"Error updating embedding job {self._job_id}: {str(e)}")
+
+    async def _finish(self, status: str):
+        """Store the final status and progress of this worker's job and release the lock"""
+        job_id, self._job_id = self._job_id, None
+        try:
+            async with AsyncSessionLocal() as db:
+                job = await db.get(EmbeddingJob, job_id)
+                now = datetime.utcnow()
+                if job.resumed_at is not None:
+                    job.active_seconds += (now - job.resumed_at).total_seconds()
+                for key, value in self._progress_values().items():
+                    setattr(job, key, value)
+                job.status = status
+                job.resumed_at = None
+                job.finished_at = now
+                job.updated_at = now
+                await db.commit()
+        finally:
+            self._resume.set()
+            await self._unlock()
+
+    async def _run(self, force_regenerate: bool, batch_size: int):
+        encode_queue: asyncio.Queue = asyncio.Queue(maxsize=self.processes * 2)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.processes * 2)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+        )
+        encoders = [asyncio.create_task(self._encoder(encode_queue, write_queue)) for _ in range(self.processes)]
+        writer = asyncio.create_task(self._writer(write_queue))
+        watcher = asyncio.create_task(self._watch())
+        status = "failed"
+        try:
+            await self._reader(encode_queue, write_queue, force_regenerate, batch_size)
+            for _ in encoders:
+                await encode_queue.put(None)
+            await asyncio.gather(*encoders)
+            await write_queue.put(None)
+            await writer
+
+            if settings.SEMANTIC_SEARCH_ENGINE == "matrix" and self._progress["processed"]:
+                async with AsyncSessionLocal() as db:
+                    await embedding_index.refresh(db)
+
+            status = "completed"
+            logger.info(f"Embedding job {self._job_id} completed: {self._progress['processed']} segments")
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Embedding job failed: {str(e)}")
+            self._progress["error_messages"].append(str(e))
+        finally:
+            for task in (*encoders, writer, watcher):
+                task.cancel()
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            await self._finish(status)
+
+    async def _reader(
+        self,
+        encode_queue: asyncio.Queue,
+        write_queue: asyncio.Queue,
+        force_regenerate: bool,
+        batch_size: int
+    ):
+        """Stream (id, text) windows by keyset; queue cache hits for writing and misses for encoding"""
+        query = select(TranscriptSegment.id, TranscriptSegment.transcript_text)
+        if not force_regenerate:
+            query = query.where(TranscriptSegment.embedding_generated_at.is_(None))
+        window = batch_size * self.processes * 2
+
+        last_id = 0
+        async with AsyncSessionLocal() as db:
+            while True:
+                await self._resume.wait()
+                rows = (await db.execute(
+                    query.where(TranscriptSegment.id > last_id).order_by(TranscriptSegment.id).limit(window)
+                )).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+
+                # Distinct texts of the window with the segments that share them
+                groups: Dict[str, Tuple[str, List[int]]] = {}
+                for row in rows:
+                    key = embedding_service.text_key(row.transcript_text)
+                    groups.setdefault(key, (row.transcript_text, []))[1].append(row.id)
+                cached = await embedding_service.get_cached_embeddings(db, list(groups))
+                # End the read transaction so the writer's commits stay visible
+                await db.commit()
+
+                if cached:
+                    hit_ids = [segment_id for key in cached for segment_id in groups[key][1]]
+                    hit_embeddings = [cached[key] for key in cached for _ in groups[key][1]]
+                    self._progress["cache_hits"] += len(hit_ids)
+                    await write_queue.put((hit_ids, hit_embeddings, {}))
+
+                # Similar lengths in a batch waste less padding in the transformer
+                misses = sorted(
+                    (key for key in groups if key not in cached),
+                    key=lambda key: len(groups[key][0] or "")
+                )
+                for start in range(0, len(misses), batch_size):
+                    keys = misses[start:start + batch_size]
+                    await encode_queue.put((
+                        [groups[key][1] for key in keys],
+                        keys,
+                        [groups[key][0] for key in keys],
+                    ))
+
+    async def _encoder(self, encode_queue: asyncio.Queue, write_queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: _Batch = await encode_queue.get()
+            if batch is None:
+                return
+            await self._resume.wait()
+            id_groups, keys, texts = batch
+            started = time.monotonic()
+            try:
+                embeddings = await loop.run_in_executor(self._pool, _encode_batch, texts)
+            except Exception as e:
+                logger.error(f"Error encoding embedding batch: {str(e)}")
+                self._record_error(sum(len(ids) for ids in id_groups), str(e))
+                continue
+            self._progress["encode_seconds"] += time.monotonic() - started
+            await write_queue.put((
+                [segment_id for ids in id_groups for segment_id in ids],
+                [embedding for ids, embedding in zip(id_groups, embeddings) for _ in ids],
+                dict(zip(keys, embeddings)),
+            ))
+
+    async def _writer(self, write_queue: asyncio.Queue):
+        async with AsyncSessionLocal() as db:
+            while True:
+                batch: _Batch = await write_queue.get()
+                if batch is None:
+                    return
+                await self._resume.wait()
+                segment_ids, embeddings, new_cache_entries = batch
+                started = time.monotonic()
+                try:
+                    await embedding_service.write_embeddings(db, segment_ids, embeddings)
+                    await embedding_service.cache_embeddings(db, new_cache_entries)
+                    await db.commit()
+                except Exception as e:
+                    logger.error(f"Error writing embedding batch: {str(e)}")
+                    await db.rollback()
+                    self._record_error(len(segment_ids), str(e))
+                    continue
+                self._progress["write_seconds"] += time.monotonic() - started
+                self._progress["processed"] += len(segment_ids)
+                self._progress["batches"] += 1
+                self._progress["last_segment_id"] = max(self._progress["last_segment_id"], max(segment_ids))
+
+    def _record_error(self, count: int, message: str):
+        self._progress["errors"] += count
+        self._progress["error_messages"] = (self._progress["error_messages"] + [message])[-10:]
+
+
+# Global embedding worker instance
+embedding_worker = EmbeddingWorker()
@@ -0,0 +1,190 @@
+"""
+Streaming export service
+
+Exports run a plain column SELECT (no ORM hydration) on a server-side cursor and
+yield the encoded output chunk by chunk, so memory stays constant regardless of
+how many rows are exported.
+"""
+import csv
+import importlib.util
+import io
+import json
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Sequence
+
+from sqlalchemy import types as sqltypes
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Select
+
+from ..config import settings
+from ..database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Availability only; pyarrow is imported by the first Parquet/Arrow export
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# Columnar export formats: format -> (media type, file extension)
+COLUMNAR_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+async def iter_row_chunks(stmt: Select, chunk_size: int = None) -> AsyncIterator[List[Row]]:
+    """
+    Stream the rows of a statement in chunks from a server-side cursor
+
+    Uses its own session so the stream outlives the request handler that
+    returned the StreamingResponse.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+        async for partition in result.partitions(chunk_size):
+            yield partition
+
+
+async def stream_csv(
+    stmt: Select,
+    headers: Sequence[str],
+    to_values: Callable[[Row], Sequence[Any]],
+    chunk_size: int = None,
+) -> AsyncIterator[str]:
+    """Yield CSV text: the header line, then one block of lines per row chunk"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(headers)
+    yield output.getvalue()
+
+    async for rows in iter_row_chunks(stmt, chunk_size):
+        output.seek(0)
+        output.truncate(0)
+        writer.writerows(to_values(row) for row in rows)
+        yield output.getvalue()
+
+
+async def stream_ndjson(
+    stmt: Select,
+    to_record: Callable[[Row], Dict[str, Any]],
+    chunk_size: int = None,
+) -> AsyncIterator[str]:
+    """Yield newline-delimited JSON, one object per row"""
+    async for rows in iter_row_chunks(stmt, chunk_size):
+        yield "".join(json.dumps(to_record(row), default=_json_default) + "\n" for row in rows)
+
+
+async def stream_json_array(
+    stmt: Select,
+    to_record: Callable[[Row], Dict[str, Any]],
+    chunk_size: int = None,
+) -> AsyncIterator[str]:
+    """Yield a single JSON array of row objects"""
+    yield "["
+    separator = ""
+    async for rows in iter_row_chunks(stmt, chunk_size):
+        if not rows:
+            continue
+        yield separator + ",".join(json.dumps(to_record(row), default=_json_default) for row in rows)
+        separator = ","
+    yield "]"
+
+
+class _ChunkSink:
+    """Write-only file object collecting bytes until they are drained into the response"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _arrow_type(sql_type: sqltypes.TypeEngine):
+    """Arrow type for a SQLAlchemy column type (strings for anything unmapped)"""
+    import pyarrow as pa
+
+    if isinstance(sql_type, sqltypes.Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, sqltypes.Integer):
+        return pa.int64()
+    if isinstance(sql_type, (sqltypes.Float, sqltypes.Numeric)):
+        return pa.float64()
+    if isinstance(sql_type, sqltypes.DateTime):
+        return pa.timestamp("us")
+    if isinstance(sql_type, sqltypes.Date):
+        return pa.date32()
+    return pa.string()
+
+
+def arrow_schema(stmt: Select):
+    """Arrow schema matching the selected columns of a statement"""
+    import pyarrow as pa
+
+    return pa.schema([
+        pa.field(column.key, _arrow_type(column.type)) for column in stmt.selected_columns
+    ])
+
+
+def require_arrow():
+    """Raise if the optional pyarrow dependency is missing"""
+    if not HAS_PYARROW:
+        raise RuntimeError("pyarrow package not available. Please install it to use parquet/arrow exports.")
+
+
+async def stream_columnar(stmt: Select, format: str = "parquet", chunk_size: int = None) -> AsyncIterator[bytes]:
+    """
+    Yield a Parquet file or an Arrow IPC stream built from the statement's rows
+
+    Each cursor chunk is transposed into one record batch (one row group for
+    Parquet); rows are never turned into per-row dicts.
+
+    Args:
+        stmt: Column-only SELECT; column labels become field names
+        format: "parquet" or "arrow"
+        chunk_size: Rows per cursor round trip and per record batch
+    """
+    require_arrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema(stmt)
+    sink = _ChunkSink()
+    if format == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    try:
+        async for rows in iter_row_chunks(stmt, chunk_size):
+            if not rows:
+                continue
+            columns = zip(*rows)
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            )
+            writer.write_batch(batch)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
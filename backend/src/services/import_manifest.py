@@ -0,0 +1,212 @@
+"""
+Persisted record of the files read by directory imports
+
+Every imported file is recorded with its size, mtime, content hash and the
+version of the parser that read it. A run loads the entries of its parser in
+one query and compares them with a stat of each file: files with the same size
+and mtime are skipped without being opened, files that were only touched are
+recognized by their hash, and files read by another parser version are
+imported again.
+
+Importers read each file through a FileReader, which takes the stat before
+reading and hashes exactly the bytes handed to the parser; that fingerprint is
+what gets recorded. A file rewritten after it was read therefore never matches
+its entry, and is imported again by the next run.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..models import ImportManifestEntry
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1 << 20
+
+_MANIFEST_TABLE = ImportManifestEntry.__table__
+
+
+def file_hash(path: str) -> str:
+    """sha256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileFingerprint(NamedTuple):
+    """A file as an import read it"""
+    size: int
+    mtime_ns: int
+    content_hash: str  # sha256 of the bytes that were parsed
+
+
+class FileReader:
+    """
+    Reads a file for parsing and fingerprints the bytes that were read
+
+    The stat is taken before reading, so a rewrite during or after the read
+    leaves a newer mtime on disk than the one recorded. If the content is read
+    more than once, the fingerprint is that of the last complete read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        stat = os.stat(path)
+        self._stat = (stat.st_size, stat.st_mtime_ns)
+        self._content_hash: Optional[str] = None
+
+    def read(self) -> bytes:
+        """The whole content"""
+        with open(self.path, "rb") as f:
+            content = f.read()
+        self._content_hash = hashlib.sha256(content).hexdigest()
+        return content
+
+    def chunks(self, chunk_size: int = HASH_CHUNK_SIZE) -> Iterator[bytes]:
+        """The content in chunks, for parsers that never hold the whole document"""
+        digest = hashlib.sha256()
+        with open(self.path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+                yield chunk
+        self._content_hash = digest.hexdigest()
+
+    @property
+    def fingerprint(self) -> FileFingerprint:
+        if self._content_hash is None:
+            raise RuntimeError(f"{self.path} has not been read completely")
+        return FileFingerprint(*self._stat, self._content_hash)
+
+
+def read_fingerprint(path: str) -> FileFingerprint:
+    """Fingerprint of a file's current content"""
+    reader = FileReader(path)
+    for _ in reader.chunks():
+        pass
+    return reader.fingerprint
+
+
+class ImportManifest:
+    """Import-run-scoped view of the manifest entries of one parser"""
+
+    def __init__(self, session_factory: async_sessionmaker, parser: str, parser_version: str):
+        self.session_factory = session_factory
+        self.parser = parser
+        self.parser_version = parser_version
+        self._entries: Dict[str, Tuple[int, int, str, str]] = {}  # path -> (size, mtime_ns, hash, parser version)
+        self._pending: Dict[str, Dict[str, Any]] = {}  # path -> row to upsert
+
+    async def load(self):
+        """Load every entry of this parser"""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(
+                    ImportManifestEntry.path,
+                    ImportManifestEntry.size,
+                    ImportManifestEntry.mtime_ns,
+                    ImportManifestEntry.content_hash,
+                    ImportManifestEntry.parser_version,
+                ).where(ImportManifestEntry.parser == self.parser)
+            )
+            self._entries = {path: tuple(values) for path, *values in result.all()}
+        logger.info(f"Import manifest loaded {len(self._entries)} {self.parser} entries")
+
+    async def plan(self, paths: Sequence[Union[str, os.PathLike]]) -> Tuple[List[str], List[str]]:
+        """
+        Split files into new and changed ones; unchanged files are left out
+
+        Returns:
+            Tuple of (new paths, changed paths), in the order of `paths`
+        """
+        return await asyncio.to_thread(self._plan, [str(path) for path in paths])
+
+    def _plan(self, paths: List[str]) -> Tuple[List[str], List[str]]:
+        new, changed = [], []
+        for path in paths:
+            entry = self._entries.get(os.path.abspath(path))
+            if entry is None:
+                new.append(path)
+                continue
+            size, mtime_ns, content_hash, parser_version = entry
+            if parser_version != self.parser_version:
+                changed.append(path)
+                continue
+            stat = os.stat(path)
+            if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+                continue
+            # Rewritten or only touched: a change is a different content
+            if file_hash(path) != content_hash:
+                changed.append(path)
+            else:
+                # Store the new mtime so later runs skip it without hashing
+                key = os.path.abspath(path)
+                self._pending[key] = {"path": key, "mtime_ns": stat.st_mtime_ns}
+        return new, changed
+
+    async def record(self, path: str, video_id: int, fingerprint: Optional[FileFingerprint] = None):
+        """
+        Remember an imported file; written by the next flush
+
+        Args:
+            path: The imported file
+            video_id: Video the file was imported into
+            fingerprint: The file as it was read for the import (from its FileReader);
+                files that were not parsed are fingerprinted as they are now
+        """
+        if fingerprint is None:
+            fingerprint = await asyncio.to_thread(read_fingerprint, path)
+        key = os.path.abspath(path)
+        self._pending[key] = {
+            "path": key,
+            "parser": self.parser,
+            "parser_version": self.parser_version,
+            "size": fingerprint.size,
+            "mtime_ns": fingerprint.mtime_ns,
+            "content_hash": fingerprint.content_hash,
+            "video_id": video_id,
+        }
+
+    async def flush(self):
+        """Write the recorded entries: one upsert, plus one update for the mtimes of touched files"""
+        if not self._pending:
+            return
+        rows = list(self._pending.values())
+        self._pending = {}
+        touched = [row for row in rows if "video_id" not in row]
+        imported = [row for row in rows if "video_id" in row]
+        async with self.session_factory() as db:
+            insert_stmt = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+            if imported:
+                stmt = insert_stmt(_MANIFEST_TABLE)
+                await db.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=["path"],
+                        set_={
+                            "parser": stmt.excluded.parser,
+                            "parser_version": stmt.excluded.parser_version,
+                            "size": stmt.excluded.size,
+                            "mtime_ns": stmt.excluded.mtime_ns,
+                            "content_hash": stmt.excluded.content_hash,
+                            "video_id": stmt.excluded.video_id,
+                            "imported_at": func.now(),
+                        },
+                    ),
+                    imported,
+                )
+            if touched:
+                await db.execute(
+                    update(_MANIFEST_TABLE)
+                    .where(_MANIFEST_TABLE.c.path == bindparam("b_path"))
+                    .values(mtime_ns=bindparam("b_mtime_ns")),
+                    [{"b_path": row["path"], "b_mtime_ns": row["mtime_ns"]} for row in touched],
+                )
+            await db.commit()
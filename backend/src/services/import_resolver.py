@@ -0,0 +1,85 @@
+"""
+Speaker and topic resolution shared by the files of an import run
+
+All known speakers and topics are loaded once when a run starts; the files
+imported concurrently by the run then resolve names from memory. Names not seen
+before are created in batches with an upsert, in a session of the resolver's
+own that commits right away, so the cached ids stay valid even when the file
+that introduced a name fails and rolls back.
+"""
+import asyncio
+import logging
+from typing import Callable, Dict, Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..models import Speaker, Topic
+from .segment_writer import normalize_speaker_name, resolve_speakers, resolve_topics
+
+logger = logging.getLogger(__name__)
+
+
+class ImportResolver:
+    """Import-run-scoped cache of speaker and topic ids"""
+
+    def __init__(self, session_factory: async_sessionmaker):
+        self.session_factory = session_factory
+        self._speakers: Dict[str, int] = {}  # normalized name -> id
+        self._topics: Dict[str, int] = {}  # name -> id
+        self._lock = asyncio.Lock()
+
+    async def preload(self):
+        """Load every existing speaker and topic"""
+        async with self.session_factory() as db:
+            speakers = await db.execute(
+                select(Speaker.normalized_name, func.min(Speaker.id)).group_by(Speaker.normalized_name)
+            )
+            self._speakers = dict(speakers.all())
+            self._topics = dict((await db.execute(select(Topic.name, Topic.id))).all())
+        logger.info(f"Import resolver preloaded {len(self._speakers)} speakers and {len(self._topics)} topics")
+
+    async def speaker_ids(self, names: Iterable[Optional[str]]) -> Dict[str, int]:
+        """
+        Speaker ids for the given names, creating unknown speakers in one batch
+
+        Returns:
+            Dictionary of stripped speaker name -> speaker id (blank names are left out)
+        """
+        names = {name.strip() for name in names if name and name.strip()}
+        if any(normalize_speaker_name(name) not in self._speakers for name in names):
+            async with self._lock:
+                # Another file may have created them while this one waited
+                missing = [name for name in names if normalize_speaker_name(name) not in self._speakers]
+                if missing:
+                    async with self.session_factory() as db:
+                        created = await resolve_speakers(db, missing)
+                        await db.commit()
+                    for name, speaker_id in created.items():
+                        self._speakers[normalize_speaker_name(name)] = speaker_id
+        return {
+            name: self._speakers[normalize_speaker_name(name)]
+            for name in names
+            if normalize_speaker_name(name) in self._speakers
+        }
+
+    async def topic_ids(self, names: Iterable[Optional[str]], categorize: Callable[[str], str]) -> Dict[str, int]:
+        """
+        Topic ids for the given names, creating unknown topics in one batch
+
+        Args:
+            names: Topic names
+            categorize: Category for a new topic, from its name
+
+        Returns:
+            Dictionary of stripped topic name -> topic id
+        """
+        names = {name.strip() for name in names if name and name.strip()}
+        if any(name not in self._topics for name in names):
+            async with self._lock:
+                missing = [name for name in names if name not in self._topics]
+                if missing:
+                    async with self.session_factory() as db:
+                        self._topics.update(await resolve_topics(db, missing, categorize))
+                        await db.commit()
+        return {name: self._topics[name] for name in names if name in self._topics}
@@ -4,28 +4,58 @@ Import service for processing HTML transcript files
 import os
 import asyncio
 import logging
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Tuple
+from aiomultiprocess import Pool as AioPool
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy import select
 from datetime import datetime
 
-from ..parsers.html_parser import TranscriptHTMLParser
+from ..parsers.html_parser import PARSER_VERSION, TranscriptHTMLParser
 from ..models import Video, Speaker, Topic, TranscriptSegment, SegmentTopic
 from ..database import Base
 from ..config import settings
 from .embedding_service import embedding_service
+from .embedding_worker import EmbeddingJobRunning, embedding_worker
+from .import_manifest import FileReader, ImportManifest
+from .import_resolver import ImportResolver
+from .segment_writer import (
+    delete_video_segments,
+    insert_segment_topics,
+    insert_segments,
+    lock_video,
+    refresh_replaced_stats,
+    refresh_video_stats,
+    segment_row,
+)
 
 logger = logging.getLogger(__name__)
 
+def parse_html_file(file_path: str) -> Dict[str, Any]:
+    """Parse a single HTML file and fingerprint the bytes parsed; errors are returned rather than raised"""
+    try:
+        parser = TranscriptHTMLParser(backend=settings.HTML_PARSER_BACKEND)
+        reader = FileReader(file_path)
+        data = parser.parse_content(reader.read(), file_path)
+        return {"success": True, "data": data, "file_path": file_path, "fingerprint": reader.fingerprint}
+    except Exception as e:
+        return {"success": False, "error": str(e), "file_path": file_path}
+
+
+# Standalone coroutine for the aiomultiprocess pool (must be at module level)
+async def parse_html_file_async(file_path: str) -> Dict[str, Any]:
+    return parse_html_file(file_path)
+
 
 class ImportService:
     """Service for importing HTML transcript files into the database"""
     
     def __init__(self, max_concurrent_files: int = 4):
-        self.parser = TranscriptHTMLParser()
         self.max_concurrent_files = max_concurrent_files
         self.semaphore = asyncio.Semaphore(max_concurrent_files)
+        # Parsing is CPU-bound: one process per core, leaving one for the event loop
+        self.process_pool_size = min(max_concurrent_files, max(2, (os.cpu_count() or 4) - 1))
         self.engine = create_async_engine(
             settings.database_url.replace("postgresql://", "postgresql+asyncpg://"),
             echo=False,
@@ -44,15 +74,21 @@ class ImportService:
         html_dir: str,
         force_reimport: bool = False,
         generate_embeddings: bool = True,
+        await_embeddings: bool = False,
         progress_callback: Optional[Callable[[int, int, str, List[str]], None]] = None
     ) -> Dict[str, Any]:
         """
         Import all HTML files from a directory
         
+        Files recorded in the import manifest are only read again when their
+        content or the parser version changed; those are re-imported.
+        
         Args:
             html_dir: Directory containing HTML files
-            force_reimport: Whether to reimport existing files
+            force_reimport: Whether to reimport all files, changed or not
             generate_embeddings: Whether to generate embeddings after import
+            await_embeddings: Wait for the embedding job to finish instead of leaving
+                it running in the background (for callers whose event loop exits)
             progress_callback: Callback for progress updates
             
         Returns:
@@ -63,84 +99,142 @@ class ImportService:
         processed_files = 0
         failed_files = 0
         errors = []
+        started = time.monotonic()
+        
+        # One manifest query and a stat per file decide which files need reading
+        manifest = ImportManifest(self.SessionLocal, "html", PARSER_VERSION)
+        await manifest.load()
+        new_files, changed_files = await manifest.plan(html_files)
+        if force_reimport:
+            changed_files = [str(file_path) for file_path in html_files]
+            new_files = []
+        reimport = set(changed_files)
+        import_files = [Path(file_path) for file_path in new_files + changed_files]
+        skipped_files = total_files - len(import_files)
+        await manifest.flush()
+        
+        logger.info(
+            f"Starting import of {len(import_files)} new or changed HTML files from {html_dir} "
+            f"({skipped_files} unchanged) with {self.max_concurrent_files} "
+            f"concurrent writers and {self.process_pool_size} parser processes"
+        )
         
-        logger.info(f"Starting import of {total_files} HTML files from {html_dir} with {self.max_concurrent_files} concurrent workers")
+        # Speakers and topics are loaded once and shared by all files of the run
+        resolver = ImportResolver(self.SessionLocal)
+        await resolver.preload()
         
-        # Process files in batches for better progress reporting
-        batch_size = self.max_concurrent_files * 3  # Process 3 batches worth at a time
+        # Files in flight at once: while some are written, the next ones parse in the pool
+        window_size = self.max_concurrent_files * 3
+        completed_files = 0
         
-        for batch_start in range(0, total_files, batch_size):
-            batch_end = min(batch_start + batch_size, total_files)
-            batch_files = html_files[batch_start:batch_end]
+        async with AioPool(processes=self.process_pool_size) as process_pool:
+            file_iter = iter(import_files)
+            in_flight: Dict[asyncio.Future, Path] = {}
             
-            # Create tasks for concurrent processing
-            tasks = [
-                self._import_html_file_with_semaphore(str(file_path), force_reimport)
-                for file_path in batch_files
-            ]
+            def start_next_file():
+                file_path = next(file_iter, None)
+                if file_path is not None:
+                    # Changed files replace their video
+                    task = asyncio.ensure_future(
+                        self.import_html_file(str(file_path), str(file_path) in reimport, resolver, process_pool)
+                    )
+                    in_flight[task] = file_path
             
-            # Execute batch concurrently
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+            for _ in range(window_size):
+                start_next_file()
             
-            # Process results and update counters
-            for i, (file_path, result) in enumerate(zip(batch_files, batch_results)):
-                current_index = batch_start + i
-                
-                if progress_callback:
-                    progress_callback(current_index, total_files, str(file_path), errors)
-                
-                if isinstance(result, Exception):
-                    failed_files += 1
-                    error_msg = f"{file_path.name}: {str(result)}"
-                    errors.append(error_msg)
-                    logger.error(f"Error importing {file_path}: {str(result)}")
-                elif result.get("success"):
-                    processed_files += 1
-                else:
-                    failed_files += 1
-                    errors.append(f"{file_path.name}: {result.get('error', 'Unknown error')}")
+            # Sliding window: each finished file starts the next one
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    file_path = in_flight.pop(task)
+                    start_next_file()
+                    
+                    if progress_callback:
+                        progress_callback(skipped_files + completed_files, total_files, str(file_path), errors)
+                    completed_files += 1
+                    
+                    exception = task.exception()
+                    result = task.result() if exception is None else None
+                    if exception is not None:
+                        failed_files += 1
+                        errors.append(f"{file_path.name}: {str(exception)}")
+                        logger.error(f"Error importing {file_path}: {str(exception)}")
+                    elif result.get("success"):
+                        processed_files += 1
+                        await manifest.record(str(file_path), result["video_id"], result.get("fingerprint"))
+                    else:
+                        failed_files += 1
+                        errors.append(f"{file_path.name}: {result.get('error', 'Unknown error')}")
+                    
+                    if completed_files % window_size == 0 or completed_files == len(import_files):
+                        await manifest.flush()
+                        elapsed = time.monotonic() - started
+                        logger.info(
+                            f"Progress: {completed_files}/{len(import_files)} files "
+                            f"({completed_files / elapsed:.1f} files/sec)"
+                        )
         
         # Final progress update
         if progress_callback:
             progress_callback(total_files, total_files, "", errors)
         
-        logger.info(f"Import completed: {processed_files} successful, {failed_files} failed")
+        elapsed = time.monotonic() - started
+        # Unchanged files are skipped without being read: only imported files count
+        files_per_second = processed_files / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"Import completed: {processed_files} successful, {failed_files} failed, {skipped_files} unchanged "
+            f"in {elapsed:.1f}s ({files_per_second:.1f} files/sec)"
+        )
         
-        # Generate embeddings if requested and there were successful imports
+        # Queue embedding generation for the new segments in the background
         embedding_stats = None
         if generate_embeddings and processed_files > 0:
-            logger.info("Starting embedding generation for newly imported segments")
+            logger.info("Starting background embedding generation for newly imported segments")
             try:
-                async with self.SessionLocal() as db:
-                    embedding_stats = await embedding_service.generate_embeddings_for_segments(
-                        db=db,
-                        force_regenerate=False  # Only generate for new segments
-                    )
-                logger.info(f"Embedding generation completed: {embedding_stats}")
+                embedding_stats = await embedding_worker.start(force_regenerate=False)
+                if await_embeddings:
+                    embedding_stats = await embedding_worker.wait()
+            except EmbeddingJobRunning:
+                # New segments have the highest ids: the running job's reader reaches them
+                # unless it has finished reading
+                logger.info("An embedding job is already running")
+                embedding_stats = await embedding_worker.status()
             except Exception as e:
-                logger.error(f"Error generating embeddings: {str(e)}")
+                logger.error(f"Error starting embedding generation: {str(e)}")
                 errors.append(f"Embedding generation failed: {str(e)}")
         
         return {
             "total_files": total_files,
             "total_processed": processed_files,
             "total_failed": failed_files,
+            "total_skipped": skipped_files,
             "errors": errors,
+            "elapsed_seconds": round(elapsed, 2),
+            "files_per_second": round(files_per_second, 2),
             "embedding_stats": embedding_stats
         }
 
-    async def _import_html_file_with_semaphore(self, file_path: str, force_reimport: bool = False) -> Dict[str, Any]:
-        """Import a single HTML file with semaphore-based concurrency control"""
-        async with self.semaphore:
-            return await self.import_html_file(file_path, force_reimport)
-    
-    async def import_html_file(self, file_path: str, force_reimport: bool = False) -> Dict[str, Any]:
+    async def import_html_file(
+        self,
+        file_path: str,
+        force_reimport: bool = False,
+        resolver: Optional[ImportResolver] = None,
+        process_pool: Optional[AioPool] = None
+    ) -> Dict[str, Any]:
         """
         Import a single HTML transcript file
         
+        Only the database work holds one of the service's concurrency slots;
+        parsing runs in the process pool (or a thread), so the next files parse
+        while earlier ones are written. The video and its segments are written
+        in one transaction; on re-import the old segments are replaced in it.
+        
         Args:
             file_path: Path to the HTML file
             force_reimport: Whether to reimport if video already exists
+            resolver: Speaker/topic resolver of the import run (a new one if omitted)
+            process_pool: Pool to parse in (a worker thread if omitted)
             
         Returns:
             Dictionary with import result
@@ -148,48 +242,60 @@ class ImportService:
         try:
             filename = Path(file_path).name
             
-            async with self.SessionLocal() as db:
+            async with self.semaphore, self.SessionLocal() as db:
                 # Check if video already exists
                 existing_video_query = select(Video).where(Video.filename == filename)
                 result = await db.execute(existing_video_query)
                 existing_video = result.scalar_one_or_none()
-                
-                if existing_video and not force_reimport:
-                    return {
-                        "success": True,
-                        "message": "Video already exists, skipping",
-                        "video_id": existing_video.id
-                    }
-                
-                # Parse HTML file
-                parsed_data = self.parser.parse_file(file_path)
-                
-                if not parsed_data["segments"]:
-                    return {
-                        "success": False,
-                        "error": "No transcript segments found in file"
-                    }
-                
-                # Import or update video
-                if existing_video and force_reimport:
-                    # Delete existing segments
-                    await db.execute(
-                        select(TranscriptSegment).where(TranscriptSegment.video_id == existing_video.id)
-                    )
-                    await db.commit()
-                    video = existing_video
+            
+            if existing_video and not force_reimport:
+                return {
+                    "success": True,
+                    "message": "Video already exists, skipping",
+                    "video_id": existing_video.id
+                }
+            
+            # Parse HTML file off the event loop
+            if process_pool is not None:
+                parse_result = await process_pool.apply(parse_html_file_async, (file_path,))
+            else:
+                parse_result = await asyncio.to_thread(parse_html_file, file_path)
+            if not parse_result["success"]:
+                return {"success": False, "error": parse_result["error"]}
+            parsed_data = parse_result["data"]
+            
+            if not parsed_data["segments"]:
+                return {
+                    "success": False,
+                    "error": "No transcript segments found in file"
+                }
+            
+            # Ensure dataset/source_type tagging for HTML imports
+            video_data = {**parsed_data["video_metadata"], "dataset": "trump", "source_type": "html"}
+            
+            # Resolve names before the write transaction starts; new ones are committed by the resolver
+            speaker_ids, topic_ids = await self._resolve_names(
+                parsed_data["segments"], resolver or ImportResolver(self.SessionLocal)
+            )
+            
+            async with self.semaphore, self.SessionLocal() as db:
+                # Import or replace video
+                replacing = existing_video is not None and force_reimport
+                if replacing:
+                    video = await lock_video(db, existing_video.id)
+                    for key, value in video_data.items():
+                        setattr(video, key, value)
+                    old_speaker_ids, old_topic_ids = await delete_video_segments(db, video.id)
                 else:
-                    # Create new video
-                    video_data = parsed_data["video_metadata"]
-                    # Ensure dataset/source_type tagging for HTML imports
-                    video_data = {**video_data, "dataset": "trump", "source_type": "html"}
                     video = Video(**video_data)
                     db.add(video)
-                    await db.commit()
-                    await db.refresh(video)
+                    await db.flush()
                 
                 # Process segments
-                await self._process_segments(db, video, parsed_data["segments"])
+                await self._process_segments(db, video, parsed_data["segments"], speaker_ids, topic_ids)
+                await refresh_video_stats(db, video.id)
+                if replacing:
+                    await refresh_replaced_stats(db, video.id, old_speaker_ids, old_topic_ids)
                 
                 await db.commit()
                 
@@ -197,7 +303,8 @@ class ImportService:
                     "success": True,
                     "message": "File imported successfully",
                     "video_id": video.id,
-                    "segments_imported": len(parsed_data["segments"])
+                    "segments_imported": len(parsed_data["segments"]),
+                    "fingerprint": parse_result["fingerprint"]
                 }
         
         except Exception as e:
@@ -207,114 +314,46 @@ class ImportService:
                 "error": str(e)
             }
     
-    async def _process_segments(self, db: AsyncSession, video: Video, segments_data: List[Dict[str, Any]]):
-        """Process and import transcript segments"""
-        
-        # Create speaker lookup cache
-        speaker_cache = {}
-        topic_cache = {}
-        
-        for segment_data in segments_data:
-            try:
-                # Get or create speaker
-                speaker = await self._get_or_create_speaker(db, segment_data["speaker_name"], speaker_cache)
-                
-                # Create segment
-                segment = TranscriptSegment(
-                    video_id=video.id,
-                    speaker_id=speaker.id if speaker else None,
-                    **{k: v for k, v in segment_data.items() if k in TranscriptSegment.__table__.columns.keys()}
-                )
-                
-                db.add(segment)
-                await db.flush()  # Get segment ID
-                
-                # Process topics if present
-                if "primary_topic" in segment_data and segment_data["primary_topic"]:
-                    topic = await self._get_or_create_topic(db, segment_data["primary_topic"], topic_cache)
-                    if topic:
-                        segment_topic = SegmentTopic(
-                            segment_id=segment.id,
-                            topic_id=topic.id,
-                            score=1.0,  # Default score for primary topic
-                            confidence=1.0
-                        )
-                        db.add(segment_topic)
-                
-            except Exception as e:
-                logger.warning(f"Error processing segment: {str(e)}")
-                continue
-    
-    async def _get_or_create_speaker(
-        self, 
-        db: AsyncSession, 
-        speaker_name: str, 
-        cache: Dict[str, Speaker]
-    ) -> Optional[Speaker]:
-        """Get existing speaker or create new one"""
-        
-        if not speaker_name or speaker_name.strip() == "":
-            return None
-        
-        speaker_name = speaker_name.strip()
-        normalized_name = speaker_name.lower().replace(" ", "_")
-        
-        # Check cache first
-        if normalized_name in cache:
-            return cache[normalized_name]
-        
-        # Check database
-        speaker_query = select(Speaker).where(Speaker.normalized_name == normalized_name)
-        result = await db.execute(speaker_query)
-        speaker = result.scalar_one_or_none()
-        
-        if not speaker:
-            # Create new speaker
-            speaker = Speaker(
-                name=speaker_name,
-                normalized_name=normalized_name
-            )
-            db.add(speaker)
-            await db.flush()
-        
-        # Cache for future use
-        cache[normalized_name] = speaker
-        return speaker
+    async def _resolve_names(
+        self,
+        segments_data: List[Dict[str, Any]],
+        resolver: ImportResolver
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Speaker and topic ids for the segments of a file (name -> id)"""
+        speaker_ids = await resolver.speaker_ids(segment_data.get("speaker_name") for segment_data in segments_data)
+        topic_ids = await resolver.topic_ids(
+            (segment_data.get("primary_topic") for segment_data in segments_data),
+            self._categorize_topic
+        )
+        return speaker_ids, topic_ids
     
-    async def _get_or_create_topic(
-        self, 
-        db: AsyncSession, 
-        topic_name: str, 
-        cache: Dict[str, Topic]
-    ) -> Optional[Topic]:
-        """Get existing topic or create new one"""
-        
-        if not topic_name or topic_name.strip() == "":
-            return None
-        
-        topic_name = topic_name.strip()
-        
-        # Check cache first
-        if topic_name in cache:
-            return cache[topic_name]
-        
-        # Check database
-        topic_query = select(Topic).where(Topic.name == topic_name)
-        result = await db.execute(topic_query)
-        topic = result.scalar_one_or_none()
-        
-        if not topic:
-            # Create new topic
-            topic = Topic(
-                name=topic_name,
-                category=self._categorize_topic(topic_name)
-            )
-            db.add(topic)
-            await db.flush()
-        
-        # Cache for future use
-        cache[topic_name] = topic
-        return topic
+    async def _process_segments(
+        self,
+        db: AsyncSession,
+        video: Video,
+        segments_data: List[Dict[str, Any]],
+        speaker_ids: Dict[str, int],
+        topic_ids: Dict[str, int]
+    ):
+        """Process and import transcript segments with bulk inserts"""
+        
+        rows = [
+            segment_row(video.id, speaker_ids.get((segment_data.get("speaker_name") or "").strip()), segment_data)
+            for segment_data in segments_data
+        ]
+        segment_ids = await insert_segments(db, rows)
+        
+        # Primary topics as a second bulk statement
+        await insert_segment_topics(db, [
+            {
+                "segment_id": segment_id,
+                "topic_id": topic_ids[segment_data["primary_topic"].strip()],
+                "score": 1.0,  # Default score for primary topic
+                "confidence": 1.0,
+            }
+            for segment_id, segment_data in zip(segment_ids, segments_data)
+            if (segment_data.get("primary_topic") or "").strip() in topic_ids
+        ])
     
     def _categorize_topic(self, topic_name: str) -> str:
         """Categorize topic based on name"""
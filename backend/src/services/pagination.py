@@ -0,0 +1,133 @@
+"""
+Keyset (cursor) pagination helpers
+
+A cursor is an opaque, URL-safe token encoding the sort key values of the last
+row on a page. Passing it back continues the listing right after that row, so
+every page costs the same regardless of how deep the client has scrolled.
+
+Tokens also carry a short fingerprint of the listing's filters and sort order;
+a token passed to a listing with different ones is rejected instead of
+silently returning the wrong page.
+"""
+import base64
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, false, or_
+from sqlalchemy.sql import ColumnElement, Select
+
+# (sort expression, descending)
+SortKey = Tuple[ColumnElement, bool]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor token is malformed or belongs to a different listing"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def keyset_fingerprint(stmt: Select, keys: Sequence[SortKey]) -> str:
+    """Short hash of a listing's filtered statement, sort keys and bound parameter values"""
+    compiled = stmt.order_by(None).order_by(*order_by_keys(keys)).compile()
+    params = sorted((name, repr(value)) for name, value in compiled.params.items())
+    payload = json.dumps([str(compiled), params])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(values: Sequence[Any], fingerprint: str) -> str:
+    """Encode sort key values into an opaque cursor token for the listing with this fingerprint"""
+    payload = json.dumps({"f": fingerprint, "k": [_encode_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, key_count: int, fingerprint: str) -> List[Any]:
+    """Decode a cursor token produced by encode_cursor for a listing with key_count sort keys"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["k"]
+        if not isinstance(values, list) or len(values) != key_count:
+            raise ValueError("unexpected cursor shape")
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+    if payload.get("f") != fingerprint:
+        raise InvalidCursorError("Pagination cursor belongs to a listing with different filters or sort order")
+    return [_decode_value(v) for v in values]
+
+
+def order_by_keys(keys: Sequence[SortKey]) -> List[ColumnElement]:
+    """ORDER BY clauses for keys (NULLs sort as in Postgres defaults, on every backend)"""
+    return [expr.desc().nulls_first() if desc else expr.asc().nulls_last() for expr, desc in keys]
+
+
+def after_cursor(keys: Sequence[SortKey], values: Sequence[Any]) -> ColumnElement:
+    """WHERE clause matching rows strictly after the row holding `values` in order_by_keys order"""
+    clause: Optional[ColumnElement] = None
+    for (expr, desc), value in reversed(list(zip(keys, values))):
+        if desc:
+            # NULLS FIRST: every non-NULL follows a NULL, smaller values follow a value
+            strictly_after = expr.isnot(None) if value is None else expr < value
+        else:
+            # NULLS LAST: larger values and NULLs follow a value, nothing follows a NULL
+            strictly_after = false() if value is None else or_(expr > value, expr.is_(None))
+        equal = expr.is_(None) if value is None else expr == value
+        clause = strictly_after if clause is None else or_(strictly_after, and_(equal, clause))
+    return clause
+
+
+def apply_keyset(
+    stmt: Select,
+    keys: Sequence[SortKey],
+    page_size: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+) -> Select:
+    """
+    Order, position and limit a statement for one page
+
+    The sort key values are appended as trailing columns so split_keyset_page can
+    build the next cursor; one extra row is fetched to detect whether it exists.
+    The listing's fingerprint is kept in the statement's execution options. With
+    a cursor, `offset` is ignored.
+
+    Raises:
+        InvalidCursorError: if the cursor cannot be decoded for these keys, or was
+            issued for different filters or sort order
+    """
+    fingerprint = keyset_fingerprint(stmt, keys)
+    if cursor:
+        stmt = stmt.where(after_cursor(keys, decode_cursor(cursor, len(keys), fingerprint)))
+    elif offset:
+        stmt = stmt.offset(offset)
+    stmt = stmt.add_columns(*[expr.label(f"_cursor_{i}") for i, (expr, _) in enumerate(keys)])
+    stmt = stmt.execution_options(keyset_fingerprint=fingerprint, keyset_key_count=len(keys))
+    return stmt.order_by(*order_by_keys(keys)).limit(page_size + 1)
+
+
+def split_keyset_page(rows: Sequence[Any], stmt: Select, page_size: int) -> Tuple[List[Any], Optional[str]]:
+    """Split rows of an apply_keyset statement `stmt` into (entities, next cursor or None)"""
+    options = stmt.get_execution_options()
+    key_count = options["keyset_key_count"]
+    rows = list(rows)
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(list(rows[-1][-key_count:]), options["keyset_fingerprint"])
+    return [row[0] for row in rows], next_cursor
@@ -0,0 +1,81 @@
+"""
+Startup prewarm for heavy optional dependencies
+
+torch/sentence-transformers, openai, yt-dlp, MoviePy, langdetect, pyarrow and
+the Elasticsearch client are imported on first use, so workers that never need them
+start fast and stay small. Components listed in PREWARM are loaded during
+startup instead, moving the cost out of the first request.
+"""
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_embedding():
+    from .embedding_service import embedding_service
+    if embedding_service.has_model:
+        embedding_service._load_model()
+
+
+def _warm_openai():
+    import openai  # noqa: F401
+
+
+def _warm_youtube():
+    from .youtube_service import HAS_MOVIEPY
+    import yt_dlp  # noqa: F401
+    # MoviePy is optional for the YouTube pipeline
+    if HAS_MOVIEPY:
+        from moviepy.editor import VideoFileClip  # noqa: F401
+
+
+def _warm_elasticsearch():
+    import elasticsearch  # noqa: F401
+
+
+def _warm_langdetect():
+    from langdetect import DetectorFactory, detect
+    DetectorFactory.seed = 0
+    # The language profiles are read on the first detection
+    detect("prewarm the language detection profiles")
+
+
+def _warm_arrow():
+    from .export_service import HAS_PYARROW
+    # Only needed by Parquet/Arrow exports
+    if HAS_PYARROW:
+        import pyarrow.parquet  # noqa: F401
+
+
+PREWARM_COMPONENTS: Dict[str, Callable[[], None]] = {
+    "embedding": _warm_embedding,
+    "openai": _warm_openai,
+    "youtube": _warm_youtube,
+    "elasticsearch": _warm_elasticsearch,
+    "langdetect": _warm_langdetect,
+    "arrow": _warm_arrow,
+}
+
+
+async def prewarm(components: Sequence[str]):
+    """
+    Load the given components in a worker thread
+
+    Failures are logged and skipped; the component is then loaded (or its error
+    raised) on first use as usual.
+    """
+    for name in components:
+        warm = PREWARM_COMPONENTS.get(name)
+        if warm is None:
+            logger.warning(f"Unknown prewarm component: {name} (expected one of {', '.join(PREWARM_COMPONENTS)})")
+            continue
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(warm)
+        except Exception as e:
+            logger.warning(f"Prewarm of {name} failed: {str(e)}")
+            continue
+        logger.info(f"Prewarmed {name} in {time.perf_counter() - started:.2f}s")
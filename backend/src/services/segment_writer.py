@@ -0,0 +1,263 @@
+"""
+Bulk writes of parsed transcript segments
+
+Importers build plain row dicts for a whole file in memory and write them with
+multi-row INSERT statements (SQLAlchemy "insertmanyvalues", one statement per
+page of rows) instead of flushing one ORM object per segment. Speakers and
+topics are resolved for a whole batch of names at once with an upsert.
+
+A re-import replaces a video's segments inside the transaction that writes the
+new ones: the video row is locked, the old segments and topic links are removed
+with two bulk DELETEs and the stats are recomputed before the commit, so readers
+see either the old or the new transcript.
+"""
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import SegmentTopic, Speaker, Topic, TranscriptSegment, Video
+
+logger = logging.getLogger(__name__)
+
+# Core tables: ORM bulk inserts would split the rows into runs by which values are None
+_SEGMENT_TABLE = TranscriptSegment.__table__
+_SEGMENT_TOPIC_TABLE = SegmentTopic.__table__
+# Parsed fields that map onto segment columns; ids are always generated
+SEGMENT_COLUMNS = frozenset(_SEGMENT_TABLE.columns.keys()) - {"id"}
+
+
+def segment_row(video_id: int, speaker_id: Optional[int], segment_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values of one segment from a parser segment dict"""
+    row = {key: value for key, value in segment_data.items() if key in SEGMENT_COLUMNS}
+    row["video_id"] = video_id
+    row["speaker_id"] = speaker_id
+    return row
+
+
+def _uniform_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Give every row the same keys, as one multi-row statement binds the same columns
+    for all rows; a missing value falls back to the column's scalar default
+    """
+    keys = set().union(*rows)
+    missing_defaults = {}
+    for key in keys:
+        default = _SEGMENT_TABLE.c[key].default
+        missing_defaults[key] = default.arg if default is not None and default.is_scalar else None
+    return [row if len(row) == len(keys) else {**missing_defaults, **row} for row in rows]
+
+
+async def insert_segments(db: AsyncSession, rows: List[Dict[str, Any]], return_ids: bool = True) -> List[int]:
+    """
+    Insert segment rows in bulk
+
+    Args:
+        db: Database session (not committed)
+        rows: Rows from `segment_row`
+        return_ids: Use INSERT ... RETURNING to get the new ids
+
+    Returns:
+        The new segment ids in the order of `rows` (empty without return_ids)
+    """
+    if not rows:
+        return []
+    rows = _uniform_rows(rows)
+    if not return_ids:
+        await db.execute(insert(_SEGMENT_TABLE), rows)
+        return []
+    result = await db.execute(
+        insert(_SEGMENT_TABLE).returning(_SEGMENT_TABLE.c.id, sort_by_parameter_order=True),
+        rows,
+    )
+    return list(result.scalars().all())
+
+
+async def insert_segment_topics(db: AsyncSession, links: Iterable[Dict[str, Any]]):
+    """Insert segment-topic links (segment_id, topic_id, score, confidence) in one executemany"""
+    links = list(links)
+    if links:
+        await db.execute(insert(_SEGMENT_TOPIC_TABLE), links)
+
+
+async def lock_video(db: AsyncSession, video_id: int) -> Video:
+    """The video row, locked until the transaction ends so concurrent re-imports of it run one after the other"""
+    result = await db.execute(
+        select(Video).where(Video.id == video_id).with_for_update().execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+async def _video_speaker_and_topic_ids(db: AsyncSession, video_id: int) -> Tuple[Set[int], Set[int]]:
+    """Speakers and topics the segments of a video refer to"""
+    segment_ids = select(_SEGMENT_TABLE.c.id).where(_SEGMENT_TABLE.c.video_id == video_id)
+    speaker_ids = await db.execute(
+        select(_SEGMENT_TABLE.c.speaker_id).distinct()
+        .where(_SEGMENT_TABLE.c.video_id == video_id, _SEGMENT_TABLE.c.speaker_id.isnot(None))
+    )
+    topic_ids = await db.execute(
+        select(_SEGMENT_TOPIC_TABLE.c.topic_id).distinct().where(_SEGMENT_TOPIC_TABLE.c.segment_id.in_(segment_ids))
+    )
+    return set(speaker_ids.scalars().all()), set(topic_ids.scalars().all())
+
+
+async def delete_video_segments(db: AsyncSession, video_id: int) -> Tuple[Set[int], Set[int]]:
+    """
+    Delete all segments of a video and their topic links (one DELETE each)
+
+    Returns:
+        Tuple of (speaker ids, topic ids) the deleted segments referred to, for `refresh_replaced_stats`
+    """
+    speaker_ids, topic_ids = await _video_speaker_and_topic_ids(db, video_id)
+    segment_ids = select(_SEGMENT_TABLE.c.id).where(_SEGMENT_TABLE.c.video_id == video_id)
+    await db.execute(delete(_SEGMENT_TOPIC_TABLE).where(_SEGMENT_TOPIC_TABLE.c.segment_id.in_(segment_ids)))
+    await db.execute(delete(_SEGMENT_TABLE).where(_SEGMENT_TABLE.c.video_id == video_id))
+    return speaker_ids, topic_ids
+
+
+async def refresh_video_stats(db: AsyncSession, video_id: int):
+    """Recompute the totals of a video from its segments (session not committed)"""
+    video_segments = select(_SEGMENT_TABLE).where(_SEGMENT_TABLE.c.video_id == video_id).subquery()
+    totals = (await db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(video_segments.c.word_count), 0),
+            func.coalesce(func.sum(video_segments.c.char_count), 0),
+        )
+    )).one()
+    await db.execute(
+        update(Video.__table__).where(Video.__table__.c.id == video_id).values(
+            total_segments=totals[0], total_words=totals[1], total_characters=totals[2]
+        )
+    )
+
+
+async def refresh_replaced_stats(
+    db: AsyncSession, video_id: int, speaker_ids: Iterable[int], topic_ids: Iterable[int]
+):
+    """
+    Recompute the stats of the speakers and topics a replaced video's old and
+    new segments refer to
+
+    Args:
+        db: Database session (not committed)
+        video_id: Video whose segments were replaced
+        speaker_ids: Speakers of its old segments (from `delete_video_segments`)
+        topic_ids: Topics of its old segments
+    """
+    current_speaker_ids, current_topic_ids = await _video_speaker_and_topic_ids(db, video_id)
+    speaker_ids = current_speaker_ids | set(speaker_ids)
+    topic_ids = current_topic_ids | set(topic_ids)
+
+    # Correlated subqueries: one UPDATE per table whatever the number of speakers/topics
+    if speaker_ids:
+        speakers = Speaker.__table__
+        await db.execute(
+            update(speakers).where(speakers.c.id.in_(speaker_ids)).values(
+                total_segments=select(func.count(_SEGMENT_TABLE.c.id))
+                .where(_SEGMENT_TABLE.c.speaker_id == speakers.c.id).scalar_subquery(),
+                total_words=select(func.coalesce(func.sum(_SEGMENT_TABLE.c.word_count), 0))
+                .where(_SEGMENT_TABLE.c.speaker_id == speakers.c.id).scalar_subquery(),
+                avg_sentiment=select(func.avg(_SEGMENT_TABLE.c.sentiment_loughran_score))
+                .where(_SEGMENT_TABLE.c.speaker_id == speakers.c.id).scalar_subquery(),
+            )
+        )
+    if topic_ids:
+        topics = Topic.__table__
+        await db.execute(
+            update(topics).where(topics.c.id.in_(topic_ids)).values(
+                total_segments=select(func.count(_SEGMENT_TOPIC_TABLE.c.id))
+                .where(_SEGMENT_TOPIC_TABLE.c.topic_id == topics.c.id).scalar_subquery(),
+                avg_score=select(func.avg(_SEGMENT_TOPIC_TABLE.c.score))
+                .where(_SEGMENT_TOPIC_TABLE.c.topic_id == topics.c.id).scalar_subquery(),
+            )
+        )
+
+
+def normalize_speaker_name(name: str) -> str:
+    return name.lower().replace(" ", "_")
+
+
+async def _speaker_ids(db: AsyncSession, normalized_names: List[str]) -> Dict[str, int]:
+    """Existing speaker ids by normalized name (the oldest speaker wins on duplicates)"""
+    result = await db.execute(
+        select(Speaker.normalized_name, func.min(Speaker.id))
+        .where(Speaker.normalized_name.in_(normalized_names))
+        .group_by(Speaker.normalized_name)
+    )
+    return dict(result.all())
+
+
+async def resolve_speakers(db: AsyncSession, names: Iterable[Optional[str]]) -> Dict[str, int]:
+    """
+    Speaker ids for a batch of speaker names, creating the missing speakers
+
+    Names are matched on their normalized form, like the per-name lookups of the
+    importers. New speakers are added with one INSERT ... ON CONFLICT DO NOTHING
+    RETURNING, so a speaker created concurrently by another import is picked up
+    instead of failing on the unique name.
+
+    Returns:
+        Dictionary of stripped speaker name -> speaker id (blank names are left out)
+    """
+    names_by_norm: Dict[str, List[str]] = {}
+    for name in names:
+        name = (name or "").strip()
+        if name:
+            group = names_by_norm.setdefault(normalize_speaker_name(name), [])
+            if name not in group:
+                group.append(name)
+    if not names_by_norm:
+        return {}
+
+    ids = await _speaker_ids(db, list(names_by_norm))
+    missing = [norm for norm in names_by_norm if norm not in ids]
+    if missing:
+        insert_stmt = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        result = await db.execute(
+            insert_stmt(Speaker)
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(Speaker.normalized_name, Speaker.id),
+            [{"name": names_by_norm[norm][0], "normalized_name": norm} for norm in missing],
+        )
+        ids.update(result.all())
+        # Lost a race to another import: read the winner's row
+        still_missing = [norm for norm in missing if norm not in ids]
+        if still_missing:
+            ids.update(await _speaker_ids(db, still_missing))
+
+    return {name: ids[norm] for norm, group in names_by_norm.items() if norm in ids for name in group}
+
+
+async def resolve_topics(db: AsyncSession, names: Iterable[str], categorize: Callable[[str], str]) -> Dict[str, int]:
+    """
+    Topic ids for a batch of topic names, creating the missing topics
+
+    Args:
+        db: Database session (not committed)
+        names: Topic names (stripped; blank names are left out)
+        categorize: Category for a new topic, from its name
+
+    Returns:
+        Dictionary of topic name -> topic id
+    """
+    names = list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+    if not names:
+        return {}
+
+    ids = dict((await db.execute(select(Topic.name, Topic.id).where(Topic.name.in_(names)))).all())
+    missing = [name for name in names if name not in ids]
+    if missing:
+        insert_stmt = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        result = await db.execute(
+            insert_stmt(Topic).on_conflict_do_nothing(index_elements=["name"]).returning(Topic.name, Topic.id),
+            [{"name": name, "category": categorize(name)} for name in missing],
+        )
+        ids.update(result.all())
+        still_missing = [name for name in missing if name not in ids]
+        if still_missing:
+            ids.update((await db.execute(select(Topic.name, Topic.id).where(Topic.name.in_(still_missing)))).all())
+    return ids
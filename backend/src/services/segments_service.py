@@ -1,11 +1,128 @@
 """
 Service functions for transcript segments operations
 """
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
 from typing import Optional, Tuple, List
 from ..models import TranscriptSegment, Video
+from .pagination import apply_keyset, split_keyset_page
+from .count_service import count_service
+
+
+# Scalar segment columns included in bulk exports (text, timing, sentiment,
+# moderation, readability, stresslens and emotion analytics)
+EXPORT_COLUMNS = [
+    TranscriptSegment.id,
+    TranscriptSegment.segment_id,
+    TranscriptSegment.video_id,
+    TranscriptSegment.speaker_id,
+    TranscriptSegment.speaker_name,
+    TranscriptSegment.speaker_party,
+    TranscriptSegment.segment_type,
+    TranscriptSegment.transcript_text,
+    TranscriptSegment.video_seconds,
+    TranscriptSegment.timestamp_start,
+    TranscriptSegment.timestamp_end,
+    TranscriptSegment.duration_seconds,
+    TranscriptSegment.word_count,
+    TranscriptSegment.char_count,
+    TranscriptSegment.sentiment_loughran_score,
+    TranscriptSegment.sentiment_loughran_label,
+    TranscriptSegment.sentiment_harvard_score,
+    TranscriptSegment.sentiment_harvard_label,
+    TranscriptSegment.sentiment_vader_score,
+    TranscriptSegment.sentiment_vader_label,
+    TranscriptSegment.sentiment_label,
+    TranscriptSegment.sentiment_vneg_prob,
+    TranscriptSegment.sentiment_neg_prob,
+    TranscriptSegment.sentiment_neu_prob,
+    TranscriptSegment.sentiment_pos_prob,
+    TranscriptSegment.sentiment_vpos_prob,
+    TranscriptSegment.moderation_harassment,
+    TranscriptSegment.moderation_hate,
+    TranscriptSegment.moderation_self_harm,
+    TranscriptSegment.moderation_sexual,
+    TranscriptSegment.moderation_violence,
+    TranscriptSegment.moderation_overall_score,
+    TranscriptSegment.moderation_harassment_flag,
+    TranscriptSegment.moderation_hate_flag,
+    TranscriptSegment.moderation_violence_flag,
+    TranscriptSegment.moderation_sexual_flag,
+    TranscriptSegment.moderation_selfharm_flag,
+    TranscriptSegment.flesch_kincaid_grade,
+    TranscriptSegment.gunning_fog_index,
+    TranscriptSegment.coleman_liau_index,
+    TranscriptSegment.automated_readability_index,
+    TranscriptSegment.smog_index,
+    TranscriptSegment.flesch_reading_ease,
+    TranscriptSegment.stresslens_score,
+    TranscriptSegment.stresslens_rank,
+    TranscriptSegment.emotion_label,
+    TranscriptSegment.emotion_intensity,
+    TranscriptSegment.heat_score,
+    TranscriptSegment.created_at,
+]
+
+
+def _filter_segments(
+    stmt: Select,
+    speaker: Optional[str] = None,
+    video_id: Optional[int] = None,
+    dataset: Optional[str] = None,
+    q: Optional[str] = None,
+    processed: Optional[bool] = None,
+) -> Select:
+    """Apply the segment listing filters to a statement selecting from transcript_segments"""
+    if speaker:
+        stmt = stmt.where(TranscriptSegment.speaker_name.ilike(f"%{speaker}%"))
+    
+    if video_id:
+        stmt = stmt.where(TranscriptSegment.video_id == video_id)
+    
+    if dataset:
+        # Join with Video table to filter by dataset
+        stmt = stmt.join(Video, Video.id == TranscriptSegment.video_id).where(Video.dataset == dataset)
+    
+    if q:
+        # Simple ILIKE search in transcript text
+        stmt = stmt.where(TranscriptSegment.transcript_text.ilike(f"%{q}%"))
+    
+    if processed is not None:
+        if processed:
+            # Show only processed segments (sentiment_label is not NULL)
+            stmt = stmt.where(TranscriptSegment.sentiment_label.isnot(None))
+        else:
+            # Show only unprocessed segments (sentiment_label IS NULL)
+            stmt = stmt.where(TranscriptSegment.sentiment_label.is_(None))
+    
+    return stmt
+
+
+def build_segments_export_query(
+    speaker: Optional[str] = None,
+    video_id: Optional[int] = None,
+    dataset: Optional[str] = None,
+    q: Optional[str] = None,
+    processed: Optional[bool] = None,
+    limit: Optional[int] = None,
+) -> Select:
+    """
+    Column-only export query over transcript segments, ordered by id
+
+    Uses the same filters as fetch_segments_page; the video's dataset is added
+    as a column.
+    """
+    stmt = select(*EXPORT_COLUMNS).select_from(TranscriptSegment)
+    stmt = _filter_segments(stmt, speaker, video_id, None, q, processed)
+    stmt = stmt.add_columns(Video.dataset).outerjoin(Video, Video.id == TranscriptSegment.video_id)
+    if dataset:
+        stmt = stmt.where(Video.dataset == dataset)
+    stmt = stmt.order_by(TranscriptSegment.id)
+    if limit:
+        stmt = stmt.limit(limit)
+    return stmt
 
 
 async def fetch_segments_page(
@@ -17,7 +134,9 @@ async def fetch_segments_page(
     dataset: Optional[str] = None,
     q: Optional[str] = None,
     processed: Optional[bool] = None,
-) -> Tuple[List[TranscriptSegment], int]:
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
+) -> Tuple[List[TranscriptSegment], Optional[int], bool, Optional[str]]:
     """
     Fetch paginated transcript segments with optional filters
     
@@ -30,49 +149,31 @@ async def fetch_segments_page(
         dataset: Filter by dataset (requires join with videos table)
         q: Text search query (partial match in transcript_text)
         processed: Filter by 5-class sentiment processing status (None=all, True=processed, False=unprocessed)
+        cursor: Opaque keyset cursor from a previous page (overrides page)
+        count_mode: "exact", "estimate" (approximate for large results) or "none" to skip counting
     
     Returns:
-        Tuple of (segments list, total count)
+        Tuple of (segments list, total count or None, whether total is exact, next page cursor or None)
+
+    Raises:
+        InvalidCursorError: if the cursor is malformed
     """
     # Base query with eager loading of video relationship
     stmt = select(TranscriptSegment).options(selectinload(TranscriptSegment.video))
-    
-    # Apply filters
-    if speaker:
-        stmt = stmt.where(TranscriptSegment.speaker_name.ilike(f"%{speaker}%"))
-    
-    if video_id:
-        stmt = stmt.where(TranscriptSegment.video_id == video_id)
-    
-    if dataset:
-        # Join with Video table to filter by dataset
-        stmt = stmt.join(TranscriptSegment.video).where(Video.dataset == dataset)
-    
-    if q:
-        # Simple ILIKE search in transcript text
-        stmt = stmt.where(TranscriptSegment.transcript_text.ilike(f"%{q}%"))
-    
-    if processed is not None:
-        if processed:
-            # Show only processed segments (sentiment_label is not NULL)
-            stmt = stmt.where(TranscriptSegment.sentiment_label.isnot(None))
-        else:
-            # Show only unprocessed segments (sentiment_label IS NULL)
-            stmt = stmt.where(TranscriptSegment.sentiment_label.is_(None))
+    stmt = _filter_segments(stmt, speaker, video_id, dataset, q, processed)
     
     # Count total results
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = (await db.execute(count_stmt)).scalar_one()
+    total, total_exact = await count_service.count(db, stmt, count_mode)
     
     # Apply pagination and ordering
-    offset = (page - 1) * page_size
-    stmt = stmt.order_by(TranscriptSegment.id).offset(offset).limit(page_size)
+    sort_keys = [(TranscriptSegment.id, False)]
+    stmt = apply_keyset(stmt, sort_keys, page_size, cursor=cursor, offset=(page - 1) * page_size)
     
     # Execute query and return results
     result = await db.execute(stmt)
-    segments = result.scalars().all()
+    segments, next_cursor = split_keyset_page(result.all(), stmt, page_size)
     
-    return segments, total
+    return segments, total, total_exact, next_cursor
 
 
 async def get_segment_by_id(db: AsyncSession, segment_id: int) -> Optional[TranscriptSegment]:
@@ -2,8 +2,9 @@
 Transcript summarization service using OpenAI
 """
 import os
+import importlib.util
 import logging
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 from datetime import datetime
 import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,13 +14,11 @@ from sqlalchemy.orm import selectinload
 from ..models import Video, TranscriptSegment, VideoSummary, SummaryPreset
 from ..config import settings
 
-# Try to import OpenAI, fallback if not available
-try:
+# The OpenAI client is imported when the first client is created
+HAS_OPENAI = importlib.util.find_spec("openai") is not None
+
+if TYPE_CHECKING:
     from openai import AsyncOpenAI
-    HAS_OPENAI = True
-except ImportError:
-    AsyncOpenAI = None
-    HAS_OPENAI = False
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +31,7 @@ class SummarizationService:
         self.max_tokens_per_summary = 500
         self.max_input_tokens = 120000  # Leave room for prompt overhead
         
-    def _get_client(self, api_key: Optional[str] = None, provider: Optional[str] = None) -> AsyncOpenAI:
+    def _get_client(self, api_key: Optional[str] = None, provider: Optional[str] = None) -> "AsyncOpenAI":
         """Get or create OpenAI client"""
         if not HAS_OPENAI:
             raise RuntimeError("OpenAI package not available. Please install it to use summarization features.")
@@ -52,6 +51,7 @@ class SummarizationService:
         
         # Create new client with the provided parameters
         logger.info(f"Creating client with provider: {provider}, has_key: {bool(effective_api_key)}")
+        from openai import AsyncOpenAI
         return AsyncOpenAI(api_key=effective_api_key, base_url=base_url)
     
     async def summarize_video_transcript(
@@ -12,59 +12,46 @@ import os
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
-import aiofiles
 from aiomultiprocess import Pool as AioPool
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from ..config import settings
 from ..database import Base
-from ..models import SegmentTopic, Speaker, Topic, TranscriptSegment, Video
-from ..parsers.vlos_parser import VLOSXMLParser
+from ..models import SegmentTopic, Topic, Video
+from ..parsers.vlos_parser import PARSER_VERSION, VLOSXMLParser
+from .import_manifest import FileReader, ImportManifest
 from .import_progress_tracker import ImportProgressTracker
+from .import_resolver import ImportResolver
+from .segment_writer import (
+    delete_video_segments,
+    insert_segments,
+    lock_video,
+    refresh_replaced_stats,
+    refresh_video_stats,
+    segment_row,
+)
 
 logger = logging.getLogger(__name__)
 
 
 # Standalone function for multiprocessing (must be at module level)
 async def parse_xml_file_async(file_path: str) -> Dict[str, Any]:
-    """Parse a single XML file asynchronously using aiofiles and return structured data."""
+    """Parse a single XML file and fingerprint the bytes that were parsed."""
     try:
-        # Use async file I/O for reading
-        async with aiofiles.open(file_path, 'rb') as f:
-            raw = await f.read()
-        
         # Parse using optimized approach
-        from ..parsers.vlos_parser import VLOSXMLParser
-        parser = VLOSXMLParser()
+        from ..parsers.vlos_parser import STREAM_CHUNK_SIZE, VLOSXMLParser
+        parser = VLOSXMLParser(streaming=settings.VLOS_STREAMING_PARSE)
+        reader = FileReader(file_path)
         
-        # Use the new parse_content method if available, fallback to file-based parsing
-        if hasattr(parser, 'parse_content'):
-            result = parser.parse_content(raw, file_path)
+        if parser.streaming:
+            # Reads the file in chunks; the document is never held in memory as a whole
+            result = parser.parse_chunks(lambda: reader.chunks(STREAM_CHUNK_SIZE), file_path)
         else:
-            # Convert bytes to string for parser
-            try:
-                text = raw.decode("utf-8")
-            except Exception:
-                text = raw.decode("latin-1")
-                
-            # Create temporary file for parser (it expects file path)
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.xml', delete=False) as tmp:
-                tmp.write(text)
-                temp_path = tmp.name
-            
-            try:
-                result = parser.parse_file(temp_path)
-            finally:
-                # Clean up temp file
-                try:
-                    os.unlink(temp_path)
-                except Exception:
-                    pass
+            result = parser.parse_content(reader.read(), file_path)
         
         result['original_file_path'] = file_path
-        return {"success": True, "data": result, "file_path": file_path}
+        return {"success": True, "data": result, "file_path": file_path, "fingerprint": reader.fingerprint}
                 
     except Exception as e:
         return {"success": False, "error": str(e), "file_path": file_path}
@@ -72,7 +59,7 @@ async def parse_xml_file_async(file_path: str) -> Dict[str, Any]:
 
 class VLOSImportService:
     def __init__(self, max_concurrent_files: int = 8) -> None:  # Increased from 2 to 8
-        self.parser = VLOSXMLParser()
+        self.parser = VLOSXMLParser(streaming=settings.VLOS_STREAMING_PARSE)
         self.max_concurrent_files = max_concurrent_files
         self.semaphore = asyncio.Semaphore(max_concurrent_files)
         self.chunk_size = 100  # Increased from 50 to 100
@@ -103,17 +90,35 @@ class VLOSImportService:
         failed = 0
         errors: List[str] = []
         
-        logger.info(f"Starting VLOS XML import: {total} files found in {xml_dir}")
+        # Only files that are new, or changed since the manifest recorded them, are parsed
+        manifest = ImportManifest(self.SessionLocal, "vlos", PARSER_VERSION)
+        await manifest.load()
+        new_files, changed_files = await manifest.plan(xml_files)
+        if force_reimport:
+            new_files, changed_files = [], [str(f) for f in xml_files]
+        reimport = set(changed_files)
+        import_files = new_files + changed_files
+        skipped = total - len(import_files)
+        await manifest.flush()
+        
+        logger.info(
+            f"Starting VLOS XML import: {total} files found in {xml_dir}, "
+            f"{len(import_files)} new or changed, {skipped} unchanged"
+        )
         
         # Initialize progress tracker
         async with self.SessionLocal() as tracker_session:
             progress_tracker = ImportProgressTracker(tracker_session)
-            job_id = await progress_tracker.start_job("vlos_xml_import", total)
+            job_id = await progress_tracker.start_job("vlos_xml_import", len(import_files))
+        
+        # Speakers are loaded once and shared by all files of the run
+        resolver = ImportResolver(self.SessionLocal)
+        await resolver.preload()
         
         # Use aiomultiprocess for high-performance XML parsing
         async with AioPool(processes=self.process_pool_size, childconcurrency=2) as process_pool:
             # Process files in chunks using multiprocessing
-            for chunk_start in range(0, total, self.chunk_size):
+            for chunk_start in range(0, len(import_files), self.chunk_size):
                 # Check for cancellation before each chunk
                 async with self.SessionLocal() as check_session:
                     check_status = await ImportProgressTracker.get_latest_job_status(check_session)
@@ -124,17 +129,18 @@ class VLOSImportService:
                             "total_files": total,
                             "total_processed": processed,
                             "total_failed": failed,
+                            "total_skipped": skipped,
                             "errors": errors + ["Import was cancelled by user"],
                         }
                 
-                chunk_end = min(chunk_start + self.chunk_size, total)
-                chunk_files = xml_files[chunk_start:chunk_end]
+                chunk_end = min(chunk_start + self.chunk_size, len(import_files))
+                chunk_files = import_files[chunk_start:chunk_end]
                 
-                logger.info(f"Processing chunk {chunk_start//self.chunk_size + 1}/{(total + self.chunk_size - 1)//self.chunk_size}: files {chunk_start+1}-{chunk_end} using {self.process_pool_size} processes")
+                logger.info(f"Processing chunk {chunk_start//self.chunk_size + 1}/{(len(import_files) + self.chunk_size - 1)//self.chunk_size}: files {chunk_start+1}-{chunk_end} using {self.process_pool_size} processes")
                 
                 # Parse files using multiprocessing pool
                 parse_results = []
-                async for parse_result in process_pool.map(parse_xml_file_async, [str(f) for f in chunk_files]):
+                async for parse_result in process_pool.map(parse_xml_file_async, chunk_files):
                     parse_results.append(parse_result)
                 
                 # Now process parsed data and save to database
@@ -150,9 +156,13 @@ class VLOSImportService:
                     
                     # Save parsed data to database
                     try:
-                        import_result = await self._save_parsed_data_to_db(parse_result["data"], force_reimport)
+                        # Changed files replace the video they were imported into
+                        import_result = await self._save_parsed_data_to_db(
+                            parse_result["data"], file_path in reimport, resolver
+                        )
                         if import_result.get("success"):
                             processed += 1
+                            await manifest.record(file_path, import_result["video_id"], parse_result["fingerprint"])
                             if processed % 20 == 0:  # Log every 20 successful imports
                                 logger.info(f"Progress: {processed}/{total} files processed successfully")
                         else:
@@ -166,6 +176,8 @@ class VLOSImportService:
                         errors.append(error_msg)
                         logger.exception(f"Database save exception for {file_path}")
                 
+                await manifest.flush()
+                
                 # Update progress tracker after each chunk
                 async with self.SessionLocal() as tracker_session:
                     tracker = ImportProgressTracker(tracker_session)
@@ -179,7 +191,7 @@ class VLOSImportService:
                     
                 # Update progress callback if provided
                 if progress_callback:
-                    progress_callback(processed + failed, total, "", errors)
+                    progress_callback(skipped + processed + failed, total, "", errors)
 
         # Mark job as completed in progress tracker
         try:
@@ -194,22 +206,30 @@ class VLOSImportService:
         if progress_callback:
             progress_callback(total, total, "", errors)
 
-        logger.info(f"VLOS XML import completed: {processed} successful, {failed} failed out of {total} total files")
+        logger.info(
+            f"VLOS XML import completed: {processed} successful, {failed} failed, {skipped} unchanged "
+            f"out of {total} total files"
+        )
         
         return {
             "job_id": job_id,
             "total_files": total,
             "total_processed": processed,
             "total_failed": failed,
+            "total_skipped": skipped,
             "errors": errors,
         }
 
-    async def _import_xml_file_with_semaphore(self, file_path: str, force_reimport: bool = False) -> Dict[str, Any]:
+    async def _import_xml_file_with_semaphore(
+        self, file_path: str, force_reimport: bool = False, resolver: Optional[ImportResolver] = None
+    ) -> Dict[str, Any]:
         """Import a single XML file with semaphore-based concurrency control"""
         async with self.semaphore:
-            return await self.import_xml_file(file_path, force_reimport)
+            return await self.import_xml_file(file_path, force_reimport, resolver)
 
-    async def import_xml_file(self, file_path: str, force_reimport: bool = False) -> Dict[str, Any]:
+    async def import_xml_file(
+        self, file_path: str, force_reimport: bool = False, resolver: Optional[ImportResolver] = None
+    ) -> Dict[str, Any]:
         try:
             filename = Path(file_path).name
             parsed = self.parser.parse_file(file_path)
@@ -220,54 +240,64 @@ class VLOSImportService:
                 existing_q = select(Video).where(Video.filename == filename)
                 res = await db.execute(existing_q)
                 existing = res.scalar_one_or_none()
-                if existing and not force_reimport:
-                    return {"success": True, "message": "Video already exists, skipping", "video_id": existing.id}
-                if existing and force_reimport:
-                    # Delete existing segments
-                    await db.execute(select(TranscriptSegment).where(TranscriptSegment.video_id == existing.id))
-                    await db.commit()
-                    video = existing
-                else:
-                    vm = {**parsed["video_metadata"], "dataset": "tweede_kamer", "source_type": "xml"}
-                    video = Video(**vm)
-                    db.add(video)
-                    await db.commit()
-                    await db.refresh(video)
-
-                await self._process_segments(db, video, parsed["segments"])
-                await db.commit()
-                return {"success": True, "video_id": video.id, "segments_imported": len(parsed["segments"]) }
+            if existing and not force_reimport:
+                return {"success": True, "message": "Video already exists, skipping", "video_id": existing.id}
+            video_id = await self._write_session(
+                parsed, existing.id if existing else None, resolver or ImportResolver(self.SessionLocal)
+            )
+            return {"success": True, "video_id": video_id, "segments_imported": len(parsed["segments"]) }
         except Exception as e:
             logger.exception("VLOS XML import failed")
             return {"success": False, "error": str(e)}
 
-    async def _process_segments(self, db: AsyncSession, video: Video, segments: List[Dict[str, Any]]) -> None:
-        speaker_cache: Dict[str, Speaker] = {}
-        for seg in segments:
-            speaker = await self._get_or_create_speaker(db, seg.get("speaker_name") or "", speaker_cache)
-            payload = {k: v for k, v in seg.items() if k in TranscriptSegment.__table__.columns.keys()}
-            ts = TranscriptSegment(video_id=video.id, speaker_id=speaker.id if speaker else None, **payload)
-            db.add(ts)
-            # No topics for now; can be extended when present in XML
-            await db.flush()
-
-    async def _get_or_create_speaker(self, db: AsyncSession, speaker_name: str, cache: Dict[str, Speaker]) -> Optional[Speaker]:
-        speaker_name = (speaker_name or "").strip()
-        if not speaker_name:
-            return None
-        norm = speaker_name.lower().replace(" ", "_")
-        if norm in cache:
-            return cache[norm]
-        res = await db.execute(select(Speaker).where(Speaker.normalized_name == norm))
-        sp = res.scalar_one_or_none()
-        if not sp:
-            sp = Speaker(name=speaker_name, normalized_name=norm)
-            db.add(sp)
-            await db.flush()
-        cache[norm] = sp
-        return sp
+    async def _process_segments(
+        self, db: AsyncSession, video: Video, segments: List[Dict[str, Any]], speaker_ids: Dict[str, int]
+    ) -> None:
+        """Write all segments of a session with one bulk insert"""
+        rows = [
+            segment_row(video.id, speaker_ids.get((seg.get("speaker_name") or "").strip()), seg)
+            for seg in segments
+        ]
+        # No topics for now (so no ids needed); can be extended when present in XML
+        await insert_segments(db, rows, return_ids=False)
     
-    async def _save_parsed_data_to_db(self, parsed_data: Dict[str, Any], force_reimport: bool = False) -> Dict[str, Any]:
+    async def _write_session(
+        self, parsed: Dict[str, Any], existing_id: Optional[int], resolver: ImportResolver
+    ) -> int:
+        """
+        Write a parsed session and its segments in one transaction
+        
+        An existing video is locked, updated and has its segments, topic links and
+        stats replaced before the commit, so readers never see a partial session.
+        
+        Returns:
+            The video id
+        """
+        vm = {**parsed["video_metadata"], "dataset": "tweede_kamer", "source_type": "xml"}
+        # New speakers are created in one upsert by the resolver, before the transaction starts
+        speaker_ids = await resolver.speaker_ids(seg.get("speaker_name") for seg in parsed["segments"])
+        
+        async with self.SessionLocal() as db:
+            if existing_id is not None:
+                video = await lock_video(db, existing_id)
+                for key, value in vm.items():
+                    setattr(video, key, value)
+                old_speaker_ids, old_topic_ids = await delete_video_segments(db, video.id)
+            else:
+                video = Video(**vm)
+                db.add(video)
+                await db.flush()
+            
+            await self._process_segments(db, video, parsed["segments"], speaker_ids)
+            await refresh_video_stats(db, video.id)
+            if existing_id is not None:
+                await refresh_replaced_stats(db, video.id, old_speaker_ids, old_topic_ids)
+            await db.commit()
+            return video.id
+    
+    async def _save_parsed_data_to_db(
+        self, parsed_data: Dict[str, Any], force_reimport: bool = False, resolver: Optional[ImportResolver] = None
+    ) -> Dict[str, Any]:
         """Save parsed XML data to database efficiently."""
         try:
             filename = Path(parsed_data["video_metadata"]["filename"]).name
@@ -277,29 +307,17 @@ class VLOSImportService:
                 existing_q = select(Video).where(Video.filename == filename)
                 res = await db.execute(existing_q)
                 existing = res.scalar_one_or_none()
-                
-                if existing and not force_reimport:
-                    return {"success": True, "message": "Video already exists, skipping", "video_id": existing.id}
-                
-                if existing and force_reimport:
-                    # Delete existing segments
-                    await db.execute(select(TranscriptSegment).where(TranscriptSegment.video_id == existing.id))
-                    await db.commit()
-                    video = existing
-                else:
-                    # Create new video
-                    vm = {**parsed_data["video_metadata"], "dataset": "tweede_kamer", "source_type": "xml"}
-                    video = Video(**vm)
-                    db.add(video)
-                    await db.commit()
-                    await db.refresh(video)
-
-                # Save segments
-                await self._process_segments(db, video, parsed_data["segments"])
-                await db.commit()
-                
-                return {"success": True, "video_id": video.id, "segments_imported": len(parsed_data["segments"])}
-                
+            
+            if existing and not force_reimport:
+                return {"success": True, "message": "Video already exists, skipping", "video_id": existing.id}
+            
+            # Save video and segments (replacing the existing ones on re-import)
+            video_id = await self._write_session(
+                parsed_data, existing.id if existing else None, resolver or ImportResolver(self.SessionLocal)
+            )
+            
+            return {"success": True, "video_id": video_id, "segments_imported": len(parsed_data["segments"])}
+            
         except Exception as e:
             logger.exception("Failed to save parsed data to database")
             return {"success": False, "error": str(e)}
@@ -8,29 +8,20 @@ import tempfile
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import asyncio
+import importlib.util
 import re
 
-HAS_YTDLP = False
-HAS_MOVIEPY = False
-HAS_OPENAI = False
+# Availability only; yt-dlp, MoviePy and the OpenAI client are imported on first use
+HAS_YTDLP = importlib.util.find_spec("yt_dlp") is not None
+HAS_MOVIEPY = importlib.util.find_spec("moviepy") is not None
+HAS_OPENAI = importlib.util.find_spec("openai") is not None
 
-try:
-    import yt_dlp  # type: ignore
-    HAS_YTDLP = True
-except Exception as e:
-    logging.warning(f"Missing yt-dlp for YouTube service: {e}")
-
-try:
-    from moviepy.editor import VideoFileClip  # type: ignore
-    HAS_MOVIEPY = True
-except Exception as e:
-    logging.warning(f"MoviePy not available; will skip audio conversion to WAV: {e}")
-
-try:
-    from openai import OpenAI  # type: ignore
-    HAS_OPENAI = True
-except Exception as e:
-    logging.warning(f"OpenAI client not available: {e}")
+if not HAS_YTDLP:
+    logging.warning("Missing yt-dlp for YouTube service")
+if not HAS_MOVIEPY:
+    logging.warning("MoviePy not available; will skip audio conversion to WAV")
+if not HAS_OPENAI:
+    logging.warning("OpenAI client not available")
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -49,6 +40,7 @@ class YouTubeService:
     def set_openai_api_key(self, api_key: str):
         """Set OpenAI API key for transcription"""
         if api_key:
+            from openai import OpenAI  # type: ignore
             self.openai_client = OpenAI(api_key=api_key)
             
     def extract_video_id(self, url: str) -> Optional[str]:
@@ -95,6 +87,7 @@ class YouTubeService:
             ydl_opts['cookiefile'] = settings.YTDLP_COOKIES_FILE
         
         try:
+            import yt_dlp  # type: ignore
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
                 
@@ -164,6 +157,7 @@ class YouTubeService:
             ydl_opts['cookiefile'] = settings.YTDLP_COOKIES_FILE
         
         try:
+            import yt_dlp  # type: ignore
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
                 
@@ -180,6 +174,7 @@ class YouTubeService:
             # If MoviePy is available and file is not WAV and you prefer WAV, convert; otherwise skip
             if HAS_MOVIEPY and not audio_file.endswith('.wav'):
                 try:
+                    from moviepy.editor import VideoFileClip  # type: ignore
                     wav_file = os.path.splitext(audio_file)[0] + '.wav'
                     with VideoFileClip(audio_file) as video:
                         video.audio.write_audiofile(wav_file, verbose=False, logger=None)
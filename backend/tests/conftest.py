@@ -0,0 +1,53 @@
+"""
+Shared fixtures for service-level tests against a throwaway SQLite database
+"""
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+# Set test environment before imports
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+
+@pytest.fixture
+def db_sessions(tmp_path: Path):
+    """
+    Async session factory on a fresh SQLite file with all tables created
+
+    Connections are not pooled, so the factory can be used from several
+    asyncio.run() calls in one test.
+    """
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from backend.src import models  # noqa: F401  (registers the tables)
+    from backend.src.database import Base
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", poolclass=NullPool)
+
+    async def _create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(_create_tables())
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def api_client(db_sessions):
+    """Test client for the API with every request's session on the db_sessions database"""
+    from fastapi.testclient import TestClient
+
+    from backend.src.database import get_db
+    from backend.src.main import app
+
+    async def _get_db():
+        async with db_sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _get_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
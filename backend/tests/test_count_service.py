@@ -0,0 +1,138 @@
+"""
+Tests for result counting (count_mode=exact|estimate|none)
+"""
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from backend.src import database
+from backend.src.models import TranscriptSegment, Video
+from backend.src.services.count_service import CountService
+
+STMT = select(TranscriptSegment.id).where(TranscriptSegment.speaker_name == "Speaker")
+
+
+@pytest.fixture
+def service(monkeypatch, db_sessions):
+    # Background counts open their own session
+    monkeypatch.setattr(database, "AsyncSessionLocal", db_sessions)
+    service = CountService()
+    service.estimate_cap = 3
+    return service
+
+
+async def _add_segments(db_sessions, count: int):
+    async with db_sessions() as db:
+        video = (await db.execute(select(Video))).scalar_one_or_none()
+        if video is None:
+            video = Video(title="Rally", filename="rally.html", date=date(2025, 8, 13))
+            db.add(video)
+            await db.flush()
+        existing = len((await db.execute(select(TranscriptSegment.id))).all())
+        db.add_all([
+            TranscriptSegment(
+                segment_id=f"seg_{existing + i}", video_id=video.id, speaker_name="Speaker", transcript_text="text"
+            )
+            for i in range(count)
+        ])
+        await db.commit()
+
+
+def test_exact_mode_always_counts(service, db_sessions):
+    async def _run():
+        await _add_segments(db_sessions, 5)
+        async with db_sessions() as db:
+            first = await service.count(db, STMT, "exact")
+        await _add_segments(db_sessions, 2)
+        async with db_sessions() as db:
+            second = await service.count(db, STMT, "exact")
+            estimated = await service.count(db, STMT, "estimate")
+        return first, second, estimated
+
+    first, second, estimated = asyncio.run(_run())
+
+    assert first == (5, True)
+    assert second == (7, True)
+    # The exact count is reused by estimates of the same filters, flagged as approximate
+    assert estimated == (7, False)
+
+
+def test_estimate_mode(service, db_sessions):
+    async def _run():
+        await _add_segments(db_sessions, 2)
+        async with db_sessions() as db:
+            small = await service.count(db, STMT, "estimate")
+        await _add_segments(db_sessions, 4)
+        async with db_sessions() as db:
+            # No planner estimate on SQLite: the capped count is the lower bound
+            large = await service.count(db, STMT, "estimate")
+            await asyncio.gather(*service._tasks)
+            cached = await service.count(db, STMT, "estimate")
+            none = await service.count(db, STMT, "none")
+        return small, large, cached, none
+
+    small, large, cached, none = asyncio.run(_run())
+
+    assert small == (2, True)
+    assert large == (4, False)
+    assert cached == (6, False)
+    assert none == (None, False)
+
+
+@pytest.mark.parametrize(
+    "count_mode, total, total_estimated",
+    # Above the cap of 3, SQLite has no planner estimate: the capped count is returned
+    [("exact", 5, False), ("estimate", 4, True), ("none", None, None)],
+)
+def test_summary_search_count_modes(api_client, service, db_sessions, monkeypatch, count_mode, total, total_estimated):
+    from datetime import datetime
+
+    from backend.src.models import VideoSummary
+    from backend.src.services import count_service as count_service_module
+
+    monkeypatch.setattr(count_service_module, "count_service", service)
+
+    async def _seed():
+        async with db_sessions() as db:
+            video = Video(title="Rally", filename="rally.html", date=date(2025, 8, 13))
+            db.add(video)
+            await db.flush()
+            db.add_all([
+                VideoSummary(
+                    video_id=video.id, summary_text=f"Summary {i}", bullet_points=3, provider="openai",
+                    model="gpt", generated_at=datetime(2025, 8, 13, 12, i),
+                )
+                for i in range(5)
+            ])
+            await db.commit()
+
+    asyncio.run(_seed())
+
+    response = api_client.get("/api/summarization/search", params={"page_size": 2, "count_mode": count_mode})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["results"]) == 2
+    assert data["total"] == total
+    assert data["total_estimated"] is total_estimated
+    assert data["total_pages"] == (-(-total // 2) if total else None)
+
+
+def test_unknown_count_mode_is_rejected(api_client, service, db_sessions):
+    async def _run():
+        async with db_sessions() as db:
+            await service.count(db, STMT, "estimated")
+
+    with pytest.raises(ValueError):
+        asyncio.run(_run())
+
+    for path, params in [
+        ("/api/search-legacy/", {"q": "text", "search_type": "exact"}),
+        ("/api/segments/", {}),
+        ("/api/summarization/search", {}),
+        ("/api/videos/1/segments", {}),
+    ]:
+        response = api_client.get(path, params={**params, "count_mode": "estimated"})
+        assert response.status_code == 422, path
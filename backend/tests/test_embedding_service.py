@@ -0,0 +1,98 @@
+"""
+Tests for the embedding cache and the index-free semantic search
+"""
+import asyncio
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.src.config import settings
+from backend.src.models import TranscriptSegment, Video
+from backend.src.services.embedding_service import FALLBACK_MODEL_ID, EmbeddingService
+
+TEXTS = ["Make America great again.", "Make  America great again.", "Thank you."]
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = EmbeddingService()
+    monkeypatch.setattr(type(service), "has_model", property(lambda self: self._test_has_model))
+    service._test_has_model = False
+    return service
+
+
+def test_fallback_vectors_are_cached_under_their_own_model_id(service, db_sessions):
+    async def _run():
+        async with db_sessions() as db:
+            embeddings, hits = await service.embed_texts(db, TEXTS)
+            await db.commit()
+            assert hits == 1  # the whitespace variant shares its text's embedding
+            assert embeddings[0] == embeddings[1]
+
+            # Second pass is served from the cache
+            _, hits = await service.embed_texts(db, TEXTS)
+            assert hits == len(TEXTS)
+
+            # Once a model is installed, fallback entries are never served
+            service._test_has_model = True
+            encoded = []
+
+            def _encode(texts):
+                encoded.extend(texts)
+                return [[1.0] * service.embedding_dim for _ in texts]
+
+            embeddings, hits = await service.embed_texts(db, TEXTS, encode=_encode)
+            assert hits == 1
+            assert sorted(encoded) == ["Make America great again.", "Thank you."]
+            assert embeddings[2] == [1.0] * service.embedding_dim
+
+    assert service.model_id == FALLBACK_MODEL_ID
+    asyncio.run(_run())
+    assert service.model_id == "all-MiniLM-L6-v2"
+
+
+def test_semantic_search_without_pgvector_scans_in_chunks(monkeypatch, db_sessions):
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(23, 384)).astype(np.float32)
+    query = rng.normal(size=384).astype(np.float32)
+    service = EmbeddingService()
+    monkeypatch.setattr(service, "embed_query", lambda query_text: query.tolist())
+    monkeypatch.setattr(settings, "SEMANTIC_SEARCH_ENGINE", "pgvector")
+    monkeypatch.setattr(settings, "SEMANTIC_SCAN_CHUNK_SIZE", 4)
+
+    async def _run():
+        async with db_sessions() as db:
+            videos = [
+                Video(title="Rally", filename="rally.html", date=date(2025, 8, 13), dataset="trump"),
+                Video(title="Debat", filename="debat.xml", date=date(2025, 9, 1), dataset="tweede_kamer"),
+            ]
+            db.add_all(videos)
+            await db.flush()
+            db.add_all([
+                TranscriptSegment(
+                    segment_id=f"seg_{i}", video_id=videos[i % 2].id, speaker_name="Speaker",
+                    transcript_text=f"text {i}", embedding=vector,
+                )
+                for i, vector in enumerate(vectors)
+            ])
+            # Segments without embeddings are never candidates
+            db.add(TranscriptSegment(segment_id="seg_x", video_id=videos[0].id, speaker_name="Speaker", transcript_text="x"))
+            await db.commit()
+
+            everything = await service.semantic_search(db, "q", limit=5, similarity_threshold=-1.0)
+            trump = await service.semantic_search(db, "q", limit=50, similarity_threshold=0.0, filters={"dataset": "trump"})
+            all_datasets = await service.semantic_search(db, "q", limit=50, similarity_threshold=0.0, filters={"dataset": "all"})
+            return everything, trump, all_datasets
+
+    everything, trump, all_datasets = asyncio.run(_run())
+
+    similarities = vectors @ query / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+    expected = [f"seg_{i}" for i in np.argsort(-similarities)[:5]]
+    assert [result["segment_id"] for result in everything] == expected
+    assert [result["similarity_score"] for result in everything] == pytest.approx(sorted(similarities, reverse=True)[:5], abs=1e-5)
+
+    expected_trump = [f"seg_{i}" for i in np.argsort(-similarities) if i % 2 == 0 and similarities[i] >= 0]
+    assert [result["segment_id"] for result in trump] == expected_trump
+    assert all(result["video"].dataset == "trump" for result in trump)
+    assert len(all_datasets) == int((similarities >= 0).sum())
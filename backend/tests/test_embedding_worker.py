@@ -0,0 +1,235 @@
+"""
+Tests for the background embedding job
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from backend.src.config import settings
+from backend.src.models import EMBEDDING_DIM, EmbeddingCache, EmbeddingJob, TranscriptSegment, Video
+from backend.src.services import embedding_worker as worker_module
+from backend.src.services.embedding_service import embedding_service
+from backend.src.services.embedding_worker import EmbeddingJobRunning, EmbeddingWorker
+
+TEXTS = ["The economy is strong.", "Build the wall.", "The  economy is strong.", "Thank you.", "Build the wall."]
+CACHED_TEXT = "Thank you."
+
+
+def _vector(text: str) -> np.ndarray:
+    """Deterministic embedding per normalized text"""
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    vector[len(embedding_service._clean_text(text)) % EMBEDDING_DIM] = 1.0
+    return vector
+
+
+@pytest.fixture
+def encoded_batches(monkeypatch, db_sessions):
+    """Run the job on the test database with a thread pool and a stub encoder"""
+    batches = []
+
+    def _encode_batch(texts):
+        batches.append(list(texts))
+        return [_vector(text).tolist() for text in texts]
+
+    monkeypatch.setattr(worker_module, "AsyncSessionLocal", db_sessions)
+    monkeypatch.setattr(worker_module, "_encode_batch", _encode_batch)
+    monkeypatch.setattr(
+        worker_module, "ProcessPoolExecutor",
+        lambda max_workers, mp_context: ThreadPoolExecutor(max_workers=max_workers)
+    )
+    monkeypatch.setattr(settings, "EMBEDDING_JOB_POLL_SECONDS", 0.05)
+    monkeypatch.setattr(embedding_service, "backend", "torch")
+    monkeypatch.setattr(type(embedding_service), "has_model", property(lambda self: True))
+
+    async def _seed():
+        async with db_sessions() as db:
+            video = Video(title="Rally", filename="rally.html", date=date(2025, 8, 13), dataset="trump")
+            db.add(video)
+            await db.flush()
+            db.add_all([
+                TranscriptSegment(
+                    segment_id=f"seg_{i}", video_id=video.id, speaker_name="Speaker A", transcript_text=text
+                )
+                for i, text in enumerate(TEXTS)
+            ])
+            db.add(EmbeddingCache(
+                model_name=embedding_service.model_id,
+                text_hash=embedding_service.text_key(CACHED_TEXT),
+                embedding=_vector(CACHED_TEXT),
+            ))
+            await db.commit()
+
+    asyncio.run(_seed())
+    return batches
+
+
+@pytest.fixture
+def reader_gate(encoded_batches, monkeypatch):
+    """Hold the job's reader at its first cache lookup until the returned event is set"""
+    gate = asyncio.Event()
+    get_cached_embeddings = embedding_service.get_cached_embeddings
+
+    async def _get_cached_embeddings(db, keys):
+        await gate.wait()
+        return await get_cached_embeddings(db, keys)
+
+    monkeypatch.setattr(embedding_service, "get_cached_embeddings", _get_cached_embeddings)
+    return gate
+
+
+async def _embeddings(db_sessions):
+    async with db_sessions() as db:
+        result = await db.execute(
+            select(TranscriptSegment.transcript_text, TranscriptSegment.embedding, TranscriptSegment.embedding_generated_at)
+            .order_by(TranscriptSegment.id)
+        )
+        return result.all()
+
+
+def test_job_encodes_distinct_uncached_texts_and_fans_out(encoded_batches, db_sessions):
+    async def _run():
+        worker = EmbeddingWorker()
+        started = await worker.start()
+        assert started["status"] == "running"
+        assert started["total"] == len(TEXTS)
+        return await worker.wait()
+
+    status = asyncio.run(_run())
+
+    assert status["status"] == "completed"
+    assert status["processed"] == len(TEXTS)
+    assert status["errors"] == 0
+    assert status["cache_hits"] == 1
+    assert status["progress"] == 100.0
+    # Whitespace variants and repeats share one encode; the cached text is not encoded
+    encoded = sorted(text for batch in encoded_batches for text in batch)
+    assert encoded == ["Build the wall.", "The economy is strong."]
+
+    rows = asyncio.run(_embeddings(db_sessions))
+    assert all(row.embedding_generated_at is not None for row in rows)
+    for row in rows:
+        np.testing.assert_array_equal(row.embedding, _vector(row.transcript_text))
+
+
+def test_job_pause_resume(reader_gate, db_sessions):
+    async def _run():
+        worker = EmbeddingWorker()
+        await worker.start()
+        paused = await worker.pause()
+        reader_gate.set()
+        await asyncio.sleep(0.1)
+        assert paused["status"] == "paused"
+        assert (await worker.status())["processed"] == 0
+        assert worker.running
+
+        assert (await worker.resume())["status"] == "running"
+        return await worker.wait()
+
+    status = asyncio.run(_run())
+
+    assert status["status"] == "completed"
+    assert status["processed"] == len(TEXTS)
+
+
+def test_job_cancel(encoded_batches, reader_gate, db_sessions):
+    async def _run():
+        worker = EmbeddingWorker()
+        await worker.start()
+        await worker.pause()
+        reader_gate.set()
+        status = await worker.cancel()
+        assert not worker.running
+        # Waiting on a cancelled job returns its final status
+        assert (await worker.wait())["status"] == "cancelled"
+        return status
+
+    status = asyncio.run(_run())
+
+    assert status["status"] == "cancelled"
+    assert status["finished_at"] is not None
+    assert encoded_batches == []
+    rows = asyncio.run(_embeddings(db_sessions))
+    assert all(row.embedding_generated_at is None for row in rows)
+
+
+def test_start_raises_while_running(reader_gate, db_sessions):
+    async def _run():
+        worker = EmbeddingWorker()
+        first = await worker.start()
+        await worker.pause()
+        with pytest.raises(EmbeddingJobRunning):
+            await worker.start(force_regenerate=True)
+        status = await worker.status()
+        await worker.cancel()
+        return first, status
+
+    first, status = asyncio.run(_run())
+
+    assert status["job_id"] == first["job_id"]
+    assert status["status"] == "paused"
+
+
+def test_other_workers_see_and_control_the_job(encoded_batches, reader_gate, db_sessions):
+    # Two workers (API processes) sharing the database
+    async def _run():
+        owner, other = EmbeddingWorker(), EmbeddingWorker()
+        assert (await other.status())["status"] == "idle"
+        started = await owner.start()
+
+        with pytest.raises(EmbeddingJobRunning):
+            await other.start()
+        assert (await other.pause())["status"] == "paused"
+        await asyncio.sleep(0.2)
+        # The owner picked up the request at its last poll
+        assert not owner._resume.is_set()
+        assert (await owner.status())["status"] == "paused"
+        reader_gate.set()
+        await asyncio.sleep(0.1)
+        assert (await other.status())["processed"] == 0
+
+        assert (await other.cancel())["status"] == "cancelling"
+        status = await owner.wait()
+        assert (await other.status())["status"] == "cancelled"
+        return started, status
+
+    started, status = asyncio.run(_run())
+
+    assert status["job_id"] == started["job_id"]
+    assert status["status"] == "cancelled"
+    assert status["finished_at"] is not None
+    assert encoded_batches == []
+
+
+def test_job_of_a_stopped_worker_is_given_up(encoded_batches, db_sessions):
+    async def _run():
+        async with db_sessions() as db:
+            stopped_at = datetime.utcnow() - timedelta(minutes=5)
+            db.add(EmbeddingJob(
+                status="running", batch_size=64, worker_processes=1, owner="gone:1", total=len(TEXTS),
+                error_messages=[], started_at=stopped_at, resumed_at=stopped_at, updated_at=stopped_at,
+            ))
+            await db.commit()
+
+        worker = EmbeddingWorker()
+        given_up = await worker.status()
+        await worker.start()
+        return given_up, await worker.wait()
+
+    given_up, status = asyncio.run(_run())
+
+    assert given_up["status"] == "failed"
+    assert given_up["error_messages"] == ["The worker running the job stopped"]
+    assert status["status"] == "completed"
+    assert status["job_id"] == given_up["job_id"] + 1
+
+
+def test_job_control_without_a_job(api_client, db_sessions, monkeypatch):
+    monkeypatch.setattr(worker_module, "AsyncSessionLocal", db_sessions)
+
+    assert api_client.get("/api/search-legacy/embedding-job").json()["status"] == "idle"
+    for action in ("pause", "resume", "cancel"):
+        assert api_client.post(f"/api/search-legacy/embedding-job/{action}").status_code == 400
@@ -0,0 +1,154 @@
+"""
+Tests for the streaming search and segment exports
+"""
+import asyncio
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+from datetime import date, datetime
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+
+from backend.src.config import settings  # noqa: E402
+from backend.src.models import TranscriptSegment, Video  # noqa: E402
+from backend.src.routes.search import EXPORT_FIELDS  # noqa: E402
+from backend.src.services import export_service  # noqa: E402
+from backend.src.services.segments_service import build_segments_export_query  # noqa: E402
+
+SEGMENT_COUNT = 7
+SEGMENT_COLUMNS = [column.key for column in build_segments_export_query().selected_columns]
+
+
+@pytest.fixture
+def client(api_client, db_sessions, monkeypatch):
+    # Exports stream from their own session; small chunks give several record batches
+    monkeypatch.setattr(export_service, "AsyncSessionLocal", db_sessions)
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_SIZE", 3)
+
+    async def _seed():
+        async with db_sessions() as db:
+            video = Video(title="Rally", filename="rally.html", date=date(2025, 8, 13), dataset="trump")
+            db.add(video)
+            await db.flush()
+            db.add_all([
+                TranscriptSegment(
+                    segment_id=f"seg_{i}", video_id=video.id, speaker_name="Speaker",
+                    transcript_text=f"text {i}", video_seconds=i * 10, sentiment_loughran_score=i / 10,
+                )
+                for i in range(SEGMENT_COUNT)
+            ])
+            await db.commit()
+
+    asyncio.run(_seed())
+    return api_client
+
+
+def _parse(format: str, content: bytes):
+    """Rows (as dicts) and column names of an export body"""
+    if format == "csv":
+        reader = csv.DictReader(io.StringIO(content.decode("utf-8")))
+        return list(reader), reader.fieldnames
+    if format == "json":
+        rows = json.loads(content)
+        return rows, list(rows[0]) if rows else None
+    if format in ("jsonl", "ndjson"):
+        rows = [json.loads(line) for line in content.decode("utf-8").splitlines()]
+        return rows, list(rows[0]) if rows else None
+    if format == "parquet":
+        table = pq.read_table(io.BytesIO(content))
+    else:
+        table = pa.ipc.open_stream(content).read_all()
+    return table.to_pylist(), table.column_names
+
+
+@pytest.mark.parametrize("format", ["csv", "json", "jsonl", "ndjson", "parquet", "arrow"])
+def test_search_export(client, format):
+    response = client.get(
+        "/api/search-legacy/export", params={"q": "text", "search_type": "exact", "format": format}
+    )
+
+    assert response.status_code == 200
+    rows, columns = _parse(format, response.content)
+    assert len(rows) == SEGMENT_COUNT
+    if format == "csv":
+        assert columns == [header for _, header in EXPORT_FIELDS]
+        assert rows[2]["Text"] == "text 2"
+        assert rows[2]["Timestamp"] == "None-None"
+    elif format in export_service.COLUMNAR_FORMATS:
+        # Typed columns straight from the query
+        assert "timestamp_start" in columns and "video_title" in columns
+        assert [row["segment_id"] for row in rows] == [f"seg_{i}" for i in range(SEGMENT_COUNT)]
+        assert rows[3]["sentiment_loughran_score"] == pytest.approx(0.3)
+        assert rows[3]["date"] == datetime(2025, 8, 13)
+    else:
+        assert columns == [key for key, _ in EXPORT_FIELDS]
+        assert [row["segment_id"] for row in rows] == [f"seg_{i}" for i in range(SEGMENT_COUNT)]
+        assert rows[0]["date"] == "2025-08-13"
+
+
+@pytest.mark.parametrize("format", ["csv", "json", "jsonl", "parquet", "arrow"])
+def test_search_export_without_results(client, format):
+    response = client.get(
+        "/api/search-legacy/export", params={"q": "nothing matches", "search_type": "exact", "format": format}
+    )
+
+    assert response.status_code == 200
+    rows, columns = _parse(format, response.content)
+    assert rows == []
+    if format == "csv":
+        assert columns == [header for _, header in EXPORT_FIELDS]
+    elif format in export_service.COLUMNAR_FORMATS:
+        assert "segment_id" in columns
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow", "csv", "jsonl"])
+def test_segments_export(client, format):
+    response = client.get("/api/segments/export", params={"format": format, "limit": 5})
+
+    assert response.status_code == 200
+    rows, columns = _parse(format, response.content)
+    assert len(rows) == 5
+    assert columns == SEGMENT_COLUMNS
+    assert "dataset" in columns
+    assert [row["segment_id"] for row in rows] == [f"seg_{i}" for i in range(5)]
+    assert all(row["dataset"] == "trump" for row in rows)
+    if format in export_service.COLUMNAR_FORMATS:
+        assert [row["video_seconds"] for row in rows] == [0, 10, 20, 30, 40]
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow", "csv", "jsonl"])
+def test_segments_export_without_results(client, format):
+    response = client.get("/api/segments/export", params={"format": format, "dataset": "tweede_kamer"})
+
+    assert response.status_code == 200
+    rows, columns = _parse(format, response.content)
+    assert rows == []
+    if format != "jsonl":
+        assert columns == SEGMENT_COLUMNS
+
+
+@pytest.mark.parametrize("path", ["/api/search-legacy/export", "/api/segments/export"])
+def test_unsupported_export_format(client, path):
+    response = client.get(path, params={"q": "text", "search_type": "exact", "format": "xlsx"})
+
+    assert response.status_code == 400
+
+
+def test_pyarrow_is_imported_on_first_columnar_export():
+    # A fresh interpreter: this test session has imported pyarrow already
+    code = (
+        "import sys, backend.src.main; "
+        "from backend.src.services import prewarm; "
+        "assert 'pyarrow' not in sys.modules; "
+        "prewarm._warm_arrow(); "
+        "assert 'pyarrow.parquet' in sys.modules"
+    )
+    env = {**os.environ, "DATABASE_URL": "sqlite+aiosqlite:///:memory:"}
+    repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    subprocess.run([sys.executable, "-c", code], cwd=repo_root, env=env, check=True, capture_output=True)
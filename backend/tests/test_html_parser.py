@@ -1,16 +1,15 @@
+import json
 import os
 from pathlib import Path
 
 import pytest
 
 # Adjust import to match actual parser location
-from backend.src.parsers.html_parser import TranscriptHTMLParser
+from backend.src.parsers.html_parser import HAS_LXML, TranscriptHTMLParser, _lxml_compatible
 
 
-def test_transcript_html_parser_parses_basic_segment(tmp_path: Path):
-    # Minimal HTML structure matching the parser's expected classes/selectors
-    sample_html = (
-        """
+# Minimal HTML structure matching the parser's expected classes/selectors
+BASIC_HTML = """
         <html><body>
             <div class="mb-4 border-b mx-6 my-4" id="segment-1">
                 <a class="transcript-play-video" data-seconds="10"></a>
@@ -23,15 +22,170 @@ def test_transcript_html_parser_parses_basic_segment(tmp_path: Path):
                 </div>
             </div>
         </body></html>
-        """
-    )
+"""
+
+# A segment with every analytics block, plus markup the text extraction must skip
+DETAILED_HTML = """
+<!DOCTYPE html>
+<html><head>
+    <title>Roll Call Factba.se - Speech: Donald Trump Holds a Rally - August 13, 2025</title>
+    <meta property="og:url" content="https://rollcall.com/factbase/trump/transcript/rally">
+    <meta name="description" content="Rally &amp; remarks">
+    <meta name="twitter:image" content="https://i.vimeocdn.com/video/123_640.jpg">
+</head><body>
+    <iframe id="vimeoPlayer" src="https://player.vimeo.com/video/987654?h=abc"></iframe>
+    <div class="mb-4 border-b mx-6 my-4" id="segment-7">
+        <a class="transcript-play-video text-blue" data-seconds="422">Play</a>
+        <div>
+            <h2 class="text-md inline">Donald Trump</h2>
+            <span class="text-xs text-gray-600 inline ml-2">00:07:02-00:07:04 (2 sec)</span>
+        </div>
+        <div class="hidden sm:block">High Stress 0.85</div>
+        <div class="flex-auto text-md text-gray-600 leading-loose">
+            We're going to <em>win</em> &amp; win big. <!-- editor note --> Thank you.
+        </div>
+        <div x-show="openDetails">
+            <div class="mb-4 flex gap-2">
+                <div class="mb-2">Loughran McDonald (Relative)</div>
+                <div class="mb-2">0.25</div>
+                <div class="mb-2">Positive</div>
+            </div>
+            <div class="mb-4 flex gap-2">
+                <div class="mb-2">VADER</div>
+                <div class="mb-2">-0.4</div>
+                <div class="mb-2"></div>
+            </div>
+            <div class="mb-4 flex gap-2"><span>Flesch-Kincaid Grade</span> <b>7.5</b></div>
+            <div class="mb-4 flex gap-2"><span>Gunning Fog</span> <b>9.1</b></div>
+            <div class="mb-4">
+                <div class="mb-2">Harassment</div><div class="mb-2">0.42</div><div class="mb-2">Flagged</div>
+            </div>
+            <div class="mb-4">
+                <div class="mb-2">Violence &gt; Graphic</div><div class="mb-2">0.9</div><div class="mb-2">Flagged</div>
+            </div>
+            <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Topic:</div><div class="w-1/2">Economy</div></div>
+            <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Score:</div><div class="w-1/2">0.82</div></div>
+            <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Magnitude:</div><div class="w-1/2">3</div></div>
+            <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Code:</div><div class="w-1/2">E-1</div></div>
+            <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Source:</div><div class="w-1/2">model</div></div>
+            <script>var label = "Stress 0.1";</script>
+        </div>
+    </div>
+    <div class="mb-4 border-b mx-6 my-4" id="segment-8">
+        <div class="flex-auto text-md text-gray-600 leading-loose">   </div>
+    </div>
+</body></html>
+"""
+
+
+# Several segments: a missing speaker, several topics, every moderation and
+# sentiment label, entities, nested markup and CRLF line endings
+MULTI_SEGMENT_HTML = (
+    """<!DOCTYPE html>
+<html><head>
+    <title>Roll Call Factba.se - Interview: Kamala Harris Interviewed on CNN - October 2, 2024</title>
+    <meta property="og:url" content="https://rollcall.com/factbase/harris/transcript/interview">
+</head><body>
+    <div class="mb-4 border-b mx-6 my-4" id="segment-1">
+        <a class="transcript-play-video" data-seconds="0"></a>
+        <div>
+            <h2 class="text-md inline">Dana Bash</h2>
+            <span class="text-xs text-gray-600 inline ml-2">00:00:00-00:00:05 (5 sec)</span>
+        </div>
+        <div class="flex-auto text-md text-gray-600 leading-loose">
+            Madam&nbsp;Vice President, <span>thank <b>you</b></span> for
+            joining us.
+        </div>
+        <div x-show="openDetails">
+            <div class="mb-4 flex gap-2">
+                <div class="mb-2">Loughran McDonald (Relative)</div>
+                <div class="mb-2">-0.1</div>
+                <div class="mb-2">Negative</div>
+            </div>
+            <div class="mb-4 flex gap-2">
+                <div class="mb-2">VADER</div>
+                <div class="mb-2">0.62</div>
+                <div class="mb-2">Positive</div>
+            </div>
+            <div class="mb-4 flex gap-2"><span>Flesch Reading Ease</span> <b>71.2</b></div>
+            <div class="mb-4">
+                <div class="mb-2">Hate</div><div class="mb-2">0.01</div><div class="mb-2"></div>
+            </div>
+            <div class="mb-4">
+                <div class="mb-2">Self-Harm</div><div class="mb-2">0.3</div><div class="mb-2">Flagged</div>
+            </div>
+            <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Topic:</div><div class="w-1/2">Media</div></div>
+            <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Score:</div><div class="w-1/2">0.4</div></div>
+            <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Source:</div><div class="w-1/2">model</div></div>
+            <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Topic:</div><div class="w-1/2">Elections</div></div>
+            <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Score:</div><div class="w-1/2">0.9</div></div>
+            <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Magnitude:</div><div class="w-1/2">2</div></div>
+            <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Source:</div><div class="w-1/2">model</div></div>
+        </div>
+    </div>
+    <div class="mb-4 border-b mx-6 my-4" id="segment-2">
+        <a class="transcript-play-video" data-seconds="5"></a>
+        <div class="hidden sm:block">Low Stress 0.12</div>
+        <div class="flex-auto text-md text-gray-600 leading-loose">Unattributed   words &lt;here&gt;.</div>
+    </div>
+    <div class="mb-4 border-b mx-6 my-4" id="segment-3">
+        <a class="transcript-play-video" data-seconds="not-a-number"></a>
+        <div>
+            <h2 class="text-md inline">Kamala Harris</h2>
+            <span class="text-xs text-gray-600 inline ml-2">00:00:05-00:01:00 (55 sec)</span>
+        </div>
+        <div class="flex-auto text-md text-gray-600 leading-loose">We have a plan.</div>
+        <div x-show="openDetails">
+            <div class="mb-4">
+                <div class="mb-2">Sexual</div><div class="mb-2">n/a</div><div class="mb-2">Flagged</div>
+            </div>
+        </div>
+    </div>
+</body></html>
+""".replace("\n", "\r\n")
+)
+
+# Markup that libxml2 parses differently from html.parser
+CDATA_HTML = BASIC_HTML.replace("Speaker A", "Speaker <![CDATA[A]]>B").replace("a test", "a<![CDATA[b]]>c test")
+NUL_HTML = BASIC_HTML.replace("Speaker A", "Speaker\x00A").replace("a test", "T\x00U test")
+REPAIRED_HTML = BASIC_HTML.replace("Speaker A", "Speaker <p>A").replace(
+    "a test", "a <table><td>test</table> &bogus; &amp &#65"
+)
+
+# Parser inputs: case -> (HTML, file name)
+CASES = {
+    "basic": (BASIC_HTML, "test.html"),
+    "detailed": (DETAILED_HTML, "donald-trump-rally-august-13-2025.html"),
+    "multi_segment": (MULTI_SEGMENT_HTML, "kamala-harris-interview-cnn-october-2-2024.html"),
+    "empty": ("", "empty.html"),
+    "cdata": (CDATA_HTML, "test.html"),
+    "nul": (NUL_HTML, "test.html"),
+    "repaired_markup": (REPAIRED_HTML, "test.html"),
+}
+# Cases only the html.parser code path can parse like html.parser
+HTML_PARSER_ONLY_CASES = ("cdata", "nul", "repaired_markup")
+
+# Output of the parser from before the lxml backend for each case, as JSON
+EXPECTED_PATH = Path(__file__).parent / "fixtures" / "html_parser_expected.json"
+
+
+def _as_json(result) -> dict:
+    """Parser result as its JSON form (dates as ISO strings)"""
+    return json.loads(json.dumps(result, default=lambda value: value.isoformat()))
+
 
+def _write(tmp_path: Path, html: str, filename: str = "test.html") -> str:
     # Write to a temporary file to use parse_file API
-    html_file = tmp_path / "test.html"
-    html_file.write_text(sample_html, encoding="utf-8")
+    html_file = tmp_path / filename
+    html_file.write_text(html, encoding="utf-8")
+    return str(html_file)
+
+
+def test_transcript_html_parser_parses_basic_segment(tmp_path: Path):
+    html_file = _write(tmp_path, BASIC_HTML)
 
     parser = TranscriptHTMLParser()
-    result = parser.parse_file(str(html_file))
+    result = parser.parse_file(html_file)
 
     assert "segments" in result
     assert result["total_segments"] == 1
@@ -40,3 +194,52 @@ def test_transcript_html_parser_parses_basic_segment(tmp_path: Path):
     assert "test transcript segment" in segment["transcript_text"].lower()
     assert segment["video_seconds"] == 10
 
+
+
+@pytest.mark.parametrize("backend", ["html.parser", "lxml"])
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_backends_match_the_expected_output(tmp_path: Path, backend: str, case: str):
+    if backend == "lxml" and not HAS_LXML:
+        pytest.skip("lxml not installed")
+    html, filename = CASES[case]
+    html_file = tmp_path / filename
+    html_file.write_bytes(html.encode("utf-8"))
+
+    result = TranscriptHTMLParser(backend=backend).parse_file(str(html_file))
+
+    assert _as_json(result) == json.loads(EXPECTED_PATH.read_text(encoding="utf-8"))[case]
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_lxml_is_only_used_for_well_formed_markup(case: str):
+    html, _ = CASES[case]
+    assert _lxml_compatible(html) is (case not in HTML_PARSER_ONLY_CASES)
+
+
+@pytest.mark.skipif(not HAS_LXML, reason="lxml not installed")
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_lxml_backend_matches_html_parser(tmp_path: Path, case: str):
+    html, filename = CASES[case]
+    html_file = _write(tmp_path, html, filename)
+
+    expected = TranscriptHTMLParser(backend="html.parser").parse_file(html_file)
+    result = TranscriptHTMLParser(backend="lxml").parse_file(html_file)
+
+    # Also compares the Python types (dates, ints vs floats)
+    assert repr(result) == repr(expected)
+
+
+def test_detailed_segment_fields(tmp_path: Path):
+    result = TranscriptHTMLParser(backend="lxml").parse_file(_write(tmp_path, DETAILED_HTML))
+
+    assert result["total_segments"] == 1
+    segment = result["segments"][0]
+    assert segment["transcript_text"] == "We're going towin& win big.Thank you."
+    assert segment["sentiment_loughran_score"] == 0.25
+    assert segment["sentiment_vader_label"] == "Neutral"
+    assert segment["moderation_harassment"] == 0.42
+    assert "moderation_violence" not in segment
+    assert segment["primary_topic"] == "Economy"
+    assert segment["topic_magnitude"] == 3
+    assert segment["stresslens_score"] == 0.85
+    assert segment["stresslens_rank"] == 1
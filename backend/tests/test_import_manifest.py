@@ -0,0 +1,179 @@
+"""
+Tests for the directory import manifest
+"""
+import asyncio
+import hashlib
+import os
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from backend.src.models import Video
+from backend.src.services import import_manifest
+from backend.src.services.import_manifest import FileReader, ImportManifest, read_fingerprint
+from backend.src.services.import_service import parse_html_file
+
+HTML = """<html><body>
+<div class="mb-4 border-b mx-6 my-4" id="segment-1">\r
+    <a class="transcript-play-video" data-seconds="10"></a>\r
+    <div><h2 class="text-md inline">Speaker A</h2></div>\r
+    <div class="flex-auto text-md text-gray-600 leading-loose">First line.\r
+Second line.</div>
+</div>
+</body></html>
+"""
+
+
+def _rewrite(path: Path, content: bytes):
+    """Rewrite a file, making sure its mtime moves on"""
+    mtime_ns = os.stat(path).st_mtime_ns
+    path.write_bytes(content)
+    os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+
+@pytest.fixture
+def video_id(db_sessions):
+    async def _create():
+        async with db_sessions() as db:
+            video = Video(title="Rally", filename="rally.html", date=date(2025, 8, 13))
+            db.add(video)
+            await db.commit()
+            return video.id
+
+    return asyncio.run(_create())
+
+
+def _plan(db_sessions, paths, parser_version="1"):
+    async def _run():
+        manifest = ImportManifest(db_sessions, "html", parser_version)
+        await manifest.load()
+        plan = await manifest.plan(paths)
+        await manifest.flush()
+        return plan
+
+    return asyncio.run(_run())
+
+
+def _record(db_sessions, path, video_id, fingerprint=None):
+    async def _run():
+        manifest = ImportManifest(db_sessions, "html", "1")
+        await manifest.record(str(path), video_id, fingerprint)
+        await manifest.flush()
+
+    asyncio.run(_run())
+
+
+def test_reader_fingerprints_the_bytes_read(tmp_path: Path):
+    path = tmp_path / "a.html"
+    path.write_bytes(b"x" * 2500)
+    stat = os.stat(path)
+
+    whole = FileReader(str(path))
+    content = whole.read()
+    chunked = FileReader(str(path))
+    assert b"".join(chunked.chunks(1000)) == content
+
+    expected = (stat.st_size, stat.st_mtime_ns, hashlib.sha256(content).hexdigest())
+    assert tuple(whole.fingerprint) == expected
+    assert tuple(chunked.fingerprint) == expected
+    assert read_fingerprint(str(path)) == whole.fingerprint
+
+    with pytest.raises(RuntimeError):
+        FileReader(str(path)).fingerprint
+
+
+def test_unchanged_files_are_skipped(tmp_path: Path, db_sessions, video_id):
+    path = tmp_path / "a.html"
+    path.write_bytes(b"<html>one</html>")
+    assert _plan(db_sessions, [path]) == ([str(path)], [])
+
+    reader = FileReader(str(path))
+    reader.read()
+    _record(db_sessions, path, video_id, reader.fingerprint)
+
+    assert _plan(db_sessions, [path]) == ([], [])
+    # Another parser version reads every file again
+    assert _plan(db_sessions, [path], parser_version="2") == ([], [str(path)])
+
+
+def test_file_rewritten_after_parsing_is_imported_again(tmp_path: Path, db_sessions, video_id):
+    path = tmp_path / "a.html"
+    path.write_bytes(b"<html>one</html>")
+
+    # Read for parsing, then rewritten before the import is recorded
+    reader = FileReader(str(path))
+    reader.read()
+    _rewrite(path, b"<html>two</html>")
+    _record(db_sessions, path, video_id, reader.fingerprint)
+
+    assert _plan(db_sessions, [path]) == ([], [str(path)])
+
+
+def test_touched_file_is_skipped_and_its_mtime_stored(tmp_path: Path, db_sessions, video_id, monkeypatch):
+    path = tmp_path / "a.html"
+    path.write_bytes(b"<html>one</html>")
+    _record(db_sessions, path, video_id)
+
+    _rewrite(path, b"<html>one</html>")
+    assert _plan(db_sessions, [path]) == ([], [])
+
+    # The new mtime was stored: the next plan does not hash the file at all
+    def _file_hash(path):
+        raise AssertionError(f"{path} was hashed")
+
+    monkeypatch.setattr(import_manifest, "file_hash", _file_hash)
+    assert _plan(db_sessions, [path]) == ([], [])
+
+
+def test_parse_html_file_returns_the_fingerprint_of_the_parsed_content(tmp_path: Path):
+    path = tmp_path / "rally.html"
+    path.write_bytes(HTML.encode("utf-8"))
+
+    result = parse_html_file(str(path))
+
+    assert result["success"]
+    assert result["fingerprint"] == read_fingerprint(str(path))
+    segment = result["data"]["segments"][0]
+    assert segment["transcript_text"] == "First line.\nSecond line."
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_parse_xml_file_returns_the_fingerprint_of_the_parsed_content(monkeypatch, streaming: bool):
+    from backend.src.config import settings
+    from backend.src.services.vlos_importer import parse_xml_file_async
+
+    monkeypatch.setattr(settings, "VLOS_STREAMING_PARSE", streaming)
+    path = str(Path(__file__).parent.parent / "test_sample.xml")
+
+    result = asyncio.run(parse_xml_file_async(path))
+
+    assert result["success"], result.get("error")
+    assert result["fingerprint"] == read_fingerprint(path)
+    assert result["data"]["segments"]
+
+
+def test_directory_import_only_imports_new_and_changed_files(tmp_path: Path, db_sessions, monkeypatch):
+    from backend.src.services import import_service
+
+    monkeypatch.setattr(import_service, "create_async_engine", lambda url, **kwargs: db_sessions.kw["bind"])
+    # A window of three files in flight for five files
+    service = import_service.ImportService(max_concurrent_files=1)
+    html_dir = tmp_path / "html"
+    html_dir.mkdir()
+    for i in range(5):
+        (html_dir / f"rally-{i}.html").write_bytes(HTML.replace("Speaker A", f"Speaker {i}").encode("utf-8"))
+
+    async def _run():
+        first = await service.import_html_directory(str(html_dir), generate_embeddings=False)
+        _rewrite(html_dir / "rally-2.html", HTML.replace("Speaker A", "Speaker B").encode("utf-8"))
+        (html_dir / "rally-5.html").write_bytes(HTML.encode("utf-8"))
+        second = await service.import_html_directory(str(html_dir), generate_embeddings=False)
+        return first, second
+
+    first, second = asyncio.run(_run())
+
+    assert (first["total_processed"], first["total_failed"], first["total_skipped"]) == (5, 0, 0)
+    assert (second["total_processed"], second["total_failed"], second["total_skipped"]) == (2, 0, 4)
+    assert second["files_per_second"] == pytest.approx(2 / second["elapsed_seconds"], rel=0.2)
+    assert _plan(db_sessions, sorted(html_dir.iterdir()), import_service.PARSER_VERSION) == ([], [])
@@ -0,0 +1,166 @@
+"""
+Tests for keyset (cursor) pagination
+"""
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from backend.src.models import TranscriptSegment, Video
+from backend.src.services.pagination import (
+    InvalidCursorError,
+    apply_keyset,
+    decode_cursor,
+    keyset_fingerprint,
+    split_keyset_page,
+)
+from backend.src.services.segments_service import fetch_segments_page
+
+# Sentiment scores with NULLs and ties
+SCORES = [0.5, None, -0.2, 0.5, None, 0.0, 0.9, -0.2, None, 0.5, 0.1, None, 0.3]
+
+
+@pytest.fixture
+def segment_ids(db_sessions):
+    async def _seed():
+        async with db_sessions() as db:
+            videos = [
+                Video(title="Rally", filename="rally.html", date=date(2025, 8, 13), dataset="trump"),
+                Video(title="Debat", filename="debat.xml", date=date(2025, 9, 1), dataset="tweede_kamer"),
+            ]
+            db.add_all(videos)
+            await db.flush()
+            segments = [
+                TranscriptSegment(
+                    segment_id=f"seg_{i}", video_id=(videos[1] if i % 3 == 0 else videos[0]).id, speaker_name="Speaker",
+                    transcript_text=f"text {i}", sentiment_loughran_score=score,
+                )
+                for i, score in enumerate(SCORES)
+            ]
+            db.add_all(segments)
+            await db.commit()
+            return [segment.id for segment in segments]
+
+    return asyncio.run(_seed())
+
+
+def _walk(db_sessions, stmt, keys, page_size):
+    """Every page of a listing, following next cursors"""
+    async def _run():
+        ids, cursor = [], None
+        async with db_sessions() as db:
+            while True:
+                page_stmt = apply_keyset(stmt, keys, page_size, cursor=cursor)
+                rows, cursor = split_keyset_page((await db.execute(page_stmt)).all(), page_stmt, page_size)
+                ids.extend(segment.id for segment in rows)
+                if cursor is None:
+                    return ids
+
+    return asyncio.run(_run())
+
+
+@pytest.mark.parametrize("dataset", [None, "trump"])
+def test_cursor_walk_matches_offset_pages(db_sessions, segment_ids, dataset):
+    async def _run():
+        async with db_sessions() as db:
+            by_offset = []
+            for page in range(1, 5):
+                segments, total, _, _ = await fetch_segments_page(db, page=page, page_size=4, dataset=dataset)
+                by_offset.extend(segment.id for segment in segments)
+
+            by_cursor, cursor = [], None
+            while True:
+                segments, _, _, cursor = await fetch_segments_page(
+                    db, page_size=4, dataset=dataset, cursor=cursor, count_mode="none"
+                )
+                by_cursor.extend(segment.id for segment in segments)
+                if cursor is None:
+                    return by_offset, by_cursor, total
+
+    by_offset, by_cursor, total = asyncio.run(_run())
+
+    assert by_cursor == by_offset
+    assert len(by_cursor) == total == (len(SCORES) if dataset is None else 8)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_null_sort_keys(db_sessions, segment_ids, descending):
+    keys = [(TranscriptSegment.sentiment_loughran_score, descending), (TranscriptSegment.id, descending)]
+
+    ids = _walk(db_sessions, select(TranscriptSegment), keys, page_size=3)
+
+    # Postgres defaults: NULLs last ascending, first descending
+    rows = list(zip(SCORES, segment_ids))
+    if descending:
+        expected = sorted(rows, key=lambda row: (row[0] is None, row[0] or 0, row[1]), reverse=True)
+    else:
+        expected = sorted(rows, key=lambda row: (row[0] is None, row[0] or 0, row[1]))
+    assert ids == [segment_id for _, segment_id in expected]
+
+
+def test_cursor_of_another_listing_is_rejected(db_sessions, segment_ids):
+    stmt = select(TranscriptSegment)
+    asc_keys = [(TranscriptSegment.sentiment_loughran_score, False), (TranscriptSegment.id, False)]
+    desc_keys = [(TranscriptSegment.sentiment_loughran_score, True), (TranscriptSegment.id, True)]
+    other_keys = [(TranscriptSegment.video_seconds, False), (TranscriptSegment.id, False)]
+    filtered = stmt.where(TranscriptSegment.speaker_name == "Speaker")
+
+    async def _first_cursor():
+        async with db_sessions() as db:
+            page_stmt = apply_keyset(stmt, asc_keys, 2)
+            return split_keyset_page((await db.execute(page_stmt)).all(), page_stmt, 2)[1]
+
+    cursor = asyncio.run(_first_cursor())
+
+    assert decode_cursor(cursor, 2, keyset_fingerprint(stmt, asc_keys))
+    # Same number of sort keys, different direction, column or filters
+    for other_stmt, keys in ((stmt, desc_keys), (stmt, other_keys), (filtered, asc_keys)):
+        with pytest.raises(InvalidCursorError):
+            apply_keyset(other_stmt, keys, 2, cursor=cursor)
+
+
+@pytest.mark.parametrize("token", ["not-a-cursor", "", "W10", "eyJrIjpbMV19"])
+def test_malformed_cursor_is_rejected(token):
+    keys = [(TranscriptSegment.id, False)]
+    stmt = select(TranscriptSegment)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, 1, keyset_fingerprint(stmt, keys))
+
+
+def test_segments_endpoint_cursors(api_client, segment_ids):
+    first = api_client.get("/api/segments/", params={"page_size": 5, "dataset": "trump"})
+    assert first.status_code == 200
+    cursor = first.json()["pagination"]["next_cursor"]
+    assert cursor
+
+    second = api_client.get(
+        "/api/segments/", params={"page_size": 5, "dataset": "trump", "cursor": cursor, "count_mode": "none"}
+    )
+    assert second.status_code == 200
+    ids = [segment["id"] for segment in first.json()["data"] + second.json()["data"]]
+    assert ids == [segment_id for i, segment_id in enumerate(segment_ids) if i % 3 != 0]
+    assert second.json()["pagination"]["next_cursor"] is None
+
+    # A cursor is only valid for the filters it was issued for
+    other = api_client.get("/api/segments/", params={"page_size": 5, "dataset": "tweede_kamer", "cursor": cursor})
+    assert other.status_code == 400
+    malformed = api_client.get("/api/segments/", params={"cursor": "not-a-cursor"})
+    assert malformed.status_code == 400
+
+
+def test_search_endpoint_rejects_cursor_of_another_sort(api_client, segment_ids):
+    params = {"q": "text", "search_type": "exact", "page_size": 4, "sort_by": "sentiment", "sort_order": "asc"}
+    first = api_client.get("/api/search-legacy/", params=params)
+    assert first.status_code == 200
+    cursor = first.json()["next_cursor"]
+    assert cursor
+
+    second = api_client.get("/api/search-legacy/", params={**params, "cursor": cursor})
+    assert second.status_code == 200
+    scores = [result["sentiment_loughran_score"] for result in first.json()["results"] + second.json()["results"]]
+    assert scores == sorted(score for score in SCORES if score is not None)[:8]
+
+    # Same number of sort keys, different sort column
+    other = api_client.get("/api/search-legacy/", params={**params, "sort_by": "stresslens", "cursor": cursor})
+    assert other.status_code == 400
@@ -0,0 +1,160 @@
+"""
+Tests for the bulk segment writes, speaker resolution and re-imports
+"""
+import asyncio
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+
+from backend.src.models import SegmentTopic, Speaker, Topic, TranscriptSegment, Video
+from backend.src.services.import_resolver import ImportResolver
+from backend.src.services.segment_writer import insert_segments, resolve_speakers, segment_row
+
+SEGMENT_HTML = """
+<div class="mb-4 border-b mx-6 my-4" id="segment-{index}">
+    <a class="transcript-play-video" data-seconds="{seconds}"></a>
+    <div><h2 class="text-md inline">{speaker}</h2></div>
+    <div class="flex-auto text-md text-gray-600 leading-loose">{text}</div>
+    <div x-show="openDetails">
+        <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Topic:</div><div class="w-1/2">{topic}</div></div>
+        <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Score:</div><div class="w-1/2">0.5</div></div>
+        <div class="flex gap-2 py-2 border-b"><div class="w-1/2">Source:</div><div class="w-1/2">model</div></div>
+    </div>
+</div>
+"""
+
+
+def _transcript(segments) -> str:
+    """Transcript page with one segment per (speaker, text, topic)"""
+    body = "".join(
+        SEGMENT_HTML.format(index=i, seconds=i * 10, speaker=speaker, text=text, topic=topic)
+        for i, (speaker, text, topic) in enumerate(segments)
+    )
+    return f"<html><body>{body}</body></html>"
+
+
+@pytest.fixture
+def video_id(db_sessions):
+    async def _create():
+        async with db_sessions() as db:
+            video = Video(title="Rally", filename="rally.html", date=date(2025, 8, 13))
+            db.add(video)
+            await db.commit()
+            return video.id
+
+    return asyncio.run(_create())
+
+
+def test_insert_segments_returns_ids_in_row_order(db_sessions, video_id):
+    # Rows with different key sets are still written by one statement
+    rows = [
+        segment_row(video_id, None, {"segment_id": f"seg_{i}", "transcript_text": f"text {i}", "speaker_name": "A"})
+        for i in range(5)
+    ]
+    rows[1]["sentiment_loughran_score"] = 0.5
+    rows[3]["word_count"] = 7
+    rows[4]["not_a_column"] = "ignored"
+    rows[4] = segment_row(video_id, None, rows[4])
+
+    async def _run():
+        async with db_sessions() as db:
+            ids = await insert_segments(db, rows)
+            assert await insert_segments(db, []) == []
+            await db.commit()
+            stored = await db.execute(
+                select(TranscriptSegment.id, TranscriptSegment.segment_id, TranscriptSegment.sentiment_loughran_score)
+            )
+            return ids, stored.all()
+
+    ids, stored = asyncio.run(_run())
+
+    by_id = {row.id: row for row in stored}
+    assert [by_id[segment_id].segment_id for segment_id in ids] == [f"seg_{i}" for i in range(5)]
+    assert by_id[ids[1]].sentiment_loughran_score == 0.5
+    assert by_id[ids[0]].sentiment_loughran_score is None
+
+
+def test_names_that_normalize_the_same_share_a_speaker(db_sessions):
+    async def _run():
+        async with db_sessions() as db:
+            db.add(Speaker(name="Joe Biden", normalized_name="joe_biden"))
+            await db.commit()
+
+        async with db_sessions() as db:
+            ids = await resolve_speakers(
+                db, ["Donald Trump", "donald trump", " Donald Trump ", "Donald_Trump", "JOE BIDEN", "", None]
+            )
+            await db.commit()
+
+        # An import run's resolver maps the variants onto the same rows
+        resolver = ImportResolver(db_sessions)
+        await resolver.preload()
+        resolved = await resolver.speaker_ids(["DONALD TRUMP", "Joe Biden", "Kamala Harris", "kamala  harris"])
+
+        async with db_sessions() as db:
+            speakers = dict((await db.execute(select(Speaker.name, Speaker.id))).all())
+        return ids, resolved, speakers
+
+    ids, resolved, speakers = asyncio.run(_run())
+
+    trump_id = speakers["Donald Trump"]
+    assert ids == {
+        "Donald Trump": trump_id, "donald trump": trump_id, "Donald_Trump": trump_id, "JOE BIDEN": speakers["Joe Biden"],
+    }
+    assert resolved["DONALD TRUMP"] == trump_id
+    assert resolved["Joe Biden"] == speakers["Joe Biden"]
+    # Different normalized forms (double space) are different speakers
+    assert resolved["Kamala Harris"] != resolved["kamala  harris"]
+    assert sorted(speakers) == ["Donald Trump", "Joe Biden", "Kamala Harris", "kamala  harris"]
+
+
+def test_reimport_replaces_segments_and_recomputes_totals(tmp_path: Path, db_sessions, monkeypatch):
+    from backend.src.services import import_service
+
+    # The service's own engine is the test database's (pool options do not apply to SQLite)
+    monkeypatch.setattr(import_service, "create_async_engine", lambda url, **kwargs: db_sessions.kw["bind"])
+    service = import_service.ImportService(max_concurrent_files=2)
+
+    path = tmp_path / "donald-trump-rally-august-13-2025.html"
+    path.write_text(_transcript([
+        ("Speaker A", "Jobs are coming back", "Economy"),
+        ("Speaker A", "We will build it", "Economy"),
+        ("Speaker B", "Thank you", "Border"),
+    ]), encoding="utf-8")
+
+    async def _totals():
+        async with db_sessions() as db:
+            video = (await db.execute(select(Video))).scalar_one()
+            segments = (await db.execute(select(func.count(TranscriptSegment.id)))).scalar_one()
+            links = (await db.execute(select(func.count(SegmentTopic.id)))).scalar_one()
+            speakers = dict((await db.execute(select(Speaker.name, Speaker.total_segments))).all())
+            words = dict((await db.execute(select(Speaker.name, Speaker.total_words))).all())
+            topics = dict((await db.execute(select(Topic.name, Topic.total_segments))).all())
+            return video, segments, links, speakers, words, topics
+
+    async def _run():
+        first = await service.import_html_file(str(path))
+        assert first["success"], first.get("error")
+        before = await _totals()
+
+        path.write_text(_transcript([
+            ("Speaker A", "Jobs are coming back", "Economy"),
+            ("Speaker C", "Four more years", "Jobs"),
+        ]), encoding="utf-8")
+        second = await service.import_html_file(str(path), force_reimport=True)
+        assert second["success"], second.get("error")
+        assert second["video_id"] == first["video_id"]
+        return before, await _totals()
+
+    before, after = asyncio.run(_run())
+
+    video, segments, links, speakers, words, topics = before
+    assert (video.total_segments, video.total_words, segments, links) == (3, 10, 3, 3)
+
+    video, segments, links, speakers, words, topics = after
+    assert (video.total_segments, video.total_words, segments, links) == (2, 7, 2, 2)
+    assert speakers == {"Speaker A": 1, "Speaker B": 0, "Speaker C": 1}
+    assert words == {"Speaker A": 4, "Speaker B": 0, "Speaker C": 3}
+    assert topics == {"Economy": 1, "Border": 0, "Jobs": 1}
@@ -558,6 +558,45 @@ class TestVLOSParserEnhanced(unittest.TestCase):
                 self.assertEqual(segment['speaker_party'], expected_party)
                 self.assertGreater(len(segment['transcript_text']), 0)
 
+    def test_streaming_matches_tree_parse(self):
+        """Streaming mode yields the same result as parsing the whole tree, whatever the chunk size."""
+        streaming_parser = VLOSParser(streaming=True)
+        for name in ('enhanced_xml', 'verslag_xml', 'duplicate_xml'):
+            content = getattr(self, name).encode('utf-8')
+            expected = self.parser.parse_content(content, 'test.xml')
+            with self.subTest(fixture=name):
+                self.assertEqual(streaming_parser.parse_content(content, 'test.xml'), expected)
+            with self.subTest(fixture=name, chunked=True):
+                chunks = [content[i:i + 37] for i in range(0, len(content), 37)]
+                self.assertEqual(streaming_parser._parse_stream(lambda: chunks, 'test.xml'), expected)
+
+    def test_combined_patterns_match_pattern_lists(self):
+        """The combined announcement/false-speaker regexes agree with the pattern lists."""
+        from parsers import vlos_parser
+        samples = [
+            'Aanwezig zijn 120 leden der Kamer', 'en mevrouw Leijten', 'Aanvang 14.00 uur', '12 words',
+            '14:05', '', 'STEMMING over', 'Kamerstuk 35000', 'Onze zorg', 'In de Kamer', 'De heer Jansen',
+            'De voorzitter', 'De minister', 'de staatssecretaris', 'Dank u wel, voorzitter.', 'Jetten, Rutte, Kaag, Hoekstra',
+        ]
+        for text in samples:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    bool(vlos_parser._ANNOUNCEMENT_RE.match(text)),
+                    any(pattern.match(text) for pattern in vlos_parser.ANNOUNCEMENT_PATTERNS),
+                )
+                self.assertEqual(
+                    bool(vlos_parser._FALSE_SPEAKER_RE.match(text)),
+                    any(pattern.match(text) for pattern in vlos_parser.FALSE_SPEAKER_PATTERNS),
+                )
+
+    def test_speaker_line_classification(self):
+        """Speaker line labels give their party; content and false speakers give None."""
+        from parsers.vlos_parser import _classify_speaker_line
+        self.assertEqual(_classify_speaker_line('De heer Tony van Dijck (PVV)'), 'PVV')
+        self.assertEqual(_classify_speaker_line('Minister Hoekstra'), '')
+        self.assertIsNone(_classify_speaker_line('Onze zorg'))
+        self.assertIsNone(_classify_speaker_line('Ja'))
+
     def tearDown(self):
         """Clean up after tests."""
         self.parser = None